@@ -0,0 +1,112 @@
+"""
+Сравнение стоимости разбора одной страницы движками bs4 и lxml.
+
+Запуск из корня проекта:
+
+    python benchmarks/bench_parsers.py [-n 200] [--pep FILE] [--whats-new FILE]
+
+Без аргументов используются синтетические страницы, по структуре
+повторяющие карточку PEP и страницу "What's New". Сохранённые страницы
+python.org можно передать через --pep и --whats-new.
+"""
+
+import argparse
+import statistics
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from constants import PARSERS
+from main import PEP_STATUS_EXTRACTORS, WHATS_NEW_EXTRACTORS
+from utils import build_tree
+
+FILLER = '<p>Lorem ipsum <a href="#">dolor</a> sit <code>amet</code>.</p>'
+
+
+def synthetic_pep_page(paragraphs: int = 400) -> str:
+    """Собирает страницу PEP с карточкой статуса и длинным текстом."""
+    return (
+        '<html><body><section id="pep-content"><h1>PEP 8</h1>'
+        '<dl class="field-list simple">'
+        '<dt>Author<span>:</span></dt><dd>Guido</dd>'
+        '<dt>Status<span>:</span></dt><dd><abbr>Active</abbr></dd>'
+        '<dt>Type<span>:</span></dt><dd>Process</dd></dl>'
+        f'{FILLER * paragraphs}</section></body></html>'
+    )
+
+
+def synthetic_whats_new_page(paragraphs: int = 1500) -> str:
+    """Собирает страницу "What's New" с заголовком и списком авторов."""
+    return (
+        "<html><body><section><h1>What's New In Python 3.12</h1>"
+        '<dl class="field-list"><dt>Editor:</dt>\n<dd>Adam Turner</dd></dl>'
+        f'{FILLER * paragraphs}</section></body></html>'
+    )
+
+
+def measure(extractors: dict, text: str, number: int, repeat: int) -> dict:
+    """
+    Замеряет время построения дерева и извлечения данных каждым движком.
+
+    Returns:
+        dict: {движок: (медиана мс на страницу, результат извлечения)}.
+    """
+    measurements = {}
+    for parser in PARSERS:
+        extract = extractors[parser]
+        timings = timeit.repeat(
+            lambda: extract(build_tree(text, parser)),  # noqa: B023
+            number=number,
+            repeat=repeat,
+        )
+        measurements[parser] = (
+            statistics.median(timings) / number * 1000,
+            extract(build_tree(text, parser)),
+        )
+    return measurements
+
+
+def report(title: str, text: str, measurements: dict) -> None:
+    """Печатает время разбора страницы и ускорение относительно bs4."""
+    print(f'{title} ({len(text) / 1024:.0f} KiB)')
+    baseline = measurements[PARSERS[0]][0]
+    for parser, (cost, result) in measurements.items():
+        print(
+            f'  {parser:>5}: {cost:8.3f} мс/стр.  '
+            f'x{baseline / cost:5.1f}  {result!r:.60}'
+        )
+
+
+def main() -> None:
+    """Замеряет разбор страниц PEP и "What's New" обоими движками."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('-n', '--number', type=int, default=50)
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('--pep', type=Path, help='Сохранённая страница PEP')
+    parser.add_argument(
+        '--whats-new', type=Path, help='Сохранённая страница "What\'s New"'
+    )
+    args = parser.parse_args()
+
+    pages = (
+        ('Страница PEP', args.pep, synthetic_pep_page, PEP_STATUS_EXTRACTORS),
+        (
+            "Страница What's New",
+            args.whats_new,
+            synthetic_whats_new_page,
+            WHATS_NEW_EXTRACTORS,
+        ),
+    )
+    for title, path, synthetic, extractors in pages:
+        text = path.read_text(encoding='utf-8') if path else synthetic()
+        report(
+            title,
+            text,
+            measure(extractors, text, args.number, args.repeat),
+        )
+
+
+if __name__ == '__main__':
+    main()
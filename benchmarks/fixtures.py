@@ -0,0 +1,199 @@
+"""
+Снимки страниц python.org для бенчмарков и локальная подмена сети.
+
+Снимок — словарь {URL: тело ответа}. Синтетический снимок повторяет
+структуру страниц, которые разбирает каждый режим, а по размеру близок
+к настоящим. Сохранённые страницы можно положить в директорию в виде
+`<хост>/<путь>` (для URL, оканчивающегося на `/`, — `<путь>/index.html`)
+и загрузить функцией `load_site`.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+import requests_mock
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+MAIN_DOC_URL = 'https://docs.python.org/3/'
+PEP_URL = 'https://peps.python.org/'
+
+FILLER = '<p>Lorem ipsum <a href="#">dolor</a> sit <code>amet</code>.</p>'
+NAVIGATION = (
+    '<nav><ul>' + '<li><a href="#">menu</a></li>' * 100 + '</ul></nav>'
+)
+PEP_STATUSES = (
+    ('PF', 'Final'),
+    ('IA', 'Active'),
+    ('SR', 'Rejected'),
+    ('SD', 'Deferred'),
+    ('SW', 'Withdrawn'),
+    ('S', 'Draft'),
+)
+ARCHIVES = (
+    'python-docs-pdf-a4.zip',
+    'python-docs-pdf-a4.tar.bz2',
+    'python-docs-pdf-letter.zip',
+    'python-docs-html.zip',
+    'python-docs-text.zip',
+    'python-docs.epub',
+)
+
+
+def _page(body: str) -> str:
+    """Оборачивает содержимое в страницу с навигацией и подвалом."""
+    return (
+        f'<html><head><title>Python</title></head><body>{NAVIGATION}'
+        f'<div role="main">{body}</div>{NAVIGATION}</body></html>'
+    )
+
+
+def synthetic_site(
+    versions: int = 20, peps: int = 100, archive_size: int = 256 * 1024
+) -> dict[str, str | bytes]:
+    """
+    Собирает синтетический снимок страниц всех режимов парсера.
+
+    Args:
+        versions: Количество страниц "What's New".
+        peps: Количество PEP в основной таблице.
+        archive_size: Размер каждого архива документации в байтах.
+
+    Returns:
+        dict: Снимок {URL: тело ответа}.
+    """
+    site: dict[str, str | bytes] = {}
+    numbers = [f'3.{minor}' for minor in range(versions, 0, -1)]
+
+    items = ''.join(
+        f'<li class="toctree-l1"><a href="{number}.html">{number}</a></li>'
+        for number in numbers
+    )
+    site[f'{MAIN_DOC_URL}whatsnew/'] = _page(
+        '<section id="what-s-new-in-python">'
+        f'<div class="toctree-wrapper"><ul>{items}</ul></div></section>'
+    )
+    for number in numbers:
+        site[f'{MAIN_DOC_URL}whatsnew/{number}.html'] = _page(
+            f"<section><h1>What's New In Python {number}</h1>"
+            '<dl class="field-list"><dt>Editor:</dt>\n<dd>Guido</dd></dl>'
+            f'{FILLER * 600}</section>'
+        )
+
+    versions_list = ''.join(
+        f'<li><a href="https://docs.python.org/{number}/">'
+        f'Python {number} (stable)</a></li>'
+        for number in numbers
+    )
+    site[MAIN_DOC_URL] = _page(
+        '<div class="sphinxsidebarwrapper"><ul>'
+        f'{versions_list}<li><a href="#">All versions</a></li></ul></div>'
+        f'{FILLER * 200}'
+    )
+
+    links = ''.join(
+        f'<tr><td><a href="archives/{name}">{name}</a></td></tr>'
+        for name in ARCHIVES
+    )
+    site[f'{MAIN_DOC_URL}download.html'] = _page(
+        f'<table class="docutils">{links}</table>'
+    )
+    for name in ARCHIVES:
+        site[f'{MAIN_DOC_URL}archives/{name}'] = b'\0' * archive_size
+
+    rows = []
+    for number in range(1, peps + 1):
+        abbr, status = PEP_STATUSES[number % len(PEP_STATUSES)]
+        rows.append(
+            f'<tr><td><abbr>{abbr}</abbr></td>'
+            f'<td><a href="pep-{number:04d}/">{number}</a></td>'
+            f'<td>PEP title {number}</td><td>Author</td></tr>'
+        )
+        site[f'{PEP_URL}pep-{number:04d}/'] = _page(
+            f'<section id="pep-content"><h1>PEP {number}</h1>'
+            '<dl class="field-list simple">'
+            '<dt>Author<span>:</span></dt><dd>Guido</dd>'
+            f'<dt>Status<span>:</span></dt><dd><abbr>{status}</abbr></dd>'
+            '</dl>'
+            f'{FILLER * 100}</section>'
+        )
+    site[f'{PEP_URL}numerical'] = _page(
+        '<table class="docutils"><thead><tr><th>S</th></tr></thead>'
+        f'<tbody>{"".join(rows)}</tbody></table>'
+    )
+    return site
+
+
+def _url_to_path(directory: Path, url: str) -> Path:
+    """Возвращает путь к файлу страницы в директории снимка."""
+    parsed = urlparse(url)
+    path = parsed.path.lstrip('/')
+    if not path or path.endswith('/'):
+        path += 'index.html'
+    return directory / parsed.netloc / path
+
+
+def dump_site(site: dict[str, str | bytes], directory: Path) -> None:
+    """Сохраняет снимок в директорию в виде `<хост>/<путь>`."""
+    for url, body in site.items():
+        path = _url_to_path(directory, url)
+        path.parent.mkdir(exist_ok=True, parents=True)
+        if isinstance(body, bytes):
+            path.write_bytes(body)
+        else:
+            path.write_text(body, encoding='utf-8')
+
+
+def load_site(directory: Path) -> dict[str, bytes]:
+    """
+    Загружает снимок из директории, сохранённой `dump_site`.
+
+    Returns:
+        dict: Снимок {URL: тело ответа}.
+    """
+    site = {}
+    for path in directory.rglob('*'):
+        if not path.is_file():
+            continue
+        host, *parts = path.relative_to(directory).parts
+        url_path = '/'.join(parts)
+        url_path = url_path.removesuffix('index.html')
+        site[f'https://{host}/{url_path}'] = path.read_bytes()
+    return site
+
+
+class SiteAdapter(requests_mock.Adapter):
+    """
+    Транспортный адаптер requests, отдающий страницы из снимка.
+
+    Как и адаптер в `tests/conftest.py`, подменяет сеть для сессии,
+    но ищет ответ в словаре, поэтому стоимость поиска не зависит от
+    количества страниц. Считает выполненные запросы в `requests`.
+
+    Args:
+        site: Снимок {URL: тело ответа}.
+    """
+
+    def __init__(self, site: dict[str, str | bytes]) -> None:
+        super().__init__()
+        self.site = site
+        self.requests = 0
+        self.register_uri(
+            requests_mock.ANY, requests_mock.ANY, content=self._respond
+        )
+
+    def _respond(self, request, context) -> bytes:
+        """Возвращает тело страницы или 404, если её нет в снимке."""
+        self.requests += 1
+        body = self.site.get(request.url.split('#')[0])
+        if body is None:
+            context.status_code = 404
+            return b''
+        context.headers['Content-Type'] = 'text/html; charset=utf-8'
+        if request.method == 'HEAD':
+            context.headers['Content-Length'] = str(len(body))
+            return b''
+        return body.encode('utf-8') if isinstance(body, str) else body
@@ -0,0 +1,300 @@
+"""
+Бенчмарк режимов парсера на снимках страниц без обращения к python.org.
+
+Запуск из корня проекта:
+
+    python benchmarks/run.py [--modes pep,whats-new] [-r 3] [--site DIR]
+                             [--save baseline.json] [--compare baseline.json]
+
+Для каждого режима выводятся время работы, число запросов и запросов
+в секунду, время построения дерева HTML на страницу и пиковый расход
+памяти. С --compare результаты сравниваются с сохранённым прогоном,
+а при замедлении больше порога скрипт завершается с кодом 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+import bs4
+from lxml import html as lxml_html
+from prettytable import PrettyTable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from fixtures import SiteAdapter, dump_site, load_site, synthetic_site
+
+import main
+import utils
+from constants import DEFAULT_WORKERS, PARSER_BS4, PARSERS
+
+DEFAULT_THRESHOLD = 0.1
+# Метрики, рост которых считается регрессией
+COMPARED_METRICS = ('wall_time', 'parse_per_page', 'peak_memory')
+
+
+class ParseTimer:
+    """Считает время построения деревьев HTML bs4 и lxml."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+
+    def wrap(self, function):
+        """Оборачивает конструктор дерева замером времени."""
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.seconds += time.perf_counter() - started
+                self.calls += 1
+
+        return timed
+
+    @contextmanager
+    def patch(self):
+        """Подменяет конструкторы деревьев bs4 и lxml на время замера."""
+        soup = bs4.BeautifulSoup
+        fromstring = lxml_html.document_fromstring
+        timed_init = self.wrap(soup.__init__)
+        # Подкласс вместо функции: soupsieve проверяет isinstance
+        # по bs4.BeautifulSoup
+        bs4.BeautifulSoup = type(
+            soup.__name__, (soup,), {'__init__': timed_init}
+        )
+        lxml_html.document_fromstring = self.wrap(fromstring)
+        try:
+            yield self
+        finally:
+            bs4.BeautifulSoup = soup
+            lxml_html.document_fromstring = fromstring
+
+
+@contextmanager
+def sandbox():
+    """Перенаправляет файлы, которые пишут режимы, во временную директорию."""
+    paths = {
+        'DOWNLOADS_DIR': 'downloads',
+        'PEP_HISTORY_PATH': 'pep_history.sqlite',
+        'PEP_CHECKPOINT_PATH': 'pep_checkpoint.json',
+        'PEP_SNAPSHOT_PATH': 'pep_snapshot.json',
+    }
+    saved = {name: getattr(main, name) for name in paths}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, path in paths.items():
+            setattr(main, name, Path(directory) / path)
+        try:
+            yield
+        finally:
+            for name, value in saved.items():
+                setattr(main, name, value)
+
+
+def run_mode(mode: str, site: dict, options: dict) -> dict:
+    """
+    Один раз выполняет режим на снимке страниц.
+
+    Returns:
+        dict: Время работы, число запросов и время построения деревьев.
+    """
+    adapter = SiteAdapter(site)
+    session = utils.create_session(backend='memory', result_cache_path=None)
+    session.mount('https://', adapter)
+    function = main.MODE_TO_FUNCTION[mode]
+    kwargs = main.get_mode_kwargs(function, argparse.Namespace(**options))
+    timer = ParseTimer()
+    with sandbox(), timer.patch():
+        started = time.perf_counter()
+        function(session, **kwargs)
+        wall_time = time.perf_counter() - started
+    return {
+        'wall_time': wall_time,
+        'requests': adapter.requests,
+        'pages': timer.calls,
+        'parse_time': timer.seconds,
+    }
+
+
+def measure_mode(mode: str, site: dict, options: dict, repeat: int) -> dict:
+    """
+    Замеряет режим: медиана по `repeat` прогонам и пиковая память.
+
+    Память замеряется отдельным прогоном, чтобы tracemalloc
+    не искажал время.
+    """
+    runs = [run_mode(mode, site, options) for _ in range(repeat)]
+    wall_time = statistics.median(run['wall_time'] for run in runs)
+    parse_time = statistics.median(run['parse_time'] for run in runs)
+    pages = runs[0]['pages']
+
+    tracemalloc.start()
+    try:
+        run_mode(mode, site, options)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'wall_time': wall_time,
+        'requests': runs[0]['requests'],
+        'requests_per_second': runs[0]['requests'] / wall_time,
+        'pages': pages,
+        'parse_per_page': parse_time / pages if pages else 0.0,
+        'peak_memory': peak_memory,
+    }
+
+
+def find_regressions(
+    results: dict, baseline: dict, threshold: float
+) -> dict[str, list[str]]:
+    """
+    Сравнивает результаты с сохранённым прогоном.
+
+    Returns:
+        dict: {режим: [метрики, выросшие больше чем на threshold]}.
+    """
+    regressions = {}
+    for mode, metrics in results.items():
+        previous = baseline.get(mode)
+        if previous is None:
+            continue
+        worse = [
+            name
+            for name in COMPARED_METRICS
+            if previous.get(name)
+            and metrics[name] > previous[name] * (1 + threshold)
+        ]
+        if worse:
+            regressions[mode] = worse
+    return regressions
+
+
+def _change(metrics: dict, previous: dict | None, name: str) -> str:
+    """Форматирует изменение метрики относительно сохранённого прогона."""
+    if not previous or not previous.get(name):
+        return ''
+    return f' ({(metrics[name] / previous[name] - 1) * 100:+.0f}%)'
+
+
+def report(results: dict, baseline: dict) -> None:
+    """Печатает таблицу результатов."""
+    table = PrettyTable()
+    table.field_names = (
+        'Режим',
+        'Время, с',
+        'Запросов',
+        'Запросов/с',
+        'Разбор, мс/стр.',
+        'Пик памяти, МиБ',
+    )
+    table.align = 'r'
+    for mode, metrics in results.items():
+        previous = baseline.get(mode)
+        table.add_row(
+            (
+                mode,
+                f'{metrics["wall_time"]:.3f}'
+                + _change(metrics, previous, 'wall_time'),
+                metrics['requests'],
+                f'{metrics["requests_per_second"]:.0f}',
+                f'{metrics["parse_per_page"] * 1000:.2f}'
+                + _change(metrics, previous, 'parse_per_page'),
+                f'{metrics["peak_memory"] / 2**20:.1f}'
+                + _change(metrics, previous, 'peak_memory'),
+            )
+        )
+    print(table)
+
+
+def configure_argument_parser() -> argparse.ArgumentParser:
+    """Создаёт парсер аргументов командной строки бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        '--modes',
+        type=lambda value: value.split(','),
+        default=list(main.MODE_TO_FUNCTION),
+        help='Режимы через запятую (по умолчанию все)',
+    )
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=3, help='Количество прогонов'
+    )
+    parser.add_argument('-w', '--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--parser', choices=PARSERS, default=PARSER_BS4)
+    parser.add_argument(
+        '--site', type=Path, help='Директория с сохранёнными страницами'
+    )
+    parser.add_argument(
+        '--peps',
+        type=int,
+        default=100,
+        help='Количество PEP в синтетическом снимке',
+    )
+    parser.add_argument(
+        '--versions',
+        type=int,
+        default=20,
+        help='Количество версий Python в синтетическом снимке',
+    )
+    parser.add_argument(
+        '--dump-site',
+        type=Path,
+        help='Сохранить синтетический снимок страниц в директорию и выйти',
+    )
+    parser.add_argument(
+        '--save', type=Path, help='Сохранить результаты в JSON файл'
+    )
+    parser.add_argument(
+        '--compare', type=Path, help='Сравнить с сохранёнными результатами'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help='Допустимый рост метрик при сравнении (по умолчанию 0.1)',
+    )
+    return parser
+
+
+def run_benchmarks() -> int:
+    """Запускает бенчмарк и возвращает код завершения."""
+    args = configure_argument_parser().parse_args()
+    if args.dump_site:
+        dump_site(synthetic_site(args.versions, args.peps), args.dump_site)
+        return 0
+
+    site = (
+        load_site(args.site)
+        if args.site
+        else synthetic_site(args.versions, args.peps)
+    )
+    options = {'workers': args.workers, 'parser': args.parser}
+    results = {
+        mode: measure_mode(mode, site, options, args.repeat)
+        for mode in args.modes
+    }
+
+    baseline = {}
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding='utf-8'))
+    report(results, baseline)
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2), encoding='utf-8')
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    for mode, metrics in regressions.items():
+        print(f'Регрессия в режиме {mode}: {", ".join(metrics)}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_benchmarks())
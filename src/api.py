@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import datetime as dt
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING
+
+from outputs import result_columns
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'application/json; charset=utf-8'
+RESULTS_PATH = '/results/'
+
+
+class Resource:
+    """
+    Готовый к отправке JSON-документ API.
+
+    Тело, его сжатая версия и ETag вычисляются один раз при обновлении
+    результатов, поэтому запрос к API не сериализует и не сжимает данные.
+
+    Args:
+        document: Документ, сериализуемый в JSON.
+    """
+
+    def __init__(self, document: dict | list) -> None:
+        self.body = json.dumps(document, ensure_ascii=False).encode('utf-8')
+        self.gzipped = gzip.compress(self.body)
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+
+
+class ResultStore:
+    """
+    Потокобезопасный снимок последних результатов режимов в памяти.
+
+    Парсер обновляет снимок после каждого запуска режима, а API отдаёт
+    его без обращения к сети и файлам результатов.
+    """
+
+    def __init__(self) -> None:
+        self._resources: dict[str, Resource] = {}
+        self._updated_at: dict[str, str] = {}
+        self._index = Resource({'modes': {}})
+        self._lock = threading.Lock()
+
+    def update(self, parser_mode: str, results: Iterable[tuple]) -> None:
+        """
+        Заменяет результаты режима в снимке.
+
+        Args:
+            parser_mode: Режим работы парсера.
+            results: Строка заголовков, затем строки данных.
+        """
+        rows = iter(results)
+        columns = result_columns(next(rows), parser_mode)
+        updated_at = dt.datetime.now(dt.timezone.utc).isoformat(
+            timespec='seconds'
+        )
+        resource = Resource(
+            {
+                'mode': parser_mode,
+                'updated_at': updated_at,
+                'columns': list(columns),
+                'rows': [dict(zip(columns, row)) for row in rows],
+            }
+        )
+        with self._lock:
+            self._resources[parser_mode] = resource
+            self._updated_at[parser_mode] = updated_at
+            self._index = Resource(
+                {
+                    'modes': {
+                        mode: {
+                            'url': f'{RESULTS_PATH}{mode}',
+                            'updated_at': self._updated_at[mode],
+                        }
+                        for mode in sorted(self._resources)
+                    }
+                }
+            )
+
+    def get(self, path: str) -> Resource | None:
+        """
+        Возвращает документ по пути запроса.
+
+        Args:
+            path: Путь: `/` — список режимов, `/results/<режим>` —
+                результаты режима.
+
+        Returns:
+            Resource | None: Документ или None, если пути нет.
+        """
+        with self._lock:
+            if path == '/':
+                return self._index
+            if path.startswith(RESULTS_PATH):
+                return self._resources.get(path.removeprefix(RESULTS_PATH))
+        return None
+
+
+class ApiServer:
+    """
+    HTTP-сервер только для чтения последних результатов режимов.
+
+    Отдаёт JSON из снимка `ResultStore`: `/` — список режимов и время
+    обновления, `/results/<режим>` — столбцы и строки результатов.
+    Поддерживаются условные запросы (ETag, If-None-Match) и сжатие gzip.
+    Сервер работает в фоновом потоке.
+
+    Args:
+        store: Снимок результатов.
+        port: Порт (0 — выбрать свободный).
+        host: Адрес, на котором принимаются соединения.
+    """
+
+    def __init__(
+        self, store: ResultStore, port: int, host: str = '127.0.0.1'
+    ) -> None:
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                resource = store.get(self.path.split('?')[0])
+                if resource is None:
+                    self.send_error(HTTPStatus.NOT_FOUND)
+                    return
+                if resource.etag in self.headers.get('If-None-Match', ''):
+                    self.send_response(HTTPStatus.NOT_MODIFIED)
+                    self.send_header('ETag', resource.etag)
+                    self.end_headers()
+                    return
+                body = resource.body
+                self.send_response(HTTPStatus.OK)
+                if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    body = resource.gzipped
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', resource.etag)
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Vary', 'Accept-Encoding')
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                logger.debug(*args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+
+    @property
+    def port(self) -> int:
+        """Порт, на котором работает сервер."""
+        return self._server.server_address[1]
+
+    def start(self) -> ApiServer:
+        """Запускает сервер в фоновом потоке."""
+        self._thread.start()
+        logger.info(
+            'Результаты доступны по адресу http://%s:%d/',
+            self._server.server_address[0],
+            self.port,
+        )
+        return self
+
+    def stop(self) -> None:
+        """Останавливает сервер."""
+        self._server.shutdown()
+        self._server.server_close()
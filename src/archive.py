@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from requests import ConnectionError as RequestsConnectionError
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3 import HTTPResponse
+
+from exceptions import ExchangeArchiveException
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    import requests
+
+INDEX_NAME = 'index.jsonl'
+OBJECTS_DIR = 'objects'
+# Тело хранится распакованным, поэтому эти заголовки при воспроизведении
+# не соответствуют ему
+DROPPED_HEADERS = ('Content-Encoding', 'Transfer-Encoding')
+
+
+class ExchangeArchive:
+    """
+    Архив HTTP-обменов на диске.
+
+    Тела ответов хранятся в сжатом виде по SHA-256 содержимого
+    (`objects/<2 символа>/<хеш>.gz`), поэтому одинаковые ответы
+    занимают место один раз. Метаданные обменов дописываются по одному
+    в `index.jsonl`: запись прерванного запуска остаётся пригодной для
+    воспроизведения. Запросы различаются методом, URL и заголовком
+    Range, поэтому HEAD-запрос, полная загрузка и докачка архива
+    хранятся отдельно. При повторной записи того же запроса
+    используется последний ответ.
+
+    Args:
+        path: Директория архива.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._exchanges: dict[tuple[str, str, str | None], dict] = {}
+        index_path = path / INDEX_NAME
+        if index_path.exists():
+            with index_path.open(encoding='utf-8') as f:
+                for line in f:
+                    exchange = json.loads(line)
+                    key = (
+                        exchange['method'],
+                        exchange['url'],
+                        exchange.get('range'),
+                    )
+                    self._exchanges[key] = exchange
+
+    @classmethod
+    def load(cls, path: Path) -> ExchangeArchive:
+        """
+        Открывает записанный архив для воспроизведения.
+
+        Args:
+            path: Директория архива.
+
+        Returns:
+            ExchangeArchive: Архив с записанными обменами.
+
+        Raises:
+            ExchangeArchiveException: Если нет директории архива
+                или его индекса.
+        """
+        if not path.is_dir():
+            error_msg = f'Не найдена директория архива HTTP-обменов {path}'
+            raise ExchangeArchiveException(error_msg)
+        if not (path / INDEX_NAME).is_file():
+            error_msg = f'В директории {path} нет индекса архива {INDEX_NAME}'
+            raise ExchangeArchiveException(error_msg)
+        return cls(path)
+
+    def __len__(self) -> int:
+        return len(self._exchanges)
+
+    def _object_path(self, digest: str) -> Path:
+        """Возвращает путь к сжатому телу ответа."""
+        return self.path / OBJECTS_DIR / digest[:2] / f'{digest}.gz'
+
+    @staticmethod
+    def _key(
+        request: requests.PreparedRequest,
+    ) -> tuple[str, str, str | None]:
+        """Возвращает ключ обмена: метод, URL и заголовок Range."""
+        return request.method, request.url, request.headers.get('Range')
+
+    def add(self, exchange: dict, body_path: Path, digest: str) -> None:
+        """
+        Добавляет в архив обмен с записанным телом ответа.
+
+        Сжатое тело переносится в хранилище, если такого тела там ещё
+        нет, после чего обмен дописывается в индекс.
+
+        Args:
+            exchange: Метаданные обмена без тела.
+            body_path: Временный файл со сжатым телом ответа.
+            digest: Хеш SHA-256 несжатого тела.
+        """
+        object_path = self._object_path(digest)
+        if object_path.exists():
+            body_path.unlink()
+        else:
+            object_path.parent.mkdir(exist_ok=True, parents=True)
+            body_path.replace(object_path)
+        exchange = {**exchange, 'body': digest}
+        line = json.dumps(exchange, ensure_ascii=False) + '\n'
+        key = (exchange['method'], exchange['url'], exchange['range'])
+        with self._lock:
+            with (self.path / INDEX_NAME).open('a', encoding='utf-8') as f:
+                f.write(line)
+            self._exchanges[key] = exchange
+
+    def record(
+        self, request: requests.PreparedRequest, response: requests.Response
+    ) -> None:
+        """
+        Начинает запись запроса и ответа на него.
+
+        Тело ответа сохраняется по мере чтения (см. `_RecordingBody`),
+        а обмен попадает в индекс, когда тело прочитано до конца.
+
+        Args:
+            request: Отправленный запрос.
+            response: Ответ сервера, тело которого ещё не прочитано.
+        """
+        method, url, byte_range = self._key(request)
+        exchange = {
+            'method': method,
+            'url': url,
+            'range': byte_range,
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {
+                name: value
+                for name, value in response.headers.items()
+                if name not in DROPPED_HEADERS
+            },
+        }
+        (self.path / OBJECTS_DIR).mkdir(exist_ok=True, parents=True)
+        response.raw = _RecordingBody(response.raw, self, exchange)
+
+    def replay(self, request: requests.PreparedRequest) -> HTTPResponse:
+        """
+        Возвращает записанный ответ на запрос.
+
+        Args:
+            request: Запрос, для которого нужен ответ.
+
+        Returns:
+            HTTPResponse: Ответ в виде, который возвращает urllib3.
+
+        Raises:
+            requests.ConnectionError: Если запрос не был записан.
+        """
+        exchange = self._exchanges.get(self._key(request))
+        if exchange is None:
+            error_msg = (
+                f'Нет записи {request.method} {request.url} '
+                f'в архиве {self.path}'
+            )
+            raise RequestsConnectionError(error_msg, request=request)
+        body = gzip.decompress(
+            self._object_path(exchange['body']).read_bytes()
+        )
+        headers = dict(exchange['headers'])
+        if request.method != 'HEAD':
+            headers['Content-Length'] = str(len(body))
+        return HTTPResponse(
+            body=io.BytesIO(body),
+            headers=headers,
+            status=exchange['status'],
+            reason=exchange['reason'],
+            preload_content=False,
+            request_method=request.method,
+        )
+
+
+class _RecordingBody:
+    """
+    Тело ответа, которое сохраняется в архив по мере чтения.
+
+    Прочитанные блоки хешируются и сжимаются во временный файл, поэтому
+    большой ответ (например, архив документации) не держится в памяти
+    целиком. Когда тело прочитано до конца, файл переносится
+    в хранилище по хешу и обмен дописывается в индекс; обмен с
+    недочитанным телом не записывается. Остальные атрибуты берутся
+    у исходного ответа urllib3.
+
+    Args:
+        raw: Ответ urllib3.
+        archive: Архив HTTP-обменов.
+        exchange: Метаданные обмена без тела.
+    """
+
+    def __init__(
+        self, raw: HTTPResponse, archive: ExchangeArchive, exchange: dict
+    ) -> None:
+        self._raw = raw
+        self._archive = archive
+        self._exchange = exchange
+        self._digest = hashlib.sha256()
+        fd, name = tempfile.mkstemp(
+            suffix='.tmp', dir=archive.path / OBJECTS_DIR
+        )
+        self._tmp_path = Path(name)
+        self._tmp_file = os.fdopen(fd, 'wb')
+        self._file: gzip.GzipFile | None = gzip.GzipFile(
+            fileobj=self._tmp_file, mode='wb'
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw, name)
+
+    def read(self, amt: int | None = None, **_kwargs) -> bytes:
+        """Читает блок тела (распакованный) и сохраняет его в архив."""
+        chunk = self._raw.read(amt, decode_content=True)
+        if self._file is not None:
+            self._digest.update(chunk)
+            self._file.write(chunk)
+            if not chunk or amt is None:
+                self._finish()
+        return chunk
+
+    def stream(self, amt: int | None = 2**16, **_kwargs) -> Iterator[bytes]:
+        """Выдаёт тело блоками по `amt` байт."""
+        while chunk := self.read(amt):
+            yield chunk
+
+    def _close_file(self) -> None:
+        """Закрывает временный файл вместе с файлом под сжатым потоком."""
+        self._file.close()
+        self._tmp_file.close()
+        self._file = None
+
+    def _finish(self) -> None:
+        """Переносит тело в хранилище и записывает обмен в индекс."""
+        self._close_file()
+        self._archive.add(
+            self._exchange, self._tmp_path, self._digest.hexdigest()
+        )
+
+    def close(self) -> None:
+        """Закрывает ответ, удаляя недочитанное тело."""
+        self._raw.close()
+        if self._file is not None:
+            self._close_file()
+            self._tmp_path.unlink(missing_ok=True)
+
+
+class RecordingAdapter(BaseAdapter):
+    """
+    Транспортный адаптер requests, записывающий каждый обмен в архив.
+
+    Args:
+        archive: Архив HTTP-обменов.
+        adapter: Адаптер, выполняющий запрос (по умолчанию HTTPAdapter).
+    """
+
+    def __init__(
+        self, archive: ExchangeArchive, adapter: BaseAdapter | None = None
+    ) -> None:
+        super().__init__()
+        self.archive = archive
+        self.adapter = adapter or HTTPAdapter()
+
+    def send(self, request, **kwargs):
+        """Выполняет запрос вложенным адаптером и записывает ответ."""
+        response = self.adapter.send(request, **kwargs)
+        self.archive.record(request, response)
+        return response
+
+    def close(self) -> None:
+        """Закрывает вложенный адаптер."""
+        self.adapter.close()
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    Транспортный адаптер requests, отвечающий из архива без обращения к сети.
+
+    Args:
+        archive: Архив HTTP-обменов.
+    """
+
+    def __init__(self, archive: ExchangeArchive) -> None:
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request, **_kwargs):
+        """Возвращает записанный ответ на запрос."""
+        return self.build_response(request, self.archive.replay(request))
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable
+from urllib.parse import urlparse
+
+from constants import DEFAULT_WORKERS
+from utils import get_parsed_page, get_response, get_soup
+
+if TYPE_CHECKING:
+    import requests_cache
+    from bs4 import BeautifulSoup
+
+
+class AsyncSession:
+    """
+    Асинхронная обёртка над кешированной сессией.
+
+    Запросы выполняются через ту же `requests_cache.CachedSession`, поэтому
+    используют общий SQLite-кеш и пул keep-alive соединений сессии. Для
+    каждого хоста создаётся свой пул потоков размером `per_host`, что
+    ограничивает число одновременных запросов к одному хосту.
+
+    Args:
+        session: Кешированная сессия для HTTP запросов.
+        per_host: Максимум одновременных запросов к одному хосту.
+    """
+
+    def __init__(
+        self,
+        session: requests_cache.CachedSession,
+        per_host: int = DEFAULT_WORKERS,
+    ) -> None:
+        self.session = session
+        self.per_host = per_host
+        self._executors: dict[str, ThreadPoolExecutor] = {}
+
+    async def __aenter__(self) -> AsyncSession:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Останавливает пулы потоков всех хостов."""
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
+        self._executors.clear()
+
+    async def run(
+        self, url: str, function: Callable, *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        Выполняет блокирующую функцию в пуле потоков хоста из `url`.
+
+        Args:
+            url: URL, по хосту которого выбирается пул потоков.
+            function: Блокирующая функция.
+            *args: Позиционные аргументы функции.
+            **kwargs: Именованные аргументы функции.
+
+        Returns:
+            Any: Результат функции.
+        """
+        host = urlparse(url).hostname or ''
+        if host not in self._executors:
+            self._executors[host] = ThreadPoolExecutor(
+                max_workers=self.per_host, thread_name_prefix=host
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executors[host],
+            functools.partial(function, *args, **kwargs),
+        )
+
+
+async def get_response_async(
+    client: AsyncSession, url: str, encoding: str = 'utf-8', **kwargs: Any
+) -> requests_cache.Response:
+    """
+    Асинхронно выполняет HTTP-запрос по указанному URL.
+
+    Args:
+        client: Асинхронная сессия.
+        url: URL для запроса.
+        encoding: Кодировка ответа.
+        **kwargs: Дополнительные аргументы запроса (method, headers и т.д.).
+
+    Returns:
+        requests_cache.Response: Объект ответа.
+
+    Raises:
+        RequestErrorException: При ошибке HTTP-запроса.
+    """
+    return await client.run(
+        url, get_response, client.session, url, encoding, **kwargs
+    )
+
+
+async def get_soup_async(
+    client: AsyncSession, url: str, features: str = 'lxml', **kwargs: Any
+) -> BeautifulSoup:
+    """
+    Асинхронно загружает страницу и создаёт из неё объект BeautifulSoup.
+
+    Разбор HTML выполняется в том же пуле потоков, что и запрос, чтобы
+    не блокировать цикл событий.
+
+    Args:
+        client: Асинхронная сессия.
+        url: URL-адрес страницы для парсинга.
+        features: Парсер, используемый BeautifulSoup (по умолчанию 'lxml').
+        **kwargs: Дополнительные аргументы запроса (например, expire_after).
+
+    Returns:
+        BeautifulSoup: Объект для парсинга HTML.
+
+    Raises:
+        RequestErrorException: При ошибке HTTP-запроса.
+    """
+    return await client.run(
+        url, get_soup, client.session, url, features, **kwargs
+    )
+
+
+async def get_parsed_page_async(
+    client: AsyncSession,
+    url: str,
+    extract: Callable[[Any], Any],
+    **kwargs: Any,
+) -> Any:
+    """
+    Асинхронно загружает страницу и извлекает из неё данные.
+
+    Использует кеш результатов разбора сессии так же, как
+    `get_parsed_page`.
+
+    Args:
+        client: Асинхронная сессия.
+        url: URL-адрес страницы.
+        extract: Функция, извлекающая данные из дерева документа.
+        **kwargs: Движок разбора (parser) и дополнительные аргументы
+            запроса (например, expire_after).
+
+    Returns:
+        Any: Результат функции `extract`.
+    """
+    return await client.run(
+        url, get_parsed_page, client.session, url, extract, **kwargs
+    )
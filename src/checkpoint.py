@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import exceptions
+from constants import CHECKPOINT_EVERY, CHECKPOINT_INTERVAL
+from exceptions import ParserBaseException, ParserFindTagException
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Ключ строки таблицы: тексты ячеек через символ-разделитель
+CELL_SEPARATOR = '\x1f'
+
+
+class PepCheckpoint:
+    """
+    Контрольная точка прерванного запуска режима `pep`.
+
+    Для каждой обработанной строки основной таблицы PEP хранится её
+    результат: ссылка и статусы или ошибка разбора (класс и сообщение).
+    Временные ошибки загрузки (таймауты, ответы 5xx, обрывы соединения)
+    не сохраняются: при продолжении запуска такие строки загружаются
+    повторно.
+    Строки определяются по текстам ячеек, поэтому при продолжении
+    запуска результат используется, только если строка таблицы не
+    изменилась. Количество PEP по статусам и ошибки восстанавливаются
+    из результатов строк, поэтому итог продолженного запуска совпадает
+    с итогом непрерывного.
+
+    Файл перезаписывается атомарно не чаще раза в `interval` секунд
+    или после каждых `every` обработанных строк.
+
+    Args:
+        path: Путь к файлу контрольной точки.
+        entries: Результаты строк прерванного запуска.
+        every: Количество строк между сохранениями.
+        interval: Время между сохранениями в секундах.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        entries: dict[str, dict] | None = None,
+        every: int = CHECKPOINT_EVERY,
+        interval: float = CHECKPOINT_INTERVAL,
+    ) -> None:
+        self.path = path
+        self.entries = entries or {}
+        self.every = every
+        self.interval = interval
+        self.restored = 0
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path, **kwargs) -> PepCheckpoint:
+        """
+        Загружает контрольную точку прерванного запуска.
+
+        Args:
+            path: Путь к файлу контрольной точки.
+            **kwargs: Частота сохранений (every, interval).
+
+        Returns:
+            PepCheckpoint: Контрольная точка (пустая, если файла нет
+            или он повреждён).
+        """
+        entries = {}
+        if path.exists():
+            try:
+                entries = json.loads(path.read_text(encoding='utf-8'))
+            except ValueError:
+                logger.warning('Контрольная точка %s повреждена', path)
+        return cls(path, entries, **kwargs)
+
+    @staticmethod
+    def _key(cells: list[str]) -> str:
+        return CELL_SEPARATOR.join(cells)
+
+    def restore(
+        self, cells: list[str]
+    ) -> tuple[bool, tuple | ParserBaseException | None]:
+        """
+        Возвращает сохранённый результат строки таблицы.
+
+        Args:
+            cells: Тексты ячеек строки основной таблицы.
+
+        Returns:
+            tuple: (найден ли результат, результат строки).
+        """
+        entry = self.entries.get(self._key(cells))
+        if entry is None:
+            return False, None
+        with self._lock:
+            self.restored += 1
+        if entry['error'] is not None:
+            name, message = entry['error']
+            error_class = getattr(exceptions, name, ParserBaseException)
+            return True, error_class(message)
+        outcome = entry['outcome']
+        return True, tuple(outcome) if outcome is not None else None
+
+    def add(
+        self, cells: list[str], outcome: tuple | ParserBaseException | None
+    ) -> None:
+        """
+        Запоминает результат строки и при необходимости сохраняет файл.
+
+        Ошибки, кроме ParserFindTagException, не запоминаются.
+
+        Args:
+            cells: Тексты ячеек строки основной таблицы.
+            outcome: Результат обработки строки.
+        """
+        if isinstance(outcome, ParserFindTagException):
+            entry = {
+                'outcome': None,
+                'error': [type(outcome).__name__, str(outcome)],
+            }
+        elif isinstance(outcome, ParserBaseException):
+            return
+        else:
+            entry = {'outcome': outcome, 'error': None}
+        with self._lock:
+            self.entries[self._key(cells)] = entry
+            self._unsaved += 1
+            due = (
+                self._unsaved >= self.every
+                or time.monotonic() - self._saved_at >= self.interval
+            )
+        if due:
+            self.save()
+
+    def save(self) -> None:
+        """Атомарно сохраняет контрольную точку."""
+        with self._lock:
+            data = json.dumps(self.entries, ensure_ascii=False)
+            self._unsaved = 0
+            self._saved_at = time.monotonic()
+            self.path.parent.mkdir(exist_ok=True, parents=True)
+            tmp_path = self.path.with_name(f'{self.path.name}.tmp')
+            tmp_path.write_text(data, encoding='utf-8')
+            tmp_path.replace(self.path)
+
+    def remove(self) -> None:
+        """Удаляет контрольную точку после успешного завершения запуска."""
+        self.path.unlink(missing_ok=True)
@@ -1,24 +1,98 @@
 import argparse
 import logging
+from collections.abc import Callable, Iterable
 from logging.handlers import RotatingFileHandler
+from pathlib import Path
 
 from constants import (
     BACKUPCOUNT,
+    COMPRESSION_EXTENSIONS,
+    DEFAULT_COMPRESSION,
+    DEFAULT_DOWNLOAD_FORMATS,
+    DEFAULT_WORKERS,
+    DOWNLOAD_FORMATS,
     LOG_DIR,
     LOG_DT_FORMAT,
     LOG_FILE,
     LOG_FORMAT,
     MAXBYTES,
-    OUTPUT_FILE,
-    OUTPUT_PRETTY,
+    OUTPUT_FORMATS,
+    PARSER_BS4,
+    PARSERS,
+    PEP_VERIFY_SAMPLE,
+    REQUEST_TIMEOUT,
+    RETRY_TOTAL,
 )
 
 
+def positive_int(value: str) -> int:
+    """Проверяет, что аргумент командной строки — положительное число."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        msg = f'Ожидается положительное целое число, получено: {value}'
+        raise argparse.ArgumentTypeError(msg)
+    return number
+
+
+def non_negative_int(value: str) -> int:
+    """Проверяет, что аргумент командной строки — неотрицательное число."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        msg = f'Ожидается неотрицательное целое число, получено: {value}'
+        raise argparse.ArgumentTypeError(msg)
+    return number
+
+
+def positive_float(value: str) -> float:
+    """Проверяет, что аргумент командной строки — положительное число."""
+    try:
+        number = float(value)
+    except ValueError:
+        number = 0.0
+    if not number > 0:
+        msg = f'Ожидается положительное число, получено: {value}'
+        raise argparse.ArgumentTypeError(msg)
+    return number
+
+
+def comma_separated(choices: Iterable[str]) -> Callable[[str], tuple]:
+    """
+    Создаёт тип аргумента для списка значений через запятую.
+
+    Args:
+        choices: Допустимые значения списка.
+
+    Returns:
+        Callable: Функция, превращающая строку в кортеж значений.
+    """
+
+    def parse(value: str) -> tuple:
+        stripped = (item.strip() for item in value.split(','))
+        items = tuple(item for item in stripped if item)
+        unknown = [item for item in items if item not in choices]
+        if not items or unknown:
+            msg = (
+                f'Недопустимые значения: {", ".join(unknown) or value}. '
+                f'Доступны: {", ".join(choices)}'
+            )
+            raise argparse.ArgumentTypeError(msg)
+        return items
+
+    return parse
+
+
 def configure_argument_parser(available_modes):
     """Создаёт и настраивает парсер аргументов командной строки."""
     parser = argparse.ArgumentParser(description='Парсер документации Python')
     parser.add_argument(
         'mode',
+        nargs='+',
         choices=available_modes,
         help='Режимы работы парсера',
     )
@@ -31,9 +105,204 @@ def configure_argument_parser(available_modes):
     parser.add_argument(
         '-o',
         '--output',
-        choices=(OUTPUT_PRETTY, OUTPUT_FILE),
+        choices=OUTPUT_FORMATS,
         help='Дополнительные способы вывода данных',
     )
+    parser.add_argument(
+        '--append',
+        action='store_true',
+        help=(
+            'Дописывать результаты в общий набор данных режима '
+            '(форматы jsonl, sqlite, parquet) вместо нового файла'
+        ),
+    )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=positive_int,
+        default=DEFAULT_WORKERS,
+        help='Количество потоков для параллельной загрузки страниц',
+    )
+    parser.add_argument(
+        '--parse-processes',
+        type=non_negative_int,
+        nargs='?',
+        const=0,
+        metavar='N',
+        help=(
+            'Разбирать страницы в пуле из N процессов '
+            '(без N или 0 — по числу ядер процессора)'
+        ),
+    )
+    parser.add_argument(
+        '--retries',
+        type=non_negative_int,
+        default=RETRY_TOTAL,
+        help=(
+            'Количество повторов запроса при ошибке соединения, таймауте '
+            'и ответах 429 и 5xx'
+        ),
+    )
+    parser.add_argument(
+        '--timeout',
+        type=positive_float,
+        default=REQUEST_TIMEOUT,
+        metavar='SECONDS',
+        help='Таймаут соединения и чтения ответа в секундах',
+    )
+    parser.add_argument(
+        '-a',
+        '--async',
+        action='store_true',
+        dest='use_async',
+        help='Асинхронная загрузка страниц (режимы whats-new и pep)',
+    )
+    parser.add_argument(
+        '-i',
+        '--incremental',
+        action='store_true',
+        help=(
+            'Режим pep: загружать страницы только для новых и изменившихся '
+            'строк таблицы PEP'
+        ),
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help=(
+            'Режим pep: продолжить прерванный запуск с последней '
+            'контрольной точки'
+        ),
+    )
+    parser.add_argument(
+        '--sections',
+        action='store_true',
+        help=(
+            'Режим whats-new: извлекать оглавление страниц версий '
+            '(разделы, новые модули, устаревшие API)'
+        ),
+    )
+    parser.add_argument(
+        '--introduced',
+        action='append',
+        metavar='NAME',
+        help=(
+            'Режим whats-new: вывести, в какой версии появился модуль '
+            'и в каких версиях устарел API (можно указать несколько раз)'
+        ),
+    )
+    parser.add_argument(
+        '--verify-sample',
+        type=non_negative_int,
+        default=PEP_VERIFY_SAMPLE,
+        help=(
+            'Количество случайных неизменившихся PEP для перепроверки '
+            'в инкрементальном режиме'
+        ),
+    )
+    parser.add_argument(
+        '--diff',
+        nargs=2,
+        type=positive_int,
+        metavar=('FROM_RUN', 'TO_RUN'),
+        help=(
+            'Режим pep-history: показать PEP, статус которых изменился '
+            'между двумя запусками'
+        ),
+    )
+    parser.add_argument(
+        '--formats',
+        type=comma_separated(DOWNLOAD_FORMATS),
+        default=DEFAULT_DOWNLOAD_FORMATS,
+        help=(
+            'Форматы документации для режима download через запятую: '
+            f'{",".join(DOWNLOAD_FORMATS)}'
+        ),
+    )
+    parser.add_argument(
+        '--compression',
+        type=comma_separated(COMPRESSION_EXTENSIONS),
+        default=DEFAULT_COMPRESSION,
+        help=(
+            'Форматы упаковки архивов для режима download через запятую: '
+            f'{",".join(COMPRESSION_EXTENSIONS)}'
+        ),
+    )
+    parser.add_argument(
+        '--parser',
+        choices=PARSERS,
+        default=PARSER_BS4,
+        help=(
+            'Движок разбора страниц в режимах whats-new и pep: '
+            'bs4 (BeautifulSoup) или lxml (быстрее)'
+        ),
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help=(
+            'Замерить длительность фаз запуска (сеть, кеш, ожидание, '
+            'разбор, извлечение, вывод) и вывести сводку в конце'
+        ),
+    )
+    parser.add_argument(
+        '--profile-json',
+        type=Path,
+        metavar='FILE',
+        help='Сохранить сводку замеров в JSON файл (включает --profile)',
+    )
+    parser.add_argument(
+        '--metrics-file',
+        type=Path,
+        metavar='FILE',
+        help=(
+            'Записать метрики запуска в формате Prometheus в файл '
+            '(для textfile collector node_exporter)'
+        ),
+    )
+    parser.add_argument(
+        '--metrics-port',
+        type=non_negative_int,
+        metavar='PORT',
+        help='Отдавать метрики по адресу http://127.0.0.1:PORT/metrics',
+    )
+    parser.add_argument(
+        '--watch',
+        type=positive_float,
+        metavar='SECONDS',
+        help=(
+            'Не завершаться, а повторять запуск режимов раз в SECONDS '
+            'секунд с уже открытыми кешами'
+        ),
+    )
+    parser.add_argument(
+        '--cycles',
+        type=positive_int,
+        metavar='N',
+        help='Режим --watch: завершиться после N циклов',
+    )
+    parser.add_argument(
+        '--serve',
+        type=non_negative_int,
+        metavar='PORT',
+        help=(
+            'Отдавать последние результаты режимов в JSON по адресу '
+            'http://127.0.0.1:PORT/results/<режим>'
+        ),
+    )
+    archive_group = parser.add_mutually_exclusive_group()
+    archive_group.add_argument(
+        '--record',
+        type=Path,
+        metavar='DIR',
+        help='Записать все HTTP-обмены запуска в архив в директории DIR',
+    )
+    archive_group.add_argument(
+        '--replay',
+        type=Path,
+        metavar='DIR',
+        help='Отвечать на запросы из архива в директории DIR без сети',
+    )
     return parser
 
 
@@ -4,6 +4,16 @@ BASE_DIR = Path(__file__).parent
 
 OUTPUT_PRETTY = 'pretty'
 OUTPUT_FILE = 'file'
+OUTPUT_JSONL = 'jsonl'
+OUTPUT_SQLITE = 'sqlite'
+OUTPUT_PARQUET = 'parquet'
+OUTPUT_FORMATS = (
+    OUTPUT_PRETTY,
+    OUTPUT_FILE,
+    OUTPUT_JSONL,
+    OUTPUT_SQLITE,
+    OUTPUT_PARQUET,
+)
 LOG_DIR = BASE_DIR / 'logs'
 LOG_FILE = LOG_DIR / 'parser.log'
 DOWNLOADS_DIR = BASE_DIR / 'downloads'
@@ -14,6 +24,79 @@ PEP_URL = 'https://peps.python.org/'
 
 DATETIME_FORMAT = '%Y-%m-%d_%H-%M-%S'
 
+# Типизированные форматы вывода (jsonl, sqlite, parquet)
+OUTPUT_BATCH_SIZE = 500
+# Первая ячейка итоговой строки результатов (outputs.SummaryRow)
+SUMMARY_LABEL = 'Total'
+RESULT_COLUMNS = {
+    'whats-new': ('link', 'title', 'editor'),
+    'latest-versions': ('link', 'version', 'status'),
+    'pep': ('status', 'count'),
+}
+# Оглавления версий режима whats-new (--sections) и ответы
+# межверсионного указателя (--introduced)
+WHATS_NEW_SECTIONS_HEADER = (
+    'Ссылка на статью',
+    'Заголовок',
+    'Редактор, автор',
+    'Разделы',
+    'Новые модули',
+    'Устаревшие API',
+)
+WHATS_NEW_LOOKUP_HEADER = ('Имя', 'Добавлено в', 'Устарело в')
+# Столбцы результатов, вид которых зависит от параметров режима
+HEADER_COLUMNS = {
+    WHATS_NEW_SECTIONS_HEADER: (
+        'link',
+        'title',
+        'editor',
+        'sections',
+        'new_modules',
+        'deprecated',
+    ),
+    WHATS_NEW_LOOKUP_HEADER: ('name', 'introduced', 'deprecated'),
+}
+
+DEFAULT_WORKERS = 1
+
+# Движки извлечения данных из страниц
+PARSER_BS4 = 'bs4'
+PARSER_LXML = 'lxml'
+PARSERS = (PARSER_BS4, PARSER_LXML)
+
+# ----------- Download -----------
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # байт
+EPUB_FORMAT = 'epub'
+DOWNLOAD_FORMATS = (
+    'pdf-a4',
+    'pdf-letter',
+    'html',
+    'text',
+    'texinfo',
+    EPUB_FORMAT,
+)
+# Формат упаковки: окончание имени архива (EPUB не упаковывается)
+COMPRESSION_EXTENSIONS = {
+    'zip': '.zip',
+    'bz2': '.tar.bz2',
+}
+DEFAULT_DOWNLOAD_FORMATS = ('pdf-a4',)
+DEFAULT_COMPRESSION = ('zip',)
+
+# Снимок таблицы PEP для инкрементального режима
+STATE_DIR = BASE_DIR / 'state'
+PEP_SNAPSHOT_PATH = STATE_DIR / 'pep_snapshot.json'
+PEP_VERIFY_SAMPLE = 10
+
+# Контрольная точка режима pep: сохраняется после каждых CHECKPOINT_EVERY
+# строк таблицы или раз в CHECKPOINT_INTERVAL секунд
+PEP_CHECKPOINT_PATH = STATE_DIR / 'pep_checkpoint.json'
+CHECKPOINT_EVERY = 50
+CHECKPOINT_INTERVAL = 30  # секунд
+
+# История статусов PEP по запускам
+PEP_HISTORY_PATH = STATE_DIR / 'pep_history.sqlite'
+
 EXPECTED_STATUS = {
     'A': ('Active', 'Accepted'),
     'D': ('Deferred',),
@@ -29,6 +112,61 @@ EXPECTED_STATUS = {
 # ----------- Cached -----------
 EXPIRE_AFTER_CACHE = 43_200  # секунд
 CACHED_NAME = 'web_cache'
+HOUR = 3600  # секунд
+DAY = 24 * HOUR
+
+# Срок жизни кеша по шаблонам URL (glob без схемы, первый совпавший шаблон).
+# После истечения срока страница перепроверяется условным запросом
+# (If-None-Match / If-Modified-Since) и при ответе 304 не скачивается.
+URLS_EXPIRE_AFTER = {
+    'peps.python.org/numerical': HOUR,
+    'peps.python.org/pep-*': DAY,
+    'docs.python.org/3/whatsnew/*.*.html': 7 * DAY,
+    'docs.python.org/3/download.html': DAY,
+}
+# Кеш результатов разбора страниц
+PARSED_CACHE_PATH = BASE_DIR / 'parsed_cache.sqlite'
+PARSED_CACHE_MAX_ENTRIES = 5000
+# Увеличивается при изменении функций, которые вызывают функции разбора
+PARSED_CACHE_VERSION = 1
+
+# Срок жизни кеша страниц PEP в окончательных статусах
+# (по аббревиатуре статуса в основной таблице)
+PEP_STATUS_EXPIRE_AFTER = {
+    'F': 30 * DAY,
+    'R': 30 * DAY,
+    'S': 30 * DAY,
+    'W': 30 * DAY,
+}
+
+
+# ----------- Retry -----------
+REQUEST_TIMEOUT = 30  # секунд, на соединение и на чтение ответа
+RETRY_TOTAL = 3  # повторов после первой попытки
+RETRY_BACKOFF = 0.5  # секунд, базовая пауза перед повтором
+RETRY_MAX_BACKOFF = 30  # секунд
+RETRY_AFTER_MAX = 120  # секунд, наибольшая пауза по заголовку Retry-After
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Неудачных попыток подряд до отключения хоста и время до пробного запроса
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_AFTER = 60  # секунд
+
+
+# ----------- Rate limit -----------
+# Хост: (запросов в секунду, допустимая пачка запросов без ожидания)
+RATE_LIMITS = {
+    'docs.python.org': (10, 5),
+    'peps.python.org': (10, 5),
+}
+DEFAULT_RATE_LIMIT = (5, 1)
+
+
+# ----------- Metrics -----------
+METRICS_PREFIX = 'bs4_parser_'
+# Границы корзин гистограмм длительности, секунд
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Сколько последних длительностей фазы хранится для перцентилей сводки
+PROFILE_SAMPLES = 10_000
 
 
 # ----------- Logging -----------
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from requests import RequestException
+from tqdm import tqdm
+
+from constants import DOWNLOAD_CHUNK_SIZE
+from exceptions import RequestErrorException
+from utils import get_response
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import requests_cache
+
+logger = logging.getLogger(__name__)
+
+# Архивы не должны попадать в HTML-кеш requests_cache
+NO_STORE_HEADERS = {'Cache-Control': 'no-store'}
+VALIDATORS = ('ETag', 'Last-Modified')
+
+
+def _meta_path(path: Path) -> Path:
+    """Возвращает путь к файлу с валидаторами для `path`."""
+    return path.with_name(f'{path.name}.meta.json')
+
+
+def _read_meta(path: Path) -> dict:
+    """Читает сохранённые валидаторы файла или возвращает пустой словарь."""
+    meta_path = _meta_path(path)
+    if not meta_path.exists():
+        return {}
+    try:
+        return json.loads(meta_path.read_text(encoding='utf-8'))
+    except ValueError:
+        return {}
+
+
+def _write_meta(path: Path, meta: dict) -> None:
+    """Сохраняет валидаторы файла рядом с ним."""
+    _meta_path(path).write_text(json.dumps(meta), encoding='utf-8')
+
+
+def _remote_meta(response: requests_cache.Response) -> dict:
+    """Извлекает размер и валидаторы архива из заголовков ответа."""
+    meta = {name: response.headers.get(name) for name in VALIDATORS}
+    length = response.headers.get('Content-Length')
+    meta['size'] = int(length) if length and length.isdigit() else None
+    return meta
+
+
+def _same_resource(local: dict, remote: dict) -> bool:
+    """Проверяет, что валидаторы сервера совпадают с сохранёнными."""
+    validators = {name: remote[name] for name in VALIDATORS if remote[name]}
+    return bool(validators) and all(
+        local.get(name) == value for name, value in validators.items()
+    )
+
+
+def is_up_to_date(path: Path, remote: dict) -> bool:
+    """
+    Проверяет, совпадает ли локальный файл с архивом на сервере.
+
+    Файл считается актуальным, если совпадают его размер и все валидаторы
+    (ETag, Last-Modified), которые сообщил сервер.
+
+    Args:
+        path: Путь к локальному файлу.
+        remote: Размер и валидаторы архива на сервере.
+
+    Returns:
+        bool: True, если загрузку можно пропустить.
+    """
+    if not path.exists():
+        return False
+    if remote['size'] is not None and path.stat().st_size != remote['size']:
+        return False
+    return _same_resource(_read_meta(path), remote)
+
+
+def _stream_to_file(
+    response: requests_cache.Response,
+    path: Path,
+    mode: str,
+    chunk_size: int,
+    progress: tqdm,
+) -> None:
+    """Записывает тело ответа в файл блоками по `chunk_size` байт."""
+    try:
+        with path.open(mode) as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+                progress.update(len(chunk))
+    except RequestException as e:
+        error_msg = f'Ошибка при загрузке файла {response.url}: {e}'
+        raise RequestErrorException(error_msg) from e
+
+
+def _request_body(
+    session: requests_cache.CachedSession,
+    url: str,
+    part_path: Path,
+    headers: dict,
+) -> requests_cache.Response:
+    """
+    Запрашивает тело архива, начиная заново при отклонённой докачке.
+
+    Если сервер ответил на запрос с Range статусом 416 (временный файл
+    не соответствует архиву), временный файл удаляется и архив
+    запрашивается целиком.
+    """
+    try:
+        return get_response(session, url, stream=True, headers=headers)
+    except RequestErrorException as e:
+        if 'Range' not in headers or (
+            e.status_code != HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+        ):
+            raise
+    logger.warning(
+        'Сервер отклонил докачку %s, загружаем заново', part_path.name
+    )
+    part_path.unlink(missing_ok=True)
+    return get_response(session, url, stream=True, headers=NO_STORE_HEADERS)
+
+
+def write_checksum(path: Path, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Path:
+    """
+    Записывает контрольную сумму SHA-256 файла в формате `sha256sum`.
+
+    Args:
+        path: Путь к файлу.
+        chunk_size: Размер блока чтения в байтах.
+
+    Returns:
+        Path: Путь к файлу `<имя>.sha256`.
+    """
+    digest = hashlib.sha256()
+    with path.open('rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    checksum_path = path.with_name(f'{path.name}.sha256')
+    checksum_path.write_text(
+        f'{digest.hexdigest()}  {path.name}\n', encoding='utf-8'
+    )
+    return checksum_path
+
+
+def download_file(
+    session: requests_cache.CachedSession,
+    url: str,
+    path: Path,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    position: int = 0,
+) -> bool:
+    """
+    Потоково скачивает файл с докачкой и атомарной заменой.
+
+    Тело ответа записывается блоками во временный файл `<имя>.part`,
+    минуя кеш requests_cache, и после завершения атомарно переименовывается
+    в `path`. Если временный файл остался от прерванной загрузки того же
+    архива, загрузка продолжается с места остановки (HTTP Range); если
+    сервер отклоняет докачку, архив загружается заново. Если локальный
+    файл совпадает с архивом на сервере, загрузка пропускается.
+
+    Args:
+        session: Кешированная сессия для HTTP запросов.
+        url: URL архива.
+        path: Путь для сохранения файла.
+        chunk_size: Размер блока записи в байтах.
+        position: Номер строки индикатора прогресса в консоли.
+
+    Returns:
+        bool: True, если файл был скачан, False, если загрузка пропущена.
+
+    Raises:
+        RequestErrorException: При ошибке HTTP-запроса.
+    """
+    head = get_response(
+        session,
+        url,
+        method='HEAD',
+        headers=NO_STORE_HEADERS,
+        allow_redirects=True,
+    )
+    remote = _remote_meta(head)
+    if is_up_to_date(path, remote):
+        return False
+
+    part_path = path.with_name(f'{path.name}.part')
+    headers = dict(NO_STORE_HEADERS)
+    offset = 0
+    if part_path.exists() and _same_resource(_read_meta(part_path), remote):
+        offset = part_path.stat().st_size
+    if remote['size'] is not None and offset > remote['size']:
+        offset = 0
+    if offset:
+        headers['Range'] = f'bytes={offset}-'
+        headers['If-Range'] = remote['ETag'] or remote['Last-Modified']
+        logger.info('Продолжаем загрузку %s с %d байт', path.name, offset)
+    _write_meta(part_path, remote)
+
+    if remote['size'] is None or offset < remote['size']:
+        response = _request_body(session, url, part_path, headers)
+        with response:
+            # Сервер мог проигнорировать Range и прислать файл целиком
+            resumed = response.status_code == HTTPStatus.PARTIAL_CONTENT
+            with tqdm(
+                total=remote['size'],
+                initial=offset if resumed else 0,
+                desc=path.name,
+                position=position,
+                unit='B',
+                unit_scale=True,
+                colour='blue',
+            ) as progress:
+                _stream_to_file(
+                    response,
+                    part_path,
+                    'ab' if resumed else 'wb',
+                    chunk_size,
+                    progress,
+                )
+
+    part_path.replace(path)
+    _meta_path(part_path).replace(_meta_path(path))
+    return True
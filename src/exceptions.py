@@ -1,3 +1,6 @@
+from __future__ import annotations
+
+
 class ParserBaseException(Exception):
     """Базовое исключение для всех ошибок парсера."""
 
@@ -7,4 +10,30 @@ class ParserFindTagException(ParserBaseException):
 
 
 class RequestErrorException(ParserBaseException):
-    """Вызывается при ошибках HTTP-запросов."""
+    """
+    Вызывается при ошибках HTTP-запросов.
+
+    Args:
+        message: Описание ошибки.
+        status_code: HTTP-статус ответа (None — ответ не получен).
+    """
+
+    def __init__(self, message: str, status_code: int | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class CircuitOpenException(ParserBaseException):
+    """Вызывается при запросе к хосту, отключённому после серии ошибок."""
+
+
+class PepHistoryException(ParserBaseException):
+    """Вызывается при обращении к отсутствующему запуску истории PEP."""
+
+
+class OutputSchemaException(ParserBaseException):
+    """Вызывается при дописывании результатов с другим набором столбцов."""
+
+
+class ExchangeArchiveException(ParserBaseException):
+    """Вызывается при воспроизведении из отсутствующего архива HTTP-обменов."""
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import datetime as dt
+import sqlite3
+import threading
+from typing import TYPE_CHECKING
+
+from exceptions import PepHistoryException
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+
+class PepHistory:
+    """
+    История статусов PEP по запускам режима `pep` в SQLite.
+
+    Для каждого запуска сохраняются ссылка, предварительный статус из
+    таблицы и статус из карточки каждого PEP. Сравнение двух запусков
+    использует первичный ключ (запуск, PEP), подсчёт статусов по запускам —
+    покрывающий индекс (запуск, статус), поэтому запросы не требуют
+    повторного парсинга и чтения CSV-файлов.
+
+    Args:
+        path: Путь к файлу базы данных (или ':memory:').
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            str(path), check_same_thread=False, isolation_level=None
+        )
+        self._connection.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            PRAGMA foreign_keys = ON;
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY,
+                started_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pep_statuses (
+                run_id INTEGER NOT NULL REFERENCES runs (id),
+                link TEXT NOT NULL,
+                preview_status TEXT NOT NULL,
+                status TEXT NOT NULL,
+                PRIMARY KEY (run_id, link)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS pep_statuses_run_status
+                ON pep_statuses (run_id, status);
+            CREATE TABLE IF NOT EXISTS pep_failures (
+                run_id INTEGER NOT NULL REFERENCES runs (id),
+                link TEXT NOT NULL,
+                PRIMARY KEY (run_id, link)
+            ) WITHOUT ROWID;
+            """
+        )
+
+    def record_run(
+        self,
+        statuses: Iterable[tuple[str, str, str]],
+        failed: Iterable[str] = (),
+    ) -> int:
+        """
+        Сохраняет статусы PEP одного запуска в одной транзакции.
+
+        Args:
+            statuses: Кортежи (ссылка, предварительный статус, статус).
+            failed: Ссылки на PEP, страницы которых не удалось обработать.
+
+        Returns:
+            int: Номер сохранённого запуска.
+        """
+        started_at = dt.datetime.now().isoformat(sep=' ', timespec='seconds')
+        with self._lock:
+            self._connection.execute('BEGIN')
+            try:
+                run_id = self._connection.execute(
+                    'INSERT INTO runs (started_at) VALUES (?)', (started_at,)
+                ).lastrowid
+                self._connection.executemany(
+                    'INSERT OR REPLACE INTO pep_statuses VALUES (?, ?, ?, ?)',
+                    ((run_id, *entry) for entry in statuses),
+                )
+                self._connection.executemany(
+                    'INSERT OR REPLACE INTO pep_failures VALUES (?, ?)',
+                    ((run_id, link) for link in failed),
+                )
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+            self._connection.execute('COMMIT')
+        return run_id
+
+    def _check_run(self, run_id: int) -> None:
+        """Проверяет, что запуск есть в истории."""
+        found = self._connection.execute(
+            'SELECT 1 FROM runs WHERE id = ?', (run_id,)
+        ).fetchone()
+        if found is None:
+            error_msg = f'Запуск {run_id} не найден в истории PEP'
+            raise PepHistoryException(error_msg)
+
+    def changes(
+        self, from_run: int, to_run: int
+    ) -> list[tuple[str, str | None, str | None]]:
+        """
+        Находит PEP, статус которых отличается в двух запусках.
+
+        Args:
+            from_run: Номер исходного запуска.
+            to_run: Номер запуска для сравнения.
+
+        Returns:
+            list: Кортежи (ссылка, статус в from_run, статус в to_run),
+            отсортированные по ссылке. Для PEP, которого нет в одном
+            из запусков, статус в нём равен None. PEP, страница которого
+            не обработана в одном из запусков, не считается пропавшим
+            или новым.
+
+        Raises:
+            PepHistoryException: Если запуска нет в истории.
+        """
+        with self._lock:
+            self._check_run(from_run)
+            self._check_run(to_run)
+            return self._connection.execute(
+                """
+                SELECT new.link, old.status, new.status
+                FROM pep_statuses AS new
+                LEFT JOIN pep_statuses AS old
+                    ON old.run_id = :from_run AND old.link = new.link
+                WHERE new.run_id = :to_run AND old.status IS NOT new.status
+                    AND NOT EXISTS (
+                        SELECT 1 FROM pep_failures AS failed
+                        WHERE failed.run_id = :from_run
+                            AND failed.link = new.link
+                    )
+                UNION ALL
+                SELECT old.link, old.status, NULL
+                FROM pep_statuses AS old
+                WHERE old.run_id = :from_run AND NOT EXISTS (
+                    SELECT 1 FROM pep_statuses AS new
+                    WHERE new.run_id = :to_run AND new.link = old.link
+                ) AND NOT EXISTS (
+                    SELECT 1 FROM pep_failures AS failed
+                    WHERE failed.run_id = :to_run AND failed.link = old.link
+                )
+                ORDER BY 1
+                """,
+                {'from_run': from_run, 'to_run': to_run},
+            ).fetchall()
+
+    def status_counts(self) -> list[tuple[int, str, str, int]]:
+        """
+        Подсчитывает статусы PEP в каждом запуске.
+
+        Returns:
+            list: Кортежи (номер запуска, время запуска, статус,
+            количество), отсортированные по запуску и статусу.
+        """
+        with self._lock:
+            return self._connection.execute(
+                """
+                SELECT runs.id, runs.started_at, counts.status, counts.total
+                FROM (
+                    SELECT run_id, status, COUNT(*) AS total
+                    FROM pep_statuses
+                    GROUP BY run_id, status
+                ) AS counts
+                JOIN runs ON runs.id = counts.run_id
+                ORDER BY runs.id, counts.status
+                """
+            ).fetchall()
+
+    def close(self) -> None:
+        """Закрывает соединение с базой данных."""
+        with self._lock:
+            self._connection.close()
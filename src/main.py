@@ -1,34 +1,359 @@
+from __future__ import annotations
+
+import argparse
+import inspect
 import logging
 import re
+import signal
+import threading
 import time
-from pathlib import Path
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Callable
 from urllib.parse import urljoin
 
-import requests_cache
-from tqdm import tqdm
-
+from checkpoint import PepCheckpoint
 from configs import configure_argument_parser, configure_logging
 from constants import (
-    CACHED_NAME,
+    COMPRESSION_EXTENSIONS,
+    DEFAULT_COMPRESSION,
+    DEFAULT_DOWNLOAD_FORMATS,
+    DEFAULT_WORKERS,
     DOWNLOADS_DIR,
+    EPUB_FORMAT,
     EXPECTED_STATUS,
-    EXPIRE_AFTER_CACHE,
     MAIN_DOC_URL,
     MISMATCH_LOG_TEMPLATE,
+    PARSER_BS4,
+    PARSER_LXML,
+    PEP_CHECKPOINT_PATH,
+    PEP_HISTORY_PATH,
+    PEP_SNAPSHOT_PATH,
+    PEP_STATUS_EXPIRE_AFTER,
     PEP_URL,
+    PEP_VERIFY_SAMPLE,
+    SUMMARY_LABEL,
+    WHATS_NEW_SECTIONS_HEADER,
 )
 from exceptions import (
+    CircuitOpenException,
     ParserBaseException,
     ParserFindTagException,
     RequestErrorException,
 )
-from outputs import control_output
-from utils import find_tag, get_response, get_soup
+from history import PepHistory
+from outputs import SummaryRow, control_output
+from page_registry import PageRegistry
+from parse_pool import ParsePool
+from profiler import PHASE_OUTPUT, Profiler
+from snapshot import PepSnapshot
+from utils import (
+    create_session,
+    find_node,
+    find_tag,
+    get_parsed_page,
+    get_soup,
+    strainer,
+)
+from whatsnew_index import WhatsNewIndex, version_from_link
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    import requests_cache
+    from bs4 import BeautifulSoup, Tag
+    from lxml.html import HtmlElement
+
+    from api import ResultStore
+    from retry import RetryPolicy
 
 logger = logging.getLogger(__name__)
 
+WHATS_NEW_HEADER = ('Ссылка на статью', 'Заголовок', 'Редактор, автор')
+PEP_PROGRESS_BAR = {
+    'desc': 'Парсинг таблицы PEP',
+    'colour': 'blue',
+    'unit': 'строк',
+}
+
+# Области страниц, которые разбирает каждый режим: фильтр SoupStrainer
+# создаётся при первом обращении, чтобы не импортировать bs4 при запуске
+WHATS_NEW_REGION = partial(strainer, 'section', id='what-s-new-in-python')
+VERSIONS_REGION = partial(strainer, 'div', class_='sphinxsidebarwrapper')
+DOWNLOAD_REGION = partial(strainer, 'div', role='main')
+PEP_INDEX_REGION = partial(strainer, 'table', class_='docutils')
+
+# Разделы страницы версии для оглавления (--sections): начало id
+# раздела новых модулей и часть id разделов про устаревшие API
+NEW_MODULES_SECTION = 'new-modules'
+DEPRECATED_SECTION = 'deprecat'
+MODULE_ANCHOR = re.compile(r'#module-(?P<name>[\w.]+)$')
+
+
+def _get_whats_new_links(session: requests_cache.CachedSession) -> list[str]:
+    """Возвращает ссылки на страницы "What's New" всех версий Python."""
+    whats_new_url = urljoin(MAIN_DOC_URL, 'whatsnew/')
+
+    soup = get_soup(session, whats_new_url, 'lxml', WHATS_NEW_REGION())
+    main = find_tag(soup, 'section', attrs={'id': 'what-s-new-in-python'})
+    div_with_ul = find_tag(main, 'div', attrs={'class': 'toctree-wrapper'})
+    sections_by_python = div_with_ul.find_all('li', class_='toctree-l1')
+
+    return [
+        urljoin(whats_new_url, find_tag(section, 'a').get('href'))
+        for section in sections_by_python
+    ]
+
+
+def _parse_whats_new_page(soup: BeautifulSoup) -> tuple[str, str]:
+    """Извлекает заголовок и сведения об авторах со страницы версии."""
+    h1 = find_tag(soup, 'h1')
+    dl = find_tag(soup, 'dl')
+    dl_text = dl.text.replace('\n', ' ')
+    return h1.text, dl_text
+
+
+def _parse_whats_new_page_lxml(tree: HtmlElement) -> tuple[str, str]:
+    """Извлекает заголовок и сведения об авторах из дерева lxml."""
+    h1 = find_node(tree, 'h1')
+    dl = find_node(tree, 'dl')
+    dl_text = dl.text_content().replace('\n', ' ')
+    return h1.text_content(), dl_text
+
+
+def _heading_text(text: str) -> str:
+    """Убирает из заголовка раздела символ постоянной ссылки."""
+    return text.strip().rstrip('¶').strip()
 
-def whats_new(session: requests_cache.CachedSession) -> list[tuple]:
+
+def _module_names(hrefs: Iterable[str]) -> list[str]:
+    """Возвращает имена модулей из ссылок на их документацию."""
+    matches = (MODULE_ANCHOR.search(href) for href in hrefs)
+    return list(dict.fromkeys(match['name'] for match in matches if match))
+
+
+def _parse_whats_new_sections(soup: BeautifulSoup) -> tuple:
+    """
+    Извлекает со страницы версии заголовок, авторов и оглавление.
+
+    Оглавление — заголовки разделов второго уровня, модули из раздела
+    новых модулей и API, упомянутые в разделах об устаревании.
+    """
+    h1_text, dl_text = _parse_whats_new_page(soup)
+    headings = [_heading_text(h2.get_text()) for h2 in soup.find_all('h2')]
+    new_modules = _module_names(
+        a['href']
+        for section in soup.find_all(
+            'section', id=re.compile(f'^{NEW_MODULES_SECTION}')
+        )
+        for a in section.find_all('a', href=True)
+    )
+    deprecated = list(
+        dict.fromkeys(
+            code.get_text(strip=True)
+            for section in soup.find_all(
+                'section', id=re.compile(DEPRECATED_SECTION)
+            )
+            for code in section.select('code.xref')
+        )
+    )
+    return h1_text, dl_text, headings, new_modules, deprecated
+
+
+def _parse_whats_new_sections_lxml(tree: HtmlElement) -> tuple:
+    """Извлекает заголовок, авторов и оглавление из дерева lxml."""
+    h1_text, dl_text = _parse_whats_new_page_lxml(tree)
+    headings = [_heading_text(h2.text_content()) for h2 in tree.iter('h2')]
+    new_modules = _module_names(
+        tree.xpath(
+            f'//section[starts-with(@id, "{NEW_MODULES_SECTION}")]//a/@href'
+        )
+    )
+    deprecated = list(
+        dict.fromkeys(
+            code.text_content().strip()
+            for code in tree.xpath(
+                '//section[contains(@id, '
+                f'"{DEPRECATED_SECTION}")]//code[contains('
+                'concat(" ", normalize-space(@class), " "), " xref ")]'
+            )
+        )
+    )
+    return h1_text, dl_text, headings, new_modules, deprecated
+
+
+WHATS_NEW_EXTRACTORS = {
+    PARSER_BS4: _parse_whats_new_page,
+    PARSER_LXML: _parse_whats_new_page_lxml,
+}
+WHATS_NEW_SECTIONS_EXTRACTORS = {
+    PARSER_BS4: _parse_whats_new_sections,
+    PARSER_LXML: _parse_whats_new_sections_lxml,
+}
+
+
+def _iter_version_pages(
+    session: requests_cache.CachedSession,
+    extract: Callable[[Any], Any],
+    parser: str,
+    workers: int,
+) -> Iterator[tuple[str, Any]]:
+    """
+    Загружает страницы версий параллельно и выдаёт их в порядке ссылок.
+
+    Одновременно загружается не больше страниц, чем потоков, а следующая
+    страница запрашивается после выдачи очередной, поэтому потребитель
+    получает строки по мере разбора. Ошибки загрузки логируются после
+    обхода всех версий.
+    """
+    from tqdm import tqdm  # noqa: PLC0415
+
+    links = _get_whats_new_links(session)
+    remaining = iter(links)
+    threads = _fetch_threads(session, workers)
+    pending: deque[tuple[str, Future]] = deque()
+    errors = []
+
+    with ExitStack() as stack:
+        executor = stack.enter_context(ThreadPoolExecutor(max_workers=threads))
+        progress = stack.enter_context(
+            tqdm(
+                total=len(links),
+                colour='blue',
+                desc='Парсинг новостей об обновлениях python',
+            )
+        )
+
+        def submit() -> None:
+            for version_link in islice(remaining, threads - len(pending)):
+                pending.append(
+                    (
+                        version_link,
+                        executor.submit(
+                            get_parsed_page,
+                            session,
+                            version_link,
+                            extract,
+                            parser=parser,
+                        ),
+                    )
+                )
+
+        submit()
+        while pending:
+            version_link, future = pending.popleft()
+            try:
+                page = future.result()
+            except RequestErrorException as e:
+                errors.append(e)
+            else:
+                yield version_link, page
+            finally:
+                progress.update()
+            submit()
+
+    for error in errors:
+        logger.error(error)
+
+
+def _whats_new_rows(
+    pages: Iterable[tuple[str, Any]],
+    sections: bool,
+    introduced: Iterable[str] | None,
+) -> Iterator[tuple]:
+    """Превращает разобранные страницы версий в строки результата."""
+    if introduced:
+        yield from build_whats_new_index(pages).lookup(introduced)
+        return
+
+    yield WHATS_NEW_SECTIONS_HEADER if sections else WHATS_NEW_HEADER
+    for version_link, page in pages:
+        if not sections:
+            yield version_link, *page
+            continue
+        h1_text, dl_text, headings, new_modules, deprecated = page
+        yield (
+            version_link,
+            h1_text,
+            dl_text,
+            '; '.join(headings),
+            ', '.join(new_modules),
+            ', '.join(deprecated),
+        )
+
+
+def build_whats_new_index(
+    pages: Iterable[tuple[str, Any]],
+) -> WhatsNewIndex:
+    """
+    Строит межверсионный указатель по разобранным страницам версий.
+
+    Args:
+        pages: Пары (ссылка, результат `_parse_whats_new_sections`).
+
+    Returns:
+        WhatsNewIndex: Указатель по всем переданным версиям.
+    """
+    index = WhatsNewIndex()
+    for version_link, page in pages:
+        index.add(version_from_link(version_link), *page[2:])
+    return index
+
+
+def iter_whats_new(
+    session: requests_cache.CachedSession,
+    parser: str = PARSER_BS4,
+    workers: int = DEFAULT_WORKERS,
+    sections: bool = False,
+    introduced: Iterable[str] | None = None,
+) -> Iterator[tuple]:
+    """
+    Построчно извлекает информацию о новых возможностях версий Python.
+
+    Первой выдаётся строка заголовков, затем строка по каждой версии
+    сразу после разбора её страницы. Страницы версий загружаются
+    параллельно пулом из `workers` потоков, строки выдаются в порядке
+    версий. Ошибки загрузки страниц логируются после обхода всех версий.
+
+    С `sections` в строку версии добавляется её оглавление: заголовки
+    разделов, новые модули и устаревшие API. С `introduced` по
+    оглавлениям всех версий строится межверсионный указатель, и вместо
+    строк версий выдаются ответы на вопросы о перечисленных именах:
+    в какой версии модуль появился и в каких версиях API устарел.
+
+    Args:
+        session: Кешированная сессия для HTTP запросов.
+        parser: Движок разбора страниц версий (bs4 или lxml).
+        workers: Количество потоков для загрузки страниц версий.
+        sections: Извлекать оглавление страниц версий.
+        introduced: Имена модулей и API для поиска по указателю.
+
+    Yields:
+        tuple: Заголовки, затем кортежи (ссылка, заголовок, автор)
+        или строки ответов указателя.
+    """
+    extractors = (
+        WHATS_NEW_SECTIONS_EXTRACTORS
+        if sections or introduced
+        else WHATS_NEW_EXTRACTORS
+    )
+    yield from _whats_new_rows(
+        _iter_version_pages(session, extractors[parser], parser, workers),
+        sections,
+        introduced,
+    )
+
+
+def whats_new(
+    session: requests_cache.CachedSession,
+    parser: str = PARSER_BS4,
+    workers: int = DEFAULT_WORKERS,
+    sections: bool = False,
+    introduced: Iterable[str] | None = None,
+) -> list[tuple]:
     """
     Извлекает информацию о новых возможностях из различных версий Python.
 
@@ -38,44 +363,92 @@ def whats_new(session: requests_cache.CachedSession) -> list[tuple]:
 
     Args:
         session: Кешированная сессия для HTTP запросов.
+        parser: Движок разбора страниц версий (bs4 или lxml).
+        workers: Количество потоков для загрузки страниц версий.
+        sections: Извлекать оглавление страниц версий.
+        introduced: Имена модулей и API для поиска по указателю.
 
     Returns:
         list: Список кортежей (ссылка, заголовок, автор) с заголовками.
     """
-    whats_new_url = urljoin(MAIN_DOC_URL, 'whatsnew/')
+    return list(iter_whats_new(session, parser, workers, sections, introduced))
+
+
+async def _whats_new_async(
+    session: requests_cache.CachedSession,
+    workers: int,
+    extract: Callable[[Any], Any],
+    parser: str,
+) -> list[tuple[str, Any]]:
+    """Асинхронно загружает страницы "What's New" всех версий Python."""
+    import asyncio  # noqa: PLC0415
+
+    from tqdm import tqdm  # noqa: PLC0415
+
+    from async_utils import AsyncSession, get_parsed_page_async  # noqa: PLC0415
+
+    async with AsyncSession(session, workers) as client:
+        links = await client.run(MAIN_DOC_URL, _get_whats_new_links, session)
+        with tqdm(
+            total=len(links),
+            colour='blue',
+            desc='Парсинг новостей об обновлениях python',
+        ) as progress:
+
+            async def fetch(version_link: str) -> tuple | Exception:
+                try:
+                    page = await get_parsed_page_async(
+                        client, version_link, extract, parser=parser
+                    )
+                except RequestErrorException as e:
+                    return e
+                finally:
+                    progress.update()
+                return version_link, page
 
-    soup = get_soup(session, whats_new_url, 'lxml')
-    main = find_tag(soup, 'section', attrs={'id': 'what-s-new-in-python'})
-    div_with_ul = find_tag(main, 'div', attrs={'class': 'toctree-wrapper'})
-    sections_by_python = div_with_ul.find_all('li', class_='toctree-l1')
+            outcomes = await asyncio.gather(*map(fetch, links))
 
-    results = [('Ссылка на статью', 'Заголовок', 'Редактор, автор')]
-    errors = []
+    errors = [o for o in outcomes if isinstance(o, RequestErrorException)]
+    for error in errors:
+        logger.error(error)
 
-    for section in tqdm(
-        sections_by_python,
-        colour='blue',
-        desc='Парсинг новостей об обновлениях python',
-    ):
-        version_a_tag = find_tag(section, 'a')
-        version_link = urljoin(whats_new_url, version_a_tag.get('href'))
+    return [o for o in outcomes if not isinstance(o, RequestErrorException)]
 
-        try:
-            soup = get_soup(session, version_link, 'lxml')
-        except RequestErrorException as e:
-            errors.append(e)
-            continue
 
-        h1 = find_tag(soup, 'h1')
-        dl = find_tag(soup, 'dl')
-        dl_text = dl.text.replace('\n', ' ')
-        results.append((version_link, h1.text, dl_text))
-        time.sleep(0.1)
+def whats_new_async(
+    session: requests_cache.CachedSession,
+    workers: int = DEFAULT_WORKERS,
+    parser: str = PARSER_BS4,
+    sections: bool = False,
+    introduced: Iterable[str] | None = None,
+) -> list[tuple]:
+    """
+    Асинхронная версия режима `whats-new`.
 
-    for error in errors:
-        logger.error(error)
+    Страницы версий загружаются конкурентно, не более `workers` запросов
+    к одному хосту одновременно. Порядок строк совпадает с `whats_new`.
 
-    return results
+    Args:
+        session: Кешированная сессия для HTTP запросов.
+        workers: Максимум одновременных запросов к одному хосту.
+        parser: Движок разбора страниц версий (bs4 или lxml).
+        sections: Извлекать оглавление страниц версий.
+        introduced: Имена модулей и API для поиска по указателю.
+
+    Returns:
+        list: Список кортежей (ссылка, заголовок, автор) с заголовками.
+    """
+    import asyncio  # noqa: PLC0415
+
+    extractors = (
+        WHATS_NEW_SECTIONS_EXTRACTORS
+        if sections or introduced
+        else WHATS_NEW_EXTRACTORS
+    )
+    pages = asyncio.run(
+        _whats_new_async(session, workers, extractors[parser], parser)
+    )
+    return list(_whats_new_rows(pages, sections, introduced))
 
 
 def latest_versions(session: requests_cache.CachedSession) -> list[tuple]:
@@ -92,9 +465,11 @@ def latest_versions(session: requests_cache.CachedSession) -> list[tuple]:
         list: Список кортежей (ссылка, версия, статус) с заголовками.
 
     """
+    from tqdm import tqdm  # noqa: PLC0415
+
     pattern = r'[Pp]ython (?P<version>\d\.\d+) \((?P<status>.*)\)'
 
-    soup = get_soup(session, MAIN_DOC_URL, 'lxml')
+    soup = get_soup(session, MAIN_DOC_URL, 'lxml', VERSIONS_REGION())
     sidebar = find_tag(soup, 'div', attrs={'class': 'sphinxsidebarwrapper'})
     ul_tags = sidebar.find_all('ul')
 
@@ -122,123 +497,286 @@ def latest_versions(session: requests_cache.CachedSession) -> list[tuple]:
     return results
 
 
-def download(session: requests_cache.CachedSession) -> None:
+def _archive_pattern(
+    formats: Iterable[str], compression: Iterable[str]
+) -> re.Pattern:
+    """Составляет регулярное выражение для ссылок на выбранные архивы."""
+    extensions = '|'.join(
+        re.escape(COMPRESSION_EXTENSIONS[name]) for name in compression
+    )
+    packed = '|'.join(
+        re.escape(name) for name in formats if name != EPUB_FORMAT
+    )
+    alternatives = [rf'-(?:{packed})(?:{extensions})$'] if packed else []
+    if EPUB_FORMAT in formats:
+        alternatives.append(r'\.epub$')
+    return re.compile('|'.join(alternatives))
+
+
+def _download_archive(
+    session: requests_cache.CachedSession, archive_url: str, position: int
+) -> RequestErrorException | None:
+    """Скачивает один архив и записывает рядом его контрольную сумму."""
+    from downloader import download_file, write_checksum  # noqa: PLC0415
+
+    filename = archive_url.rsplit('/', maxsplit=1)[-1]
+    archive_path = DOWNLOADS_DIR / filename
+    try:
+        downloaded = download_file(
+            session, archive_url, archive_path, position=position
+        )
+    except RequestErrorException as e:
+        return e
+
+    checksum_path = write_checksum(archive_path)
+    if downloaded:
+        logger.info('Архив был загружен и сохранён: %s', archive_path)
+    else:
+        logger.info(
+            'Файл %s не изменился на сервере, загрузка пропущена.', filename
+        )
+    logger.info('Контрольная сумма SHA-256 сохранена: %s', checksum_path)
+    return None
+
+
+def download(
+    session: requests_cache.CachedSession,
+    workers: int = DEFAULT_WORKERS,
+    formats: Iterable[str] = DEFAULT_DOWNLOAD_FORMATS,
+    compression: Iterable[str] = DEFAULT_COMPRESSION,
+) -> None:
     """
-    Скачивает архив документации Python в формате PDF.
+    Скачивает архивы документации Python в выбранных форматах.
 
-    Функция находит ссылку на архив PDF на странице загрузок,
-    скачивает его и сохраняет в директорию downloads/.
+    Функция находит ссылки на архивы в таблице страницы загрузок,
+    потоково скачивает их параллельно и сохраняет в директорию downloads/
+    вместе с файлами контрольных сумм SHA-256. Прерванная загрузка
+    продолжается с места остановки, а не изменившийся на сервере архив
+    повторно не скачивается.
 
     Args:
         session: Кешированная сессия для HTTP запросов.
+        workers: Количество одновременных загрузок.
+        formats: Форматы документации (pdf-a4, html, epub и т.д.).
+        compression: Форматы упаковки архивов (zip, bz2).
 
     Raises:
         ParserFindTagException: Если не найден необходимый элемент на странице.
-        RequestException: При ошибках сетевых запросов.
         OSError: При проблемах с файловой системой.
     """
-    logger.info('Начинаем процесс загрузки архива PDF документации')
+    logger.info('Начинаем процесс загрузки архивов документации')
 
     download_url = urljoin(MAIN_DOC_URL, 'download.html')
-    pattern = r'.+pdf-a4\.zip$'
+    pattern = _archive_pattern(formats, compression)
 
-    soup = get_soup(session, download_url, 'lxml')
+    soup = get_soup(session, download_url, 'lxml', DOWNLOAD_REGION())
     main_tag = find_tag(soup, 'div', attrs={'role': 'main'})
     table_tag = find_tag(main_tag, 'table', attrs={'class': 'docutils'})
-    pdf_a4_tag = find_tag(table_tag, 'a', attrs={'href': re.compile(pattern)})
-    href = pdf_a4_tag.get('href')
+    archive_urls = [
+        urljoin(download_url, a_tag['href'])
+        for a_tag in table_tag.find_all('a', attrs={'href': pattern})
+    ]
 
-    if not href:
+    if not archive_urls:
         error_msg = (
-            'Найден тег ссылки на PDF архив, но он не содержит атрибут href. '
+            'Не найдены ссылки на архивы документации '
+            f'({", ".join(formats)}; {", ".join(compression)}). '
             f'Проверьте структуру страницы {download_url}'
         )
         logger.error(error_msg)
         raise ParserFindTagException(error_msg)
 
-    archive_url = urljoin(download_url, href)
-
-    filename = archive_url.split('/')[-1]
     DOWNLOADS_DIR.mkdir(exist_ok=True, parents=True)
-    archive_path = DOWNLOADS_DIR / filename
 
-    if archive_path.exists():
-        logger.info(
-            'Файл %s уже существует. Архив будет перезаписан.', filename
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        errors = executor.map(
+            lambda item: _download_archive(session, item[1], item[0]),
+            enumerate(archive_urls),
         )
+        for error in errors:
+            if error is not None:
+                logger.error(error)
+
 
-    response = get_response(session, archive_url)
-    with Path(archive_path).open('wb') as f:
-        f.write(response.content)
+def _get_pep_rows(session: requests_cache.CachedSession) -> list[Tag]:
+    """Возвращает строки основной таблицы PEP."""
+    peps_numerical_idx_url = urljoin(PEP_URL, 'numerical')
 
-    logger.info('Архив был загружен и сохранён: %s', archive_path)
+    soup = get_soup(
+        session, peps_numerical_idx_url, 'lxml', PEP_INDEX_REGION()
+    )
+    table_tag = find_tag(soup, 'table', attrs={'class': 'docutils'})
+    table_body = find_tag(table_tag, 'tbody')
+    return table_body.find_all('tr')
 
 
-def pep(session: requests_cache.CachedSession) -> list[tuple]:
+def _parse_pep_row(row: Tag) -> tuple[str, str] | None:
     """
-    Извлекает информацию о документах PEP для анализа их статусов.
+    Извлекает ссылку на PEP и предварительный статус из строки таблицы.
+
+    Returns:
+        tuple: (ссылка, предварительный статус) или None, если строка
+        не содержит ячеек.
+    """
+    cols = row.find_all('td')
+    if not cols:
+        return None
+
+    abbr = cols[0].find('abbr')
+    preview_status = abbr.text[1:]
+    a_tag = find_tag(cols[1], 'a', attrs={'href': True})
+    return urljoin(PEP_URL, a_tag['href']), preview_status
+
+
+def _parse_pep_status(soup: BeautifulSoup) -> str:
+    """Извлекает статус из карточки на странице PEP."""
+    section = find_tag(soup, 'section', attrs={'id': 'pep-content'})
+    dl = find_tag(section, 'dl', attrs={'class': 'field-list'})
+    return dl.select_one('dt:-soup-contains("Status") + dd').get_text(
+        strip=True
+    )
+
+
+def _parse_pep_status_lxml(tree: HtmlElement) -> str:
+    """Извлекает статус из карточки PEP в дереве lxml."""
+    section = find_node(tree, 'section', attrs={'id': 'pep-content'})
+    dl = find_node(section, 'dl', attrs={'class': 'field-list'})
+    dd = dl.xpath(
+        './/dt[contains(., "Status")]/following-sibling::*[1][self::dd]'
+    )
+    if not dd:
+        error_msg = 'Не найден статус в карточке PEP'
+        raise ParserFindTagException(error_msg)
+    return ''.join(text.strip() for text in dd[0].itertext())
+
+
+PEP_STATUS_EXTRACTORS = {
+    PARSER_BS4: _parse_pep_status,
+    PARSER_LXML: _parse_pep_status_lxml,
+}
+
+
+def _row_cells(row: Tag) -> list[str]:
+    """Возвращает тексты ячеек строки таблицы PEP."""
+    return [td.get_text(' ', strip=True) for td in row.find_all('td')]
 
-    Выполняет двухэтапный парсинг:
-    - Извлекает ссылки на PEP и предварительные статусы из основной таблицы
-    - Получает точные статусы со страниц отдельных PEP
-    - Сравнивает статусы и логирует несовпадения
-    - Подсчитывает количество PEP по статусам
+
+def _get_pep_status(
+    session: requests_cache.CachedSession,
+    row: Tag,
+    snapshot: PepSnapshot | None = None,
+    parser: str = PARSER_BS4,
+) -> tuple | None:
+    """
+    Получает ссылку, предварительный и точный статус PEP из строки таблицы.
+
+    Если передан снимок прошлого запуска и строка таблицы с тех пор
+    не изменилась, статус берётся из снимка без загрузки страницы PEP.
 
     Args:
         session: Кешированная сессия для HTTP запросов.
+        row: Строка основной таблицы PEP.
+        snapshot: Снимок таблицы PEP прошлого запуска.
+        parser: Движок разбора страницы PEP (bs4 или lxml).
 
     Returns:
-        list: Список кортежей (статус, количество) с заголовками и итогом.
+        tuple: (ссылка, предварительный статус, статус в карточке) или
+        None, если строка не содержит ячеек.
+
+    Raises:
+        ParserBaseException: При ошибке загрузки или разбора страницы PEP.
     """
-    peps_numerical_idx_url = urljoin(PEP_URL, 'numerical')
+    entry = _parse_pep_row(row)
+    if entry is None:
+        return None
+
+    pep_link, preview_status = entry
+    cells = _row_cells(row)
+    status = snapshot.reuse(pep_link, cells) if snapshot else None
+    if status is None:
+        status = get_parsed_page(
+            session,
+            pep_link,
+            PEP_STATUS_EXTRACTORS[parser],
+            parser=parser,
+            expire_after=PEP_STATUS_EXPIRE_AFTER.get(preview_status),
+        )
+    if snapshot is not None:
+        snapshot.update(pep_link, cells, status)
+    profiler = getattr(session, 'profiler', None)
+    if profiler is not None and status not in EXPECTED_STATUS[preview_status]:
+        profiler.count('pep_status_mismatches')
+    return pep_link, preview_status, status
+
+
+def _process_pep_row(
+    session: requests_cache.CachedSession,
+    row: Tag,
+    snapshot: PepSnapshot | None = None,
+    parser: str = PARSER_BS4,
+    checkpoint: PepCheckpoint | None = None,
+) -> tuple | ParserBaseException | None:
+    """
+    Обрабатывает строку таблицы PEP, возвращая ошибку вместо исключения.
+
+    Если строка уже обработана прерванным запуском, результат берётся
+    из контрольной точки, иначе новый результат записывается в неё.
+    CircuitOpenException не перехватывается: если хост отключён
+    предохранителем, запуск завершается, а не перебирает оставшиеся PEP.
+    """
+    cells = _row_cells(row)
+    if checkpoint is not None:
+        restored, outcome = checkpoint.restore(cells)
+        if restored:
+            if snapshot is not None and isinstance(outcome, tuple):
+                snapshot.update(outcome[0], cells, outcome[2])
+            return outcome
+
+    try:
+        outcome = _get_pep_status(session, row, snapshot, parser)
+    except CircuitOpenException:
+        raise
+    except ParserBaseException as e:
+        outcome = e
+    if checkpoint is not None:
+        checkpoint.add(cells, outcome)
+    return outcome
+
+
+def _summarize_peps(outcomes: Iterable) -> list[tuple]:
+    """
+    Подсчитывает статусы PEP по результатам обработки строк таблицы.
+
+    Результаты обрабатываются в порядке строк таблицы, после чего в лог
+    пишутся ошибки и несовпадения статусов.
+
+    Args:
+        outcomes: Результаты `_process_pep_row` в порядке строк таблицы.
 
+    Returns:
+        list: Список кортежей (статус, количество) с заголовками и итогом.
+    """
     results = []
     count_status = {}
     errors = []
     mismatch_statuses = []
 
-    soup = get_soup(session, peps_numerical_idx_url, 'lxml')
-    table_tag = find_tag(soup, 'table', attrs={'class': 'docutils'})
-    table_body = find_tag(table_tag, 'tbody')
-    rows = table_body.find_all('tr')
-
-    for row in tqdm(
-        rows, desc='Парсинг таблицы PEP', colour='blue', unit='строк'
-    ):
-        try:
-            cols = row.find_all('td')
-            if not cols:
-                continue
-
-            abbr = cols[0].find('abbr')
-            preview_status = abbr.text[1:]
-            a_tag = find_tag(cols[1], 'a', attrs={'href': True})
-            pep_link = urljoin(PEP_URL, a_tag['href'])
+    for outcome in outcomes:
+        if outcome is None:
+            continue
+        if isinstance(outcome, ParserBaseException):
+            errors.append(outcome)
+            continue
 
-            try:
-                soup = get_soup(session, pep_link, 'lxml')
-            except RequestErrorException as e:
-                errors.append(e)
-                continue
-
-            section = find_tag(soup, 'section', attrs={'id': 'pep-content'})
-            dl = find_tag(section, 'dl', attrs={'class': 'field-list'})
-            status = dl.select_one(
-                'dt:-soup-contains("Status") + dd'
-            ).get_text(strip=True)
-
-            if status not in EXPECTED_STATUS[preview_status]:
-                mismatch_statuses.append(
-                    MISMATCH_LOG_TEMPLATE.format(
-                        pep_link, status, EXPECTED_STATUS[preview_status]
-                    )
+        pep_link, preview_status, status = outcome
+        if status not in EXPECTED_STATUS[preview_status]:
+            mismatch_statuses.append(
+                MISMATCH_LOG_TEMPLATE.format(
+                    pep_link, status, EXPECTED_STATUS[preview_status]
                 )
+            )
 
-            count_status[status] = count_status.get(status, 0) + 1
-            time.sleep(0.1)
-        except ParserBaseException as e:
-            errors.append(e)
-            continue
+        count_status[status] = count_status.get(status, 0) + 1
 
     for error in errors:
         logger.error(error)
@@ -251,10 +789,349 @@ def pep(session: requests_cache.CachedSession) -> list[tuple]:
     return [
         ('Статус', 'Количество'),
         *results,
-        ('Total', sum(count for _, count in results)),
+        SummaryRow((SUMMARY_LABEL, sum(count for _, count in results))),
     ]
 
 
+def _load_pep_snapshot(
+    incremental: bool, verify_sample: int
+) -> PepSnapshot | None:
+    """Загружает снимок таблицы PEP для инкрементального запуска."""
+    if not incremental:
+        return None
+    return PepSnapshot.load(PEP_SNAPSHOT_PATH, verify_sample)
+
+
+def _save_pep_snapshot(snapshot: PepSnapshot | None) -> None:
+    """Сохраняет снимок таблицы PEP после инкрементального запуска."""
+    if snapshot is None:
+        return
+    snapshot.save()
+    logger.info(
+        'Инкрементальный запуск: статусов из снимка %d, загружено страниц %d',
+        snapshot.reused,
+        len(snapshot.current) - snapshot.reused,
+    )
+
+
+@contextmanager
+def _pep_checkpoint(resume: bool) -> Iterator[PepCheckpoint]:
+    """
+    Открывает контрольную точку запуска режима `pep`.
+
+    Если запуск прерван исключением, прогресс сохраняется, а после
+    успешного завершения контрольная точка удаляется.
+
+    Args:
+        resume: Продолжить прерванный запуск.
+
+    Yields:
+        PepCheckpoint: Контрольная точка запуска.
+    """
+    if resume:
+        checkpoint = PepCheckpoint.load(PEP_CHECKPOINT_PATH)
+        logger.info(
+            'Продолжение прерванного запуска: обработано строк %d',
+            len(checkpoint.entries),
+        )
+    else:
+        if PEP_CHECKPOINT_PATH.exists():
+            logger.info(
+                'Контрольная точка прерванного запуска %s будет '
+                'перезаписана (для продолжения используйте --resume)',
+                PEP_CHECKPOINT_PATH,
+            )
+        checkpoint = PepCheckpoint(PEP_CHECKPOINT_PATH)
+
+    try:
+        yield checkpoint
+    except BaseException:
+        checkpoint.save()
+        logger.warning(
+            'Запуск прерван, прогресс сохранён в %s. Для продолжения '
+            'запустите режим pep с флагом --resume',
+            PEP_CHECKPOINT_PATH,
+        )
+        raise
+    checkpoint.remove()
+
+
+def _open_pep_history() -> PepHistory:
+    """Открывает историю статусов PEP, создавая её директорию."""
+    PEP_HISTORY_PATH.parent.mkdir(exist_ok=True, parents=True)
+    return PepHistory(PEP_HISTORY_PATH)
+
+
+def _failed_pep_links(rows: list[Tag], outcomes: list) -> list[str]:
+    """Возвращает ссылки на PEP, строки которых обработаны с ошибкой."""
+    return [
+        urljoin(PEP_URL, a_tag['href'])
+        for row, outcome in zip(rows, outcomes)
+        if isinstance(outcome, ParserBaseException)
+        and (a_tag := row.find('a', href=True)) is not None
+    ]
+
+
+def _record_pep_history(rows: list[Tag], outcomes: list) -> None:
+    """
+    Сохраняет статусы PEP текущего запуска в историю.
+
+    PEP, страницы которых не удалось загрузить или разобрать,
+    сохраняются как неудачные, чтобы сравнение запусков не считало
+    их пропавшими.
+    """
+    statuses = [
+        outcome
+        for outcome in outcomes
+        if outcome is not None and not isinstance(outcome, ParserBaseException)
+    ]
+    history = _open_pep_history()
+    try:
+        run_id = history.record_run(
+            statuses, _failed_pep_links(rows, outcomes)
+        )
+    finally:
+        history.close()
+    logger.info('Статусы PEP сохранены в историю, запуск %d', run_id)
+
+
+def _fetch_threads(session: requests_cache.CachedSession, workers: int) -> int:
+    """Количество потоков загрузки: не меньше числа процессов разбора."""
+    parse_pool = getattr(session, 'parse_pool', None)
+    if parse_pool is None:
+        return workers
+    return max(workers, parse_pool.processes)
+
+
+def _map_in_window(
+    executor: ThreadPoolExecutor,
+    function: Callable[[Any], Any],
+    items: Iterable,
+    window: int,
+) -> Iterator:
+    """
+    Выполняет функцию в пуле потоков и выдаёт результаты по порядку.
+
+    В пуле не больше `window` задач: следующая задача ставится после
+    выдачи очередного результата. Поэтому при ошибке или прерывании
+    (Ctrl+C) загружаются только уже начатые элементы, а не все
+    оставшиеся.
+
+    Args:
+        executor: Пул потоков.
+        function: Функция, применяемая к каждому элементу.
+        items: Элементы.
+        window: Наибольшее количество задач в пуле.
+
+    Yields:
+        Any: Результаты функции в порядке элементов.
+    """
+    remaining = iter(items)
+    pending = deque(
+        executor.submit(function, item) for item in islice(remaining, window)
+    )
+    while pending:
+        result = pending.popleft().result()
+        pending.extend(
+            executor.submit(function, item) for item in islice(remaining, 1)
+        )
+        yield result
+
+
+def pep(  # noqa: PLR0913
+    session: requests_cache.CachedSession,
+    workers: int = DEFAULT_WORKERS,
+    *,
+    incremental: bool = False,
+    verify_sample: int = PEP_VERIFY_SAMPLE,
+    parser: str = PARSER_BS4,
+    resume: bool = False,
+) -> list[tuple]:
+    """
+    Извлекает информацию о документах PEP для анализа их статусов.
+
+    Выполняет двухэтапный парсинг:
+    - Извлекает ссылки на PEP и предварительные статусы из основной таблицы
+    - Получает точные статусы со страниц отдельных PEP
+    - Сравнивает статусы и логирует несовпадения
+    - Подсчитывает количество PEP по статусам
+
+    Страницы PEP загружаются параллельно пулом из `workers` потоков.
+    Если к сессии подключён пул процессов разбора, потоков не меньше,
+    чем процессов, чтобы каждый процесс был занят. Результаты
+    обрабатываются в порядке строк таблицы, поэтому итог, ошибки
+    и предупреждения не зависят от числа потоков.
+
+    В инкрементальном режиме страницы PEP загружаются только для новых
+    и изменившихся строк таблицы и для случайной выборки из
+    `verify_sample` строк; статусы остальных берутся из снимка прошлого
+    запуска.
+
+    Результаты строк периодически сохраняются в контрольную точку.
+    При прерывании дожидаются только уже начатые строки, после чего
+    контрольная точка сохраняется. С `resume` прерванный запуск
+    продолжается: строки, обработанные до прерывания, не загружаются
+    повторно, а итог совпадает с итогом непрерывного запуска.
+
+    Args:
+        session: Кешированная сессия для HTTP запросов.
+        workers: Количество потоков для загрузки страниц PEP.
+        incremental: Проверять только изменившиеся строки таблицы.
+        verify_sample: Количество неизменившихся строк для перепроверки.
+        parser: Движок разбора страниц PEP (bs4 или lxml).
+        resume: Продолжить прерванный запуск с контрольной точки.
+
+    Returns:
+        list: Список кортежей (статус, количество) с заголовками и итогом.
+    """
+    from tqdm import tqdm  # noqa: PLC0415
+
+    rows = _get_pep_rows(session)
+    snapshot = _load_pep_snapshot(incremental, verify_sample)
+
+    threads = _fetch_threads(session, workers)
+
+    with ExitStack() as stack:
+        checkpoint = stack.enter_context(_pep_checkpoint(resume))
+        executor = stack.enter_context(ThreadPoolExecutor(max_workers=threads))
+        outcomes = list(
+            tqdm(
+                _map_in_window(
+                    executor,
+                    lambda row: _process_pep_row(
+                        session, row, snapshot, parser, checkpoint
+                    ),
+                    rows,
+                    threads,
+                ),
+                total=len(rows),
+                **PEP_PROGRESS_BAR,
+            )
+        )
+        _save_pep_snapshot(snapshot)
+        _record_pep_history(rows, outcomes)
+    return _summarize_peps(outcomes)
+
+
+async def _pep_async(
+    session: requests_cache.CachedSession,
+    workers: int,
+    snapshot: PepSnapshot | None,
+    parser: str,
+    checkpoint: PepCheckpoint,
+) -> tuple[list[Tag], list[tuple | ParserBaseException | None]]:
+    """
+    Асинхронно загружает страницы PEP в порядке строк таблицы.
+
+    Returns:
+        tuple: Строки таблицы PEP и результаты их обработки.
+    """
+    import asyncio  # noqa: PLC0415
+
+    from tqdm import tqdm  # noqa: PLC0415
+
+    from async_utils import AsyncSession  # noqa: PLC0415
+
+    async with AsyncSession(session, workers) as client:
+        rows = await client.run(PEP_URL, _get_pep_rows, session)
+        with tqdm(total=len(rows), **PEP_PROGRESS_BAR) as progress:
+
+            async def fetch(row: Tag) -> tuple | ParserBaseException | None:
+                try:
+                    return await client.run(
+                        PEP_URL,
+                        _process_pep_row,
+                        session,
+                        row,
+                        snapshot,
+                        parser,
+                        checkpoint,
+                    )
+                finally:
+                    progress.update()
+
+            return rows, await asyncio.gather(*map(fetch, rows))
+
+
+def pep_async(  # noqa: PLR0913
+    session: requests_cache.CachedSession,
+    workers: int = DEFAULT_WORKERS,
+    *,
+    incremental: bool = False,
+    verify_sample: int = PEP_VERIFY_SAMPLE,
+    parser: str = PARSER_BS4,
+    resume: bool = False,
+) -> list[tuple]:
+    """
+    Асинхронная версия режима `pep`.
+
+    Страницы PEP загружаются конкурентно, не более `workers` запросов
+    к одному хосту одновременно. Итог совпадает с `pep`.
+
+    Args:
+        session: Кешированная сессия для HTTP запросов.
+        workers: Максимум одновременных запросов к одному хосту.
+        incremental: Проверять только изменившиеся строки таблицы.
+        verify_sample: Количество неизменившихся строк для перепроверки.
+        parser: Движок разбора страниц PEP (bs4 или lxml).
+        resume: Продолжить прерванный запуск с контрольной точки.
+
+    Returns:
+        list: Список кортежей (статус, количество) с заголовками и итогом.
+    """
+    import asyncio  # noqa: PLC0415
+
+    snapshot = _load_pep_snapshot(incremental, verify_sample)
+    with _pep_checkpoint(resume) as checkpoint:
+        rows, outcomes = asyncio.run(
+            _pep_async(session, workers, snapshot, parser, checkpoint)
+        )
+        _save_pep_snapshot(snapshot)
+        _record_pep_history(rows, outcomes)
+    return _summarize_peps(outcomes)
+
+
+def pep_history(
+    session: requests_cache.CachedSession,
+    diff: tuple[int, int] | None = None,
+) -> list[tuple]:
+    """
+    Отвечает на вопросы по истории статусов PEP без повторного парсинга.
+
+    Без `diff` возвращает количество PEP по статусам в каждом сохранённом
+    запуске режима `pep`. С `diff` — PEP, статус которых изменился между
+    двумя запусками.
+
+    Args:
+        session: Кешированная сессия для HTTP запросов (не используется).
+        diff: Номера двух запусков для сравнения.
+
+    Returns:
+        list: Список кортежей с заголовками.
+
+    Raises:
+        PepHistoryException: Если запуска нет в истории.
+    """
+    history = _open_pep_history()
+    try:
+        if diff is None:
+            return [
+                ('Запуск', 'Время запуска', 'Статус', 'Количество'),
+                *history.status_counts(),
+            ]
+        from_run, to_run = diff
+        return [
+            (
+                'Ссылка на PEP',
+                f'Статус в запуске {from_run}',
+                f'Статус в запуске {to_run}',
+            ),
+            *history.changes(from_run, to_run),
+        ]
+    finally:
+        history.close()
+
+
 MODE_TO_FUNCTION = {
     'whats-new': whats_new,
     'latest-versions': latest_versions,
@@ -262,35 +1139,493 @@ MODE_TO_FUNCTION = {
     'pep': pep,
 }
 
+ASYNC_MODE_TO_FUNCTION = {
+    'whats-new': whats_new_async,
+    'pep': pep_async,
+}
+
+# Режимы, которые читают сохранённые данные без загрузки страниц
+OFFLINE_MODE_TO_FUNCTION = {
+    'pep-history': pep_history,
+}
+
+# Режимы, строки которых выводятся по мере разбора страниц
+STREAMING_MODE_TO_FUNCTION = {
+    'whats-new': iter_whats_new,
+}
+
+
+def create_crawl_session(
+    args: argparse.Namespace,
+    profiler: Profiler | None = None,
+    retry_policy: RetryPolicy | None = None,
+    parse_pool: ParsePool | None = None,
+) -> requests_cache.CachedSession:
+    """
+    Создаёт сессию с учётом записи и воспроизведения HTTP-обменов.
+
+    При записи и воспроизведении сессия работает с пустым кешем в памяти
+    и без кеша результатов разбора: при записи каждый запрос запуска
+    доходит до сервера и попадает в архив, а при воспроизведении ответы
+    берутся только из архива, поэтому запуск детерминирован. Запросы,
+    которых нет в архиве, при воспроизведении не повторяются.
+
+    Args:
+        args: Аргументы командной строки.
+        profiler: Сборщик длительностей фаз запуска (None — без замеров).
+        retry_policy: Правила повтора запросов (по умолчанию RetryPolicy()).
+        parse_pool: Пул процессов разбора страниц (None — разбор
+            в потоках загрузки).
+
+    Returns:
+        requests_cache.CachedSession: Настроенная сессия.
+    """
+    pool_size = args.workers
+    if parse_pool is not None:
+        pool_size = max(pool_size, parse_pool.processes)
+    if args.record is None and args.replay is None:
+        session = create_session(
+            pool_size, profiler=profiler, retry_policy=retry_policy
+        )
+        session.parse_pool = parse_pool
+        return session
+
+    session = create_session(
+        pool_size,
+        result_cache_path=None,
+        profiler=profiler,
+        retry_policy=retry_policy,
+        backend='memory',
+    )
+    session.parse_pool = parse_pool
+    from archive import (  # noqa: PLC0415
+        ExchangeArchive,
+        RecordingAdapter,
+        ReplayAdapter,
+    )
+
+    if args.replay is not None:
+        session.retry_policy = None
+        session.circuit_breaker = None
+        archive = ExchangeArchive.load(args.replay)
+        logger.info(
+            'Воспроизведение %d HTTP-обменов из %s', len(archive), args.replay
+        )
+        adapter = ReplayAdapter(archive)
+    else:
+        logger.info('Запись HTTP-обменов в %s', args.record)
+        adapter = RecordingAdapter(
+            ExchangeArchive(args.record), session.get_adapter('https://')
+        )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_mode_kwargs(function: Callable, args: argparse.Namespace) -> dict:
+    """
+    Отбирает из аргументов командной строки параметры режима работы.
+
+    Args:
+        function: Функция режима работы парсера.
+        args: Аргументы командной строки.
+
+    Returns:
+        dict: Аргументы, которые принимает функция режима.
+    """
+    parameters = inspect.signature(function).parameters
+    return {
+        name: value for name, value in vars(args).items() if name in parameters
+    }
+
+
+def select_mode_function(args: argparse.Namespace) -> Callable:
+    """
+    Выбирает функцию режима работы с учётом асинхронной загрузки.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Returns:
+        Callable: Функция режима работы парсера.
+    """
+    mode_function = (
+        MODE_TO_FUNCTION.get(args.mode) or OFFLINE_MODE_TO_FUNCTION[args.mode]
+    )
+    if args.use_async:
+        return ASYNC_MODE_TO_FUNCTION.get(args.mode, mode_function)
+    return STREAMING_MODE_TO_FUNCTION.get(args.mode, mode_function)
+
+
+def output_results(
+    results: Iterable[tuple],
+    args: argparse.Namespace,
+    profiler: Profiler | None = None,
+    store: ResultStore | None = None,
+) -> None:
+    """
+    Выводит результаты режима, замеряя фазу вывода.
+
+    Args:
+        results: Строки результатов режима с заголовками.
+        args: Аргументы командной строки с режимом в `mode`.
+        profiler: Сборщик длительностей фаз запуска (None — без замеров).
+        store: Снимок результатов для HTTP API (None — без API).
+    """
+    if store is not None:
+        results = list(results)
+        store.update(args.mode, results)
+    if profiler is None:
+        control_output(results, args)
+        return
+    profiler.consume(
+        f'{PHASE_OUTPUT}:{args.output or "stdout"}',
+        control_output,
+        results,
+        args,
+    )
+
+
+def _run_mode(
+    session: requests_cache.CachedSession, args: argparse.Namespace
+) -> Iterable[tuple] | None:
+    """Выполняет режим из `args.mode` и возвращает его результаты."""
+    mode_function = select_mode_function(args)
+    return mode_function(session, **get_mode_kwargs(mode_function, args))
+
+
+def run_modes(
+    session: requests_cache.CachedSession,
+    args: argparse.Namespace,
+    profiler: Profiler | None = None,
+    store: ResultStore | None = None,
+) -> None:
+    """
+    Выполняет режимы, перечисленные в командной строке.
+
+    Единственный режим выполняется как обычно. Несколько режимов
+    выполняются одновременно в общей сессии с реестром страниц запуска,
+    поэтому каждая страница загружается и разбирается не больше одного
+    раза. Результаты выводятся в порядке режимов в командной строке,
+    как только готов очередной режим; ошибка одного режима не
+    прерывает остальные.
+
+    Args:
+        session: Кешированная сессия для HTTP запросов.
+        args: Аргументы командной строки со списком режимов в `mode`.
+        profiler: Сборщик длительностей фаз запуска (None — без замеров).
+        store: Снимок результатов для HTTP API (None — без API).
+
+    Raises:
+        ParserBaseException: Если хотя бы один из нескольких режимов
+            завершился ошибкой.
+    """
+    modes_args = [
+        argparse.Namespace(**{**vars(args), 'mode': mode})
+        for mode in dict.fromkeys(args.mode)
+    ]
+    if len(modes_args) == 1:
+        results = _run_mode(session, modes_args[0])
+        if results is not None:
+            output_results(results, modes_args[0], profiler, store)
+        return
+
+    session.page_registry = PageRegistry(profiler)
+    with ThreadPoolExecutor(max_workers=len(modes_args)) as executor:
+        futures = [
+            executor.submit(_collect_results, session, mode_args)
+            for mode_args in modes_args
+        ]
+        failed = [
+            mode_args.mode
+            for mode_args, future in zip(modes_args, futures)
+            if not _output_mode_results(future, mode_args, profiler, store)
+        ]
+    logger.info(
+        'Реестр запуска: %d страниц, %d повторных обращений без загрузки',
+        len(session.page_registry),
+        session.page_registry.hits,
+    )
+    if failed:
+        error_msg = f'Режимы завершились с ошибкой: {", ".join(failed)}'
+        raise ParserBaseException(error_msg)
+
+
+def watch(
+    session: requests_cache.CachedSession,
+    args: argparse.Namespace,
+    profiler: Profiler | None = None,
+    store: ResultStore | None = None,
+    stop: threading.Event | None = None,
+) -> int:
+    """
+    Повторяет запуск режимов раз в `args.watch` секунд.
+
+    Процесс остаётся запущенным, поэтому каждый цикл использует уже
+    открытые кеш HTTP и кеш результатов разбора: устаревшие страницы
+    перепроверяются условными запросами, а неизменившиеся не
+    разбираются повторно. Результаты выводятся в каждом цикле, метрики
+    из `--metrics-file` перезаписываются после каждого цикла. Ошибка
+    цикла логируется и не останавливает следующие. Работа завершается
+    после `args.cycles` циклов, по сигналу SIGTERM или Ctrl+C.
+
+    Args:
+        session: Кешированная сессия для HTTP запросов.
+        args: Аргументы командной строки.
+        profiler: Сборщик длительностей фаз запуска (None — без замеров).
+        store: Снимок результатов для HTTP API (None — без API).
+        stop: Событие остановки (по умолчанию устанавливается SIGTERM).
+
+    Returns:
+        int: Количество выполненных циклов.
+    """
+    from metrics import write_textfile  # noqa: PLC0415
+
+    cycle = 0
+    stop = stop or threading.Event()
+    with _stop_on_sigterm(stop):
+        try:
+            while not stop.is_set():
+                cycle += 1
+                started = time.monotonic()
+                logger.info('Цикл %d: режимы %s', cycle, ', '.join(args.mode))
+                try:
+                    run_modes(session, args, profiler, store)
+                except Exception:
+                    logger.exception('Ошибка в цикле %d', cycle)
+                finally:
+                    session.page_registry = None
+                if profiler is not None and args.metrics_file is not None:
+                    write_textfile(profiler, args.metrics_file)
+                if args.cycles is not None and cycle >= args.cycles:
+                    break
+                stop.wait(max(args.watch - (time.monotonic() - started), 0))
+        except KeyboardInterrupt:
+            logger.info('Наблюдение прервано пользователем')
+    logger.info('Наблюдение остановлено после %d циклов', cycle)
+    return cycle
+
+
+@contextmanager
+def _stop_on_sigterm(stop: threading.Event) -> Iterator[None]:
+    """Устанавливает событие остановки по сигналу SIGTERM."""
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    previous_handler = signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+
+
+def serve_results(
+    session: requests_cache.CachedSession,
+    args: argparse.Namespace,
+    profiler: Profiler | None = None,
+    store: ResultStore | None = None,
+) -> None:
+    """
+    Выполняет режимы один раз или в режиме наблюдения.
+
+    Если результаты отдаются через HTTP API, процесс после
+    единственного запуска не завершается, пока не получит SIGTERM
+    или Ctrl+C.
+
+    Args:
+        session: Кешированная сессия для HTTP запросов.
+        args: Аргументы командной строки.
+        profiler: Сборщик длительностей фаз запуска (None — без замеров).
+        store: Снимок результатов для HTTP API (None — без API).
+    """
+    if args.watch is not None:
+        watch(session, args, profiler, store)
+        return
+    run_modes(session, args, profiler, store)
+    if store is None:
+        return
+    logger.info('Результаты отдаются до остановки процесса')
+    stop = threading.Event()
+    with _stop_on_sigterm(stop):
+        try:
+            stop.wait()
+        except KeyboardInterrupt:
+            logger.info('Отдача результатов прервана пользователем')
+
+
+def _collect_results(
+    session: requests_cache.CachedSession, args: argparse.Namespace
+) -> list[tuple] | None:
+    """Выполняет режим и собирает в список строки, выдаваемые по одной."""
+    results = _run_mode(session, args)
+    return None if results is None else list(results)
+
+
+def _output_mode_results(
+    future: Future,
+    args: argparse.Namespace,
+    profiler: Profiler | None,
+    store: ResultStore | None,
+) -> bool:
+    """Дожидается результатов режима и выводит их; ошибку логирует."""
+    try:
+        results = future.result()
+        if results is not None:
+            output_results(results, args, profiler, store)
+    except Exception:
+        logger.exception('Ошибка в режиме %s', args.mode)
+        return False
+    return True
+
+
+def create_profiler(args: argparse.Namespace) -> Profiler | None:
+    """
+    Создаёт сборщик длительностей, если запрошены замеры или метрики.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Returns:
+        Profiler | None: Сборщик или None, если замеры не нужны.
+    """
+    options = (args.profile_json, args.metrics_file, args.metrics_port)
+    if args.profile or any(option is not None for option in options):
+        return Profiler()
+    return None
+
+
+def create_parse_pool(args: argparse.Namespace) -> ParsePool | None:
+    """
+    Создаёт пул процессов разбора, если он запрошен.
+
+    Args:
+        args: Аргументы командной строки.
+
+    Returns:
+        ParsePool | None: Пул процессов или None, если разбор выполняется
+        в потоках загрузки.
+    """
+    if args.parse_processes is None:
+        return None
+    parse_pool = ParsePool(args.parse_processes)
+    logger.info('Разбор страниц в пуле из %d процессов', parse_pool.processes)
+    return parse_pool
+
+
+def start_servers(
+    args: argparse.Namespace, profiler: Profiler | None, stack: ExitStack
+) -> ResultStore | None:
+    """
+    Запускает запрошенные серверы метрик и API результатов.
+
+    Остановка серверов регистрируется в `stack`.
+
+    Args:
+        args: Аргументы командной строки.
+        profiler: Сборщик длительностей фаз запуска.
+        stack: Стек завершения запуска.
+
+    Returns:
+        ResultStore | None: Снимок результатов для API или None, если
+        API не запрошен.
+    """
+    if args.metrics_port is not None:
+        from metrics import MetricsServer  # noqa: PLC0415
+
+        stack.callback(MetricsServer(profiler, args.metrics_port).start().stop)
+    if args.serve is None:
+        return None
+    from api import ApiServer, ResultStore  # noqa: PLC0415
+
+    store = ResultStore()
+    stack.callback(ApiServer(store, args.serve).start().stop)
+    return store
+
+
+def open_crawl_session(
+    args: argparse.Namespace, profiler: Profiler | None, stack: ExitStack
+) -> requests_cache.CachedSession:
+    """
+    Создаёт сессию запуска вместе с пулом процессов разбора.
+
+    Закрытие пула и кеша результатов разбора регистрируется в `stack`.
+
+    Args:
+        args: Аргументы командной строки.
+        profiler: Сборщик длительностей фаз запуска.
+        stack: Стек завершения запуска.
+
+    Returns:
+        requests_cache.CachedSession: Настроенная сессия.
+    """
+    from retry import RetryPolicy  # noqa: PLC0415
+
+    parse_pool = create_parse_pool(args)
+    if parse_pool is not None:
+        stack.callback(parse_pool.close)
+    session = create_crawl_session(
+        args, profiler, RetryPolicy(args.retries, args.timeout), parse_pool
+    )
+    result_cache = getattr(session, 'result_cache', None)
+    if result_cache is not None:
+        stack.callback(result_cache.close)
+    return session
+
+
+def report_profile(profiler: Profiler, args: argparse.Namespace) -> None:
+    """
+    Выводит сводку длительностей фаз и сохраняет замеры и метрики.
+
+    Args:
+        profiler: Сборщик длительностей фаз запуска.
+        args: Аргументы командной строки.
+    """
+    from metrics import write_textfile  # noqa: PLC0415
+
+    if args.profile or args.profile_json is not None:
+        print(profiler.report())
+    if args.profile_json is not None:
+        profiler.save(args.profile_json)
+        logger.info('Сводка замеров сохранена: %s', args.profile_json)
+    if args.metrics_file is not None:
+        write_textfile(profiler, args.metrics_file)
+        logger.info('Метрики сохранены: %s', args.metrics_file)
+
 
 def main():
     configure_logging()
     logger.info('Парсер запущен!')
+    profiler = None
 
     try:
-        arg_parser = configure_argument_parser(MODE_TO_FUNCTION.keys())
+        arg_parser = configure_argument_parser(
+            [*MODE_TO_FUNCTION, *OFFLINE_MODE_TO_FUNCTION]
+        )
         args = arg_parser.parse_args()
         logger.info('Аргументы командной строки: %s', args)
+        parser_mode = ', '.join(args.mode)
 
-        session = requests_cache.CachedSession(
-            cache_name=CACHED_NAME, expire_after=EXPIRE_AFTER_CACHE
-        )
-
-        if args.clear_cache:
-            logger.info('Очистка кеша..')
-            session.cache.clear()
-
-        parser_mode = args.mode
+        profiler = create_profiler(args)
+        with ExitStack() as stack:
+            store = start_servers(args, profiler, stack)
+            session = open_crawl_session(args, profiler, stack)
 
-        results = MODE_TO_FUNCTION[parser_mode](session)
+            if args.clear_cache:
+                logger.info('Очистка кеша..')
+                session.cache.clear()
+                result_cache = getattr(session, 'result_cache', None)
+                if result_cache is not None:
+                    result_cache.clear()
 
-        if results is not None:
-            control_output(results, args)
+            serve_results(session, args, profiler, store)
     except Exception:
         logger.exception('Ошибка в режиме %s', parser_mode)
         return
     else:
         logger.info('Парсер завершил работу штатно.')
+    finally:
+        if profiler is not None:
+            report_profile(profiler, args)
 
 
 if __name__ == '__main__':
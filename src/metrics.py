@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING
+
+from constants import METRICS_BUCKETS, METRICS_PREFIX
+from profiler import PHASE_CACHE, PHASE_NETWORK, PHASE_PARSE
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from profiler import Profiler
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Исключения, счётчики которых выводятся всегда, даже нулевые
+COUNTED_ERRORS = ('RequestErrorException', 'ParserFindTagException')
+
+
+def _labels(**labels: str) -> str:
+    """Форматирует метки метрики."""
+    if not labels:
+        return ''
+    pairs = ','.join(f'{name}="{value}"' for name, value in labels.items())
+    return f'{{{pairs}}}'
+
+
+def _counter(name: str, help_text: str, samples: dict[str, float]) -> list:
+    """Строки счётчика: {метки: значение}."""
+    lines = [
+        f'# HELP {METRICS_PREFIX}{name} {help_text}',
+        f'# TYPE {METRICS_PREFIX}{name} counter',
+    ]
+    lines.extend(
+        f'{METRICS_PREFIX}{name}{labels} {value}'
+        for labels, value in samples.items()
+    )
+    return lines
+
+
+def _histogram(
+    name: str,
+    help_text: str,
+    samples: dict[str, tuple[list[int], float, int]],
+) -> list:
+    """Строки гистограммы: {метки: (корзины, сумма, количество)}."""
+    metric = f'{METRICS_PREFIX}{name}'
+    lines = [f'# HELP {metric} {help_text}', f'# TYPE {metric} histogram']
+    for labels, (buckets, total, calls) in samples.items():
+        inner = labels[1:-1]
+        separator = ',' if inner else ''
+        for bound, count in zip((*METRICS_BUCKETS, '+Inf'), buckets):
+            lines.append(
+                f'{metric}_bucket{{{inner}{separator}le="{bound}"}} {count}'
+            )
+        lines.append(f'{metric}_sum{labels} {total}')
+        lines.append(f'{metric}_count{labels} {calls}')
+    return lines
+
+
+def render_metrics(profiler: Profiler) -> str:
+    """
+    Формирует метрики запуска в текстовом формате Prometheus.
+
+    Args:
+        profiler: Сборщик длительностей и счётчиков запуска.
+
+    Returns:
+        str: Текст для textfile collector или ответа `/metrics`.
+    """
+    counters = profiler.snapshot_counters()
+    network = profiler.histogram(PHASE_NETWORK)
+    cache = profiler.histogram(PHASE_CACHE)
+    lines = [
+        *_counter(
+            'pages_fetched_total',
+            'Загруженные страницы по источнику ответа.',
+            {
+                _labels(source='network'): network[2],
+                _labels(source='cache'): cache[2],
+            },
+        ),
+        *_counter(
+            'cache_hits_total',
+            'Ответы из кеша requests_cache.',
+            {'': counters.get('cache_hits', 0)},
+        ),
+        *_counter(
+            'cache_misses_total',
+            'Ответы, полученные из сети.',
+            {'': counters.get('cache_misses', 0)},
+        ),
+        *_counter(
+            'downloaded_bytes_total',
+            'Байты тел ответов, полученных из сети.',
+            {'': counters.get('bytes', 0)},
+        ),
+        *_counter(
+            'errors_total',
+            'Ошибки загрузки и разбора страниц по типу исключения.',
+            {
+                _labels(exception=name): counters.get(f'errors:{name}', 0)
+                for name in COUNTED_ERRORS
+            },
+        ),
+        *_counter(
+            'pep_status_mismatches_total',
+            'Несовпадения статуса в карточке PEP и в основной таблице.',
+            {'': counters.get('pep_status_mismatches', 0)},
+        ),
+        *_histogram(
+            'fetch_duration_seconds',
+            'Длительность HTTP-запросов.',
+            {
+                _labels(source='network'): network,
+                _labels(source='cache'): cache,
+            },
+        ),
+        *_histogram(
+            'parse_duration_seconds',
+            'Длительность построения дерева HTML.',
+            {'': profiler.histogram(PHASE_PARSE)},
+        ),
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def write_textfile(profiler: Profiler, path: Path) -> None:
+    """
+    Записывает метрики в файл для textfile collector node_exporter.
+
+    Файл заменяется атомарно, поэтому collector не прочитает его
+    наполовину записанным.
+
+    Args:
+        profiler: Сборщик длительностей и счётчиков запуска.
+        path: Путь к файлу `*.prom`.
+    """
+    path.parent.mkdir(exist_ok=True, parents=True)
+    tmp_path = path.with_name(f'{path.name}.tmp')
+    tmp_path.write_text(render_metrics(profiler), encoding='utf-8')
+    tmp_path.replace(path)
+
+
+class MetricsServer:
+    """
+    HTTP-сервер, отдающий метрики запуска по адресу `/metrics`.
+
+    Сервер работает в фоновом потоке, пока идёт запуск парсера.
+
+    Args:
+        profiler: Сборщик длительностей и счётчиков запуска.
+        port: Порт (0 — выбрать свободный).
+        host: Адрес, на котором принимаются соединения.
+    """
+
+    def __init__(
+        self, profiler: Profiler, port: int, host: str = '127.0.0.1'
+    ) -> None:
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = render_metrics(profiler).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                logger.debug(*args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+
+    @property
+    def port(self) -> int:
+        """Порт, на котором работает сервер."""
+        return self._server.server_address[1]
+
+    def start(self) -> MetricsServer:
+        """Запускает сервер в фоновом потоке."""
+        self._thread.start()
+        logger.info(
+            'Метрики доступны по адресу http://%s:%d/metrics',
+            self._server.server_address[0],
+            self.port,
+        )
+        return self
+
+    def stop(self) -> None:
+        """Останавливает сервер."""
+        self._server.shutdown()
+        self._server.server_close()
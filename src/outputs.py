@@ -1,49 +1,385 @@
 import argparse
 import csv
 import datetime as dt
+import json
 import logging
+import sqlite3
+from collections.abc import Iterable, Iterator
+from contextlib import closing
+from itertools import chain, islice
 from pathlib import Path
 
-from prettytable import PrettyTable
-
 from constants import (
     DATETIME_FORMAT,
+    HEADER_COLUMNS,
+    OUTPUT_BATCH_SIZE,
     OUTPUT_FILE,
+    OUTPUT_JSONL,
+    OUTPUT_PARQUET,
     OUTPUT_PRETTY,
+    OUTPUT_SQLITE,
+    RESULT_COLUMNS,
     RESULTS_DIR,
 )
+from exceptions import OutputSchemaException
 
 logger = logging.getLogger(__name__)
 
+SQLITE_TYPES = {int: 'INTEGER', float: 'REAL', str: 'TEXT'}
+
+
+class SummaryRow(tuple):
+    """
+    Итоговая строка результатов.
+
+    Типизированные форматы не сохраняют её, чтобы агрегаты по столбцам
+    не учитывали итог дважды. Строка отличается типом, а не содержимым,
+    поэтому строка данных с той же первой ячейкой сохраняется.
+    """
+
+    __slots__ = ()
+
+
+def _result_path(
+    parser_mode: str, extension: str, now: dt.datetime, append: bool = False
+) -> Path:
+    """
+    Возвращает путь к файлу с результатами режима.
+
+    Args:
+        parser_mode: Режим работы парсера.
+        extension: Расширение файла.
+        now: Время запуска парсера.
+        append: Вернуть путь к общему набору данных режима вместо
+            нового файла с временной меткой.
+
+    Returns:
+        Path: Путь внутри RESULTS_DIR.
+    """
+    RESULTS_DIR.mkdir(exist_ok=True, parents=True)
+    if append:
+        return RESULTS_DIR / f'{parser_mode}.{extension}'
+    return (
+        RESULTS_DIR
+        / f'{parser_mode}_{now.strftime(DATETIME_FORMAT)}.{extension}'
+    )
+
+
+def _batched(
+    rows: Iterable[tuple], size: int = OUTPUT_BATCH_SIZE
+) -> Iterator[list[tuple]]:
+    """Разбивает строки на пачки по `size` штук."""
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def result_columns(header: Iterable[str], parser_mode: str) -> tuple:
+    """
+    Возвращает имена столбцов результатов режима.
+
+    Имена берутся из HEADER_COLUMNS по строке заголовков или из
+    RESULT_COLUMNS по режиму (или из заголовков для неизвестного режима).
+
+    Args:
+        header: Строка заголовков результатов.
+        parser_mode: Режим работы парсера.
+
+    Returns:
+        tuple: Имена столбцов.
+    """
+    header = tuple(header)
+    return HEADER_COLUMNS.get(header) or RESULT_COLUMNS.get(
+        parser_mode, header
+    )
+
+
+def _column_type(values: Iterable) -> type:
+    """
+    Определяет тип столбца по его значениям.
+
+    Пропуски (None) не учитываются; целые и дробные числа дают REAL,
+    любые другие сочетания типов — TEXT.
+    """
+    kinds = {type(value) for value in values if value is not None}
+    if kinds and kinds <= {int}:
+        return int
+    if kinds and kinds <= {int, float}:
+        return float
+    return str
+
+
+def _conform(
+    row: tuple, columns: tuple[str, ...], types: tuple[type, ...]
+) -> tuple:
+    """
+    Приводит значения строки к типам столбцов.
+
+    Raises:
+        OutputSchemaException: Если число или другое значение нельзя
+            без потерь привести к числовому типу столбца.
+    """
+    values = []
+    for column, column_type, value in zip(columns, types, row):
+        if value is None or type(value) is column_type:
+            values.append(value)
+        elif column_type is str:
+            values.append(str(value))
+        elif column_type is float and type(value) is int:
+            values.append(float(value))
+        else:
+            msg = (
+                f'Значение {value!r} столбца {column} не соответствует '
+                f'типу {column_type.__name__}, определённому по первым '
+                'строкам результатов'
+            )
+            raise OutputSchemaException(msg)
+    return tuple(values)
+
+
+def _typed_rows(
+    results: Iterable[tuple], parser_mode: str
+) -> tuple[tuple[str, ...], tuple[type, ...], Iterator[tuple]]:
+    """
+    Отделяет строку заголовков и определяет столбцы результатов.
+
+    Имена столбцов определяет `result_columns`, типы — первая пачка
+    из OUTPUT_BATCH_SIZE строк данных: пропуск или число в первой строке
+    не задаёт тип всего столбца. Значения следующих строк приводятся
+    к этим типам. Итоговая строка (SummaryRow) не является строкой
+    данных и пропускается.
+
+    Args:
+        results: Строка заголовков, затем строки данных.
+        parser_mode: Режим работы парсера.
+
+    Returns:
+        tuple: (имена столбцов, типы столбцов, итератор строк данных).
+    """
+    rows = (row for row in results if not isinstance(row, SummaryRow))
+    header = next(rows)
+    columns = result_columns(header, parser_mode)
+    first_batch = list(islice(rows, OUTPUT_BATCH_SIZE))
+    types = tuple(_column_type(values) for values in zip(*first_batch))
+    if not types:
+        return columns, (str,) * len(columns), iter(())
+    return (
+        columns,
+        types,
+        (_conform(row, columns, types) for row in chain(first_batch, rows)),
+    )
+
+
+def _check_columns(
+    file_path: Path, existing: Iterable[str], columns: Iterable[str]
+) -> None:
+    """
+    Проверяет, что набор данных дописывается с теми же столбцами.
+
+    Args:
+        file_path: Путь к набору данных.
+        existing: Столбцы, уже сохранённые в наборе данных.
+        columns: Столбцы дописываемых результатов.
 
-def default_output(results: list[tuple], *args) -> None:
+    Raises:
+        OutputSchemaException: Если наборы столбцов различаются.
+    """
+    existing, columns = list(existing), list(columns)
+    if existing != columns:
+        msg = (
+            f'Столбцы результатов ({", ".join(columns)}) не совпадают '
+            f'со столбцами {file_path} ({", ".join(existing)}): '
+            'сохраните результаты без --append или удалите файл'
+        )
+        raise OutputSchemaException(msg)
+
+
+def default_output(results: Iterable[tuple], *args) -> None:
     """Выводит данные построчно в консоль без форматирования."""
     for row in results:
-        print(*row)
+        print(*row, flush=True)
+
+
+def pretty_output(results: Iterable[tuple], *args) -> None:
+    """
+    Создаёт отформатированную таблицу для консольного вывода.
 
+    Ширина столбцов известна только после получения всех строк, поэтому
+    это единственный способ вывода, который накапливает результаты.
+    """
+    from prettytable import PrettyTable  # noqa: PLC0415
 
-def pretty_output(results: list[tuple], *args) -> None:
-    """Создаёт отформатированную таблицу для консольного вывода."""
+    rows = iter(results)
     table = PrettyTable()
-    table.field_names = results[0]
+    table.field_names = next(rows)
     table.align = 'l'
-    table.add_rows(results[1:])
+    table.add_rows(list(rows))
     print(table)
 
 
-def file_output(results: list[tuple], *args) -> None:
-    """Сохраняет результаты парсинга в CSV файл."""
-    RESULTS_DIR.mkdir(exist_ok=True, parents=True)
-
-    parser_mode = args[0].mode
-    now = dt.datetime.now()
-    now_formatted = now.strftime(DATETIME_FORMAT)
+def file_output(results: Iterable[tuple], *args) -> None:
+    """
+    Сохраняет результаты парсинга в CSV файл.
 
-    file_name = f'{parser_mode}_{now_formatted}.csv'
-    file_path = RESULTS_DIR / file_name
+    Строки записываются по мере поступления, поэтому при прерывании
+    долгого парсинга в файле остаются уже полученные результаты.
+    """
+    file_path = _result_path(args[0].mode, 'csv', dt.datetime.now())
 
     with Path(file_path).open('w', encoding='utf-8', newline='') as f:
-        csv.writer(f, dialect='unix').writerows(results)
+        writer = csv.writer(f, dialect='unix')
+        for row in results:
+            writer.writerow(row)
+            f.flush()
+
+    logger.info('Файл с результатами был сохранён: %s', file_path)
+
+
+def jsonl_output(results: Iterable[tuple], *args) -> None:
+    """
+    Сохраняет результаты парсинга в файл JSON Lines.
+
+    Каждая строка — объект с временем запуска `run_at` и полями из
+    RESULT_COLUMNS. Строки дописываются в файл пачками.
+
+    Raises:
+        OutputSchemaException: Если поля отличаются от уже сохранённых
+            в файле.
+    """
+    cli_arg = args[0]
+    now = dt.datetime.now().replace(microsecond=0)
+    columns, _, rows = _typed_rows(results, cli_arg.mode)
+    file_path = _result_path(
+        cli_arg.mode, 'jsonl', now, getattr(cli_arg, 'append', False)
+    )
+    if file_path.exists():
+        with file_path.open(encoding='utf-8') as f:
+            first_line = f.readline()
+        if first_line:
+            _check_columns(
+                file_path, json.loads(first_line), ('run_at', *columns)
+            )
+
+    run_at = now.isoformat(sep=' ')
+    with file_path.open('a', encoding='utf-8') as f:
+        for batch in _batched(rows):
+            f.writelines(
+                json.dumps(
+                    {'run_at': run_at, **dict(zip(columns, row))},
+                    ensure_ascii=False,
+                )
+                + '\n'
+                for row in batch
+            )
+            f.flush()
+
+    logger.info('Файл с результатами был сохранён: %s', file_path)
+
+
+def sqlite_output(results: Iterable[tuple], *args) -> None:
+    """
+    Сохраняет результаты парсинга в таблицу `results` базы SQLite.
+
+    База работает в режиме WAL, все строки запуска вставляются пачками
+    в одной транзакции: при ошибке в базе не остаётся неполного запуска.
+    """
+    cli_arg = args[0]
+    now = dt.datetime.now().replace(microsecond=0)
+    columns, types, rows = _typed_rows(results, cli_arg.mode)
+    file_path = _result_path(
+        cli_arg.mode, 'sqlite', now, getattr(cli_arg, 'append', False)
+    )
+
+    definitions = ', '.join(
+        f'"{column}" {SQLITE_TYPES[column_type]}'
+        for column, column_type in zip(columns, types)
+    )
+    placeholders = ', '.join('?' * (len(columns) + 1))
+    run_at = now.isoformat(sep=' ')
+    with closing(sqlite3.connect(str(file_path))) as connection:
+        connection.execute('PRAGMA journal_mode = WAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS results '
+            f'(run_at TEXT NOT NULL, {definitions})'
+        )
+        _check_columns(
+            file_path,
+            (
+                name
+                for _, name, *_ in connection.execute(
+                    'PRAGMA table_info(results)'
+                )
+            ),
+            ('run_at', *columns),
+        )
+        with connection:
+            for batch in _batched(rows):
+                connection.executemany(
+                    f'INSERT INTO results VALUES ({placeholders})',  # noqa: S608
+                    [(run_at, *row) for row in batch],
+                )
+
+    logger.info('Файл с результатами был сохранён: %s', file_path)
+
+
+def parquet_output(results: Iterable[tuple], *args) -> None:
+    """
+    Сохраняет результаты парсинга в формате Parquet.
+
+    Требует пакет pyarrow. Строки записываются группами по
+    OUTPUT_BATCH_SIZE. В режиме дописывания каждый запуск сохраняется
+    отдельным файлом в директории набора данных `<режим>.parquet`.
+
+    Raises:
+        ModuleNotFoundError: Если pyarrow не установлен.
+        OutputSchemaException: Если столбцы или их типы отличаются
+            от уже сохранённых в наборе данных.
+    """
+    # pyarrow — необязательная зависимость, нужна только для этого вывода
+    try:
+        import pyarrow as pa  # noqa: PLC0415
+        import pyarrow.parquet as pq  # noqa: PLC0415
+    except ModuleNotFoundError as e:
+        error_msg = 'Для вывода в формате parquet установите пакет pyarrow'
+        raise ModuleNotFoundError(error_msg) from e
+
+    cli_arg = args[0]
+    now = dt.datetime.now().replace(microsecond=0)
+    columns, types, rows = _typed_rows(results, cli_arg.mode)
+    append = getattr(cli_arg, 'append', False)
+    file_path = _result_path(cli_arg.mode, 'parquet', now, append)
+    if append:
+        file_path.mkdir(exist_ok=True)
+        file_path /= f'part-{now.strftime(DATETIME_FORMAT)}.parquet'
+
+    arrow_types = {int: pa.int64(), float: pa.float64(), str: pa.string()}
+    schema = pa.schema(
+        [
+            ('run_at', pa.timestamp('s')),
+            *(
+                (column, arrow_types[column_type])
+                for column, column_type in zip(columns, types)
+            ),
+        ]
+    )
+    previous_part = append and next(file_path.parent.glob('*.parquet'), None)
+    if previous_part:
+        _check_columns(
+            file_path.parent,
+            (
+                f'{field.name} {field.type}'
+                for field in pq.read_schema(str(previous_part))
+            ),
+            (f'{field.name} {field.type}' for field in schema),
+        )
+    with pq.ParquetWriter(str(file_path), schema) as writer:
+        for batch in _batched(rows):
+            writer.write_table(
+                pa.Table.from_pylist(
+                    [dict(zip(schema.names, (now, *row))) for row in batch],
+                    schema=schema,
+                )
+            )
 
     logger.info('Файл с результатами был сохранён: %s', file_path)
 
@@ -51,16 +387,22 @@ def file_output(results: list[tuple], *args) -> None:
 OUTPUT_HANDLERS = {
     OUTPUT_PRETTY: pretty_output,
     OUTPUT_FILE: file_output,
+    OUTPUT_JSONL: jsonl_output,
+    OUTPUT_SQLITE: sqlite_output,
+    OUTPUT_PARQUET: parquet_output,
     None: default_output,
 }
 
 
-def control_output(results: list[tuple], cli_arg: argparse.Namespace) -> None:
+def control_output(
+    results: Iterable[tuple], cli_arg: argparse.Namespace
+) -> None:
     """
     Определяет способ вывода результатов парсинга.
 
     Args:
-        results: Данные парсинга.
+        results: Данные парсинга: строка заголовков, затем строки данных.
+            Может быть генератором — строки выводятся по мере получения.
         cli_arg: Аргументы командной строки.
     """
     output = getattr(cli_arg, 'output', None)
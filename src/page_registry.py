@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+    from profiler import Profiler
+
+
+class PageRegistry:
+    """
+    Реестр страниц одного запуска парсера.
+
+    Запоминает ответы, деревья и результаты разбора страниц, поэтому
+    режимы, запущенные вместе, загружают и разбирают каждую страницу не
+    больше одного раза. Если страницу одновременно запрашивают несколько
+    потоков, загружает её первый, а остальные ждут его результата.
+    Ошибки запоминаются так же, как результаты: неудачная страница
+    не запрашивается повторно в том же запуске.
+
+    Args:
+        profiler: Сборщик длительностей фаз, в котором считаются
+            повторные обращения (None — без замеров).
+    """
+
+    def __init__(self, profiler: Profiler | None = None) -> None:
+        self.profiler = profiler
+        self.hits = 0
+        self._entries: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Возвращает запомненное значение или вычисляет его один раз.
+
+        Args:
+            key: Ключ страницы (вид значения, URL и параметры разбора).
+            factory: Функция, загружающая или разбирающая страницу.
+
+        Returns:
+            Any: Значение `factory` для этого ключа.
+
+        Raises:
+            Exception: Ошибка, которой завершился вызов `factory`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            owner = entry is None
+            if owner:
+                entry = self._entries[key] = Future()
+            else:
+                self.hits += 1
+        if owner:
+            try:
+                entry.set_result(factory())
+            except BaseException as error:
+                entry.set_exception(error)
+                raise
+        elif self.profiler is not None:
+            self.profiler.count('page_registry_hits')
+        return entry.result()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Callable
+
+from utils import build_tree
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+# forkserver недоступен в Windows
+START_METHOD = (
+    'forkserver'
+    if 'forkserver' in multiprocessing.get_all_start_methods()
+    else 'spawn'
+)
+
+
+def extract_page(
+    content: bytes,
+    encoding: str | None,
+    extract: Callable[[Any], Any],
+    parser: str,
+) -> Any:
+    """
+    Строит дерево страницы из тела ответа и извлекает из него данные.
+
+    Выполняется в процессе пула: на вход передаются байты ответа,
+    обратно — только результат `extract`, а не дерево документа.
+
+    Args:
+        content: Тело ответа.
+        encoding: Кодировка ответа (None — utf-8).
+        extract: Функция, извлекающая данные из дерева документа.
+        parser: Движок разбора (bs4 или lxml).
+
+    Returns:
+        Any: Результат функции `extract`.
+    """
+    text = content.decode(encoding or 'utf-8', errors='replace')
+    return extract(build_tree(text, parser))
+
+
+class ParsePool:
+    """
+    Пул процессов для построения деревьев HTML и извлечения данных.
+
+    Разбор страниц BeautifulSoup упирается в GIL, поэтому потоки
+    загрузки передают тела ответов в отдельные процессы. Процессы
+    запускаются при первой странице, которую нужно разобрать: ответы
+    из кеша результатов разбора пул не затрагивают.
+
+    К моменту запуска процессов уже работают потоки загрузки, которые
+    держат блокировки соединений и логирования. Процессы создаются
+    через forkserver (spawn, где его нет), а не копированием текущего
+    процесса (fork), поэтому не наследуют захваченные блокировки.
+
+    Args:
+        processes: Количество процессов (None или 0 — по числу ядер).
+    """
+
+    def __init__(self, processes: int | None = None) -> None:
+        self.processes = processes or os.cpu_count() or 1
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def extract(
+        self,
+        content: bytes,
+        encoding: str | None,
+        extract: Callable[[Any], Any],
+        parser: str,
+    ) -> Any:
+        """
+        Извлекает данные из тела ответа в процессе пула.
+
+        Вызывающий поток ждёт результата, поэтому одновременно
+        разбирается не больше страниц, чем потоков загрузки.
+
+        Args:
+            content: Тело ответа.
+            encoding: Кодировка ответа.
+            extract: Функция уровня модуля, извлекающая данные из дерева.
+            parser: Движок разбора (bs4 или lxml).
+
+        Returns:
+            Any: Результат функции `extract`.
+
+        Raises:
+            ParserFindTagException: Если на странице не найден нужный тег.
+        """
+        from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context(START_METHOD),
+                )
+            executor = self._executor
+        return executor.submit(
+            extract_page, content, encoding, extract, parser
+        ).result()
+
+    def close(self) -> None:
+        """Останавливает процессы пула."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
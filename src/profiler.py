@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from itertools import accumulate
+from typing import TYPE_CHECKING, Any, Callable
+
+from constants import METRICS_BUCKETS, PROFILE_SAMPLES
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+# Фазы работы парсера
+PHASE_NETWORK = 'fetch:network'
+PHASE_CACHE = 'fetch:cache'
+PHASE_SLEEP = 'sleep'
+PHASE_RETRY = 'retry'
+PHASE_PARSE = 'parse'
+PHASE_EXTRACT = 'extract'
+PHASE_OUTPUT = 'output'
+
+PERCENTILES = (50, 95)
+
+
+def percentile(values: list[float], rank: int) -> float:
+    """
+    Вычисляет перцентиль методом ближайшего ранга.
+
+    Args:
+        values: Отсортированные значения.
+        rank: Перцентиль от 1 до 100.
+
+    Returns:
+        float: Значение перцентиля (0.0 для пустого списка).
+    """
+    if not values:
+        return 0.0
+    return values[max(math.ceil(rank / 100 * len(values)) - 1, 0)]
+
+
+class PhaseStats:
+    """
+    Накопленная статистика длительностей одной фазы.
+
+    Количество вызовов, сумма и корзины гистограммы METRICS_BUCKETS
+    считаются по всем вызовам, а для перцентилей хранятся только
+    последние PROFILE_SAMPLES длительностей. Поэтому память не растёт
+    с числом вызовов, например в режиме наблюдения.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(METRICS_BUCKETS) + 1)
+        self.recent: deque[float] = deque(maxlen=PROFILE_SAMPLES)
+
+    def add(self, seconds: float) -> None:
+        """Учитывает длительность одного вызова."""
+        self.calls += 1
+        self.total += seconds
+        self.buckets[bisect_left(METRICS_BUCKETS, seconds)] += 1
+        self.recent.append(seconds)
+
+
+class Profiler:
+    """
+    Потокобезопасный сборщик длительностей фаз запуска.
+
+    Для каждой фазы (загрузка из сети или из кеша, ожидание ограничителя
+    частоты, пауза перед повтором запроса, построение дерева, извлечение
+    данных, вывод) накапливается `PhaseStats`: число вызовов, сумма,
+    гистограмма для метрик и последние длительности для перцентилей
+    сводки. Дополнительно считаются
+    скачанные байты, попадания в кеш страниц и кеш результатов разбора,
+    ошибки (`errors:<исключение>`) и несовпадения статусов PEP.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._phases: dict[str, PhaseStats] = defaultdict(PhaseStats)
+        self.counters: dict[str, int] = defaultdict(int)
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Добавляет длительность одного вызова фазы."""
+        with self._lock:
+            self._phases[phase].add(seconds)
+
+    def count(self, counter: str, value: int = 1) -> None:
+        """Увеличивает счётчик."""
+        with self._lock:
+            self.counters[counter] += value
+
+    def durations(self, phase: str) -> list[float]:
+        """Возвращает отсортированные последние длительности фазы."""
+        with self._lock:
+            stats = self._phases.get(phase)
+            return sorted(stats.recent) if stats is not None else []
+
+    def histogram(self, phase: str) -> tuple[list[int], float, int]:
+        """
+        Возвращает гистограмму длительностей фазы за весь запуск.
+
+        Args:
+            phase: Фаза запуска.
+
+        Returns:
+            tuple: (накопленные счётчики корзин METRICS_BUCKETS и +Inf,
+            сумма длительностей, количество вызовов).
+        """
+        with self._lock:
+            stats = self._phases.get(phase) or PhaseStats()
+            return list(accumulate(stats.buckets)), stats.total, stats.calls
+
+    def snapshot_counters(self) -> dict[str, int]:
+        """Возвращает копию счётчиков."""
+        with self._lock:
+            return dict(self.counters)
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Замеряет длительность блока кода как один вызов фазы."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - started)
+
+    def record_fetch(
+        self, seconds: float, from_cache: bool, size: int | None
+    ) -> None:
+        """
+        Учитывает один HTTP-запрос.
+
+        Args:
+            seconds: Длительность запроса.
+            from_cache: Ответ получен из кеша страниц.
+            size: Размер тела ответа в байтах (None — тело не читалось).
+        """
+        self.add(PHASE_CACHE if from_cache else PHASE_NETWORK, seconds)
+        self.count('cache_hits' if from_cache else 'cache_misses')
+        if size is not None and not from_cache:
+            self.count('bytes', size)
+
+    def consume(
+        self,
+        phase: str,
+        consumer: Callable[..., Any],
+        rows: Iterable,
+        *args: Any,
+    ) -> Any:
+        """
+        Вызывает потребителя строк, замеряя только его собственное время.
+
+        Строки режимов могут вычисляться лениво, по мере вывода. Время
+        получения очередной строки вычитается из длительности, чтобы
+        загрузка и разбор страниц не попадали в фазу вывода.
+
+        Args:
+            phase: Фаза, в которую записывается длительность.
+            consumer: Функция, принимающая строки первым аргументом.
+            rows: Строки для потребителя.
+            *args: Остальные аргументы потребителя.
+
+        Returns:
+            Any: Результат потребителя.
+        """
+        producing = 0.0
+
+        def timed_rows() -> Iterator:
+            nonlocal producing
+            iterator = iter(rows)
+            while True:
+                started = time.perf_counter()
+                try:
+                    row = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    producing += time.perf_counter() - started
+                yield row
+
+        started = time.perf_counter()
+        try:
+            return consumer(timed_rows(), *args)
+        finally:
+            self.add(phase, time.perf_counter() - started - producing)
+
+    def summary(self) -> dict:
+        """
+        Сводка по фазам и счётчикам.
+
+        Returns:
+            dict: {'phases': {фаза: {'calls', 'total', 'p50', 'p95'}},
+            'counters': {...}, 'cache_hit_ratio': доля ответов из кеша}.
+            Длительности указаны в секундах.
+        """
+        with self._lock:
+            stats = {
+                phase: (phase_stats.calls, phase_stats.total)
+                for phase, phase_stats in self._phases.items()
+            }
+            durations = {
+                phase: sorted(phase_stats.recent)
+                for phase, phase_stats in self._phases.items()
+            }
+            counters = dict(self.counters)
+        phases = {
+            phase: {
+                'calls': calls,
+                'total': total,
+                **{
+                    f'p{rank}': percentile(durations[phase], rank)
+                    for rank in PERCENTILES
+                },
+            }
+            for phase, (calls, total) in stats.items()
+        }
+        requests = counters.get('cache_hits', 0) + counters.get(
+            'cache_misses', 0
+        )
+        return {
+            'phases': phases,
+            'counters': counters,
+            'cache_hit_ratio': (
+                counters.get('cache_hits', 0) / requests if requests else None
+            ),
+        }
+
+    def report(self) -> str:
+        """Форматирует сводку в виде таблицы."""
+        from prettytable import PrettyTable  # noqa: PLC0415
+
+        summary = self.summary()
+        table = PrettyTable()
+        table.field_names = (
+            'Фаза',
+            'Вызовов',
+            'Всего, с',
+            *(f'p{rank}, мс' for rank in PERCENTILES),
+        )
+        table.align = 'r'
+        for phase, stats in summary['phases'].items():
+            table.add_row(
+                (
+                    phase,
+                    stats['calls'],
+                    f'{stats["total"]:.3f}',
+                    *(
+                        f'{stats[f"p{rank}"] * 1000:.1f}'
+                        for rank in PERCENTILES
+                    ),
+                )
+            )
+        lines = [table.get_string()]
+        ratio = summary['cache_hit_ratio']
+        if ratio is not None:
+            lines.append(f'Доля ответов из кеша: {ratio:.0%}')
+        counters = summary['counters']
+        lines.append(f'Скачано из сети: {counters.get("bytes", 0)} байт')
+        if 'result_cache_hits' in counters:
+            lines.append(
+                f'Результатов из кеша разбора: {counters["result_cache_hits"]}'
+            )
+        return '\n'.join(lines)
+
+    def save(self, path: Path) -> None:
+        """Сохраняет сводку в JSON файл."""
+        path.parent.mkdir(exist_ok=True, parents=True)
+        path.write_text(
+            json.dumps(self.summary(), ensure_ascii=False, indent=2),
+            encoding='utf-8',
+        )
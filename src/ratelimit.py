@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from profiler import PHASE_SLEEP
+
+if TYPE_CHECKING:
+    from profiler import Profiler
+
+
+class TokenBucket:
+    """
+    Потокобезопасное ведро токенов.
+
+    Ведро пополняется со скоростью `rate` токенов в секунду и вмещает
+    не более `burst` токенов. Если токенов не хватает, вызывающий поток
+    резервирует будущий токен и ждёт его появления.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Забирает один токен, при необходимости дожидаясь его появления.
+
+        Returns:
+            float: Время ожидания в секундах.
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated_at
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+class RateLimiter:
+    """
+    Набор вёдер токенов, по одному на каждый хост.
+
+    Args:
+        limits: Словарь {хост: (запросов в секунду, размер пачки)}.
+        default: Ограничение для хостов, которых нет в `limits`.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, tuple[float, int]],
+        default: tuple[float, int],
+    ) -> None:
+        self.limits = limits
+        self.default = default
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        """Возвращает ведро токенов хоста, создавая его при первом вызове."""
+        with self._lock:
+            if host not in self._buckets:
+                rate, burst = self.limits.get(host, self.default)
+                self._buckets[host] = TokenBucket(rate, burst)
+            return self._buckets[host]
+
+    def acquire(self, url: str) -> float:
+        """Забирает токен у хоста, которому адресован запрос."""
+        return self.bucket(urlparse(url).hostname or '').acquire()
+
+
+class RateLimitedAdapter(BaseAdapter):
+    """
+    Транспортный адаптер requests, ограничивающий частоту запросов к хостам.
+
+    Адаптер вызывается только для реальных сетевых запросов: ответы,
+    полученные из кеша `requests_cache`, до него не доходят и токены
+    не расходуют.
+
+    Args:
+        limiter: Ограничитель частоты запросов.
+        adapter: Адаптер, выполняющий запрос (по умолчанию HTTPAdapter).
+        profiler: Сборщик длительностей, в который записываются ожидания.
+    """
+
+    def __init__(
+        self,
+        limiter: RateLimiter,
+        adapter: BaseAdapter | None = None,
+        profiler: Profiler | None = None,
+    ) -> None:
+        super().__init__()
+        self.limiter = limiter
+        self.adapter = adapter or HTTPAdapter()
+        self.profiler = profiler
+
+    def send(self, request, **kwargs):
+        """Дожидается токена хоста и передаёт запрос вложенному адаптеру."""
+        delay = self.limiter.acquire(request.url)
+        if delay and self.profiler is not None:
+            self.profiler.add(PHASE_SLEEP, delay)
+        return self.adapter.send(request, **kwargs)
+
+    def close(self) -> None:
+        """Закрывает вложенный адаптер."""
+        self.adapter.close()
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from types import CodeType
+from typing import TYPE_CHECKING, Any, Callable
+
+from constants import PARSED_CACHE_MAX_ENTRIES, PARSED_CACHE_VERSION
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import requests_cache
+
+
+def response_validator(response: requests_cache.Response) -> str:
+    """
+    Возвращает признак версии страницы: ETag или хеш её содержимого.
+
+    Args:
+        response: Ответ сервера или кеша.
+
+    Returns:
+        str: ETag ответа, а если его нет — SHA-256 тела ответа.
+    """
+    etag = response.headers.get('ETag')
+    if etag:
+        return etag
+    return hashlib.sha256(response.content).hexdigest()
+
+
+def _hash_code(value: Any, digest: Any) -> None:
+    """Добавляет в хеш байт-код функции и её константы."""
+    if isinstance(value, CodeType):
+        digest.update(value.co_code)
+        digest.update(repr(value.co_names).encode())
+        for const in value.co_consts:
+            _hash_code(const, digest)
+    elif isinstance(value, frozenset):
+        # Порядок элементов множества зависит от PYTHONHASHSEED
+        digest.update(repr(sorted(map(repr, value))).encode())
+    elif isinstance(value, tuple):
+        for item in value:
+            _hash_code(item, digest)
+    else:
+        digest.update(repr(value).encode())
+
+
+@functools.cache
+def extractor_key(extract: Callable[[Any], Any]) -> str:
+    """
+    Возвращает ключ функции разбора в кеше результатов.
+
+    Ключ включает имя функции, хеш её байт-кода и PARSED_CACHE_VERSION:
+    после изменения функции разбора старые результаты не используются.
+    Изменения вызываемых ею функций учитываются только через
+    PARSED_CACHE_VERSION.
+
+    Args:
+        extract: Функция, извлекающая данные из дерева документа.
+
+    Returns:
+        str: Ключ вида `<имя>:<версия>:<хеш>`.
+    """
+    digest = hashlib.sha256()
+    _hash_code(extract.__code__, digest)
+    return (
+        f'{extract.__qualname__}:{PARSED_CACHE_VERSION}:'
+        f'{digest.hexdigest()[:16]}'
+    )
+
+
+class ResultCache:
+    """
+    Кеш результатов разбора страниц в SQLite.
+
+    Хранит извлечённые со страницы данные по ключу (функция разбора, URL)
+    вместе с версией страницы. Пока версия страницы не изменилась, данные
+    берутся из кеша без построения дерева BeautifulSoup. При превышении
+    `max_entries` удаляются записи, которые дольше всего не запрашивались.
+
+    Args:
+        path: Путь к файлу базы данных (или ':memory:').
+        max_entries: Максимальное количество записей.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        max_entries: int = PARSED_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            str(path), check_same_thread=False, isolation_level=None
+        )
+        self._connection.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS parsed (
+                extractor TEXT NOT NULL,
+                url TEXT NOT NULL,
+                validator TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (extractor, url)
+            );
+            CREATE INDEX IF NOT EXISTS parsed_accessed_at
+                ON parsed (accessed_at);
+            """
+        )
+
+    def get(self, extractor: str, url: str, validator: str) -> Any:
+        """
+        Возвращает сохранённый результат разбора страницы.
+
+        Args:
+            extractor: Имя функции разбора.
+            url: URL страницы.
+            validator: Текущая версия страницы.
+
+        Returns:
+            Any: Результат разбора или None, если страница изменилась
+            или ещё не разбиралась.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT validator, payload FROM parsed '
+                'WHERE extractor = ? AND url = ?',
+                (extractor, url),
+            ).fetchone()
+            if row is None or row[0] != validator:
+                return None
+            self._connection.execute(
+                'UPDATE parsed SET accessed_at = ? '
+                'WHERE extractor = ? AND url = ?',
+                (time.time(), extractor, url),
+            )
+        return json.loads(row[1])
+
+    def set(
+        self, extractor: str, url: str, validator: str, result: Any
+    ) -> None:
+        """
+        Сохраняет результат разбора страницы и вытесняет старые записи.
+
+        Args:
+            extractor: Имя функции разбора.
+            url: URL страницы.
+            validator: Версия страницы.
+            result: Результат разбора, сериализуемый в JSON.
+        """
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO parsed VALUES (?, ?, ?, ?, ?)',
+                (extractor, url, validator, json.dumps(result), time.time()),
+            )
+            self._connection.execute(
+                'DELETE FROM parsed WHERE rowid IN ('
+                'SELECT rowid FROM parsed ORDER BY accessed_at DESC '
+                'LIMIT -1 OFFSET ?)',
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        """Удаляет все сохранённые результаты."""
+        with self._lock:
+            self._connection.execute('DELETE FROM parsed')
+
+    def close(self) -> None:
+        """Закрывает соединение с базой данных."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+from requests import ConnectionError as RequestsConnectionError
+from requests.exceptions import ChunkedEncodingError, Timeout
+
+from constants import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_AFTER,
+    REQUEST_TIMEOUT,
+    RETRY_AFTER_MAX,
+    RETRY_BACKOFF,
+    RETRY_MAX_BACKOFF,
+    RETRY_STATUSES,
+    RETRY_TOTAL,
+)
+from exceptions import CircuitOpenException
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+# Ошибки, после которых запрос имеет смысл повторить
+RETRYABLE_ERRORS = (RequestsConnectionError, Timeout, ChunkedEncodingError)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Разбирает заголовок Retry-After.
+
+    Args:
+        value: Значение заголовка: число секунд или HTTP-дата.
+
+    Returns:
+        float | None: Время ожидания в секундах или None, если заголовок
+        отсутствует или не разобран.
+    """
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((moment - dt.datetime.now(dt.timezone.utc)).total_seconds(), 0)
+
+
+class RetryPolicy:
+    """
+    Правила повтора HTTP-запросов.
+
+    Повторяются запросы, завершившиеся ошибкой соединения или таймаутом,
+    и ответы со статусами из `statuses`. Пауза перед повтором выбирается
+    случайно от нуля до `backoff * 2 ** попытка` (не больше
+    `max_backoff`), а если сервер прислал Retry-After — равна ему
+    (не больше RETRY_AFTER_MAX).
+
+    Args:
+        retries: Количество повторов после первой попытки.
+        timeout: Таймаут соединения и чтения ответа в секундах
+            (None — без таймаута).
+        backoff: Базовая пауза перед повтором в секундах.
+        max_backoff: Наибольшая пауза перед повтором в секундах.
+        statuses: HTTP-статусы, при которых запрос повторяется.
+    """
+
+    def __init__(
+        self,
+        retries: int = RETRY_TOTAL,
+        timeout: float | None = REQUEST_TIMEOUT,
+        backoff: float = RETRY_BACKOFF,
+        max_backoff: float = RETRY_MAX_BACKOFF,
+        statuses: tuple[int, ...] = RETRY_STATUSES,
+    ) -> None:
+        self.retries = retries
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+
+    def should_retry(
+        self,
+        response: requests.Response | None,
+        error: Exception | None,
+    ) -> bool:
+        """Проверяет, что попытка не удалась и её можно повторить."""
+        if error is not None:
+            return isinstance(error, RETRYABLE_ERRORS)
+        return response.status_code in self.statuses
+
+    def is_host_failure(
+        self,
+        response: requests.Response | None,
+        error: Exception | None,
+    ) -> bool:
+        """
+        Проверяет, что попытка говорит о неисправности хоста.
+
+        В отличие от `should_retry`, неудачей считается любая ошибка
+        запроса, в том числе неповторяемая (ошибка SSL, слишком много
+        перенаправлений): она не должна сбрасывать счётчик неудач хоста.
+        """
+        if error is not None:
+            return True
+        return response.status_code in self.statuses
+
+    def delay(
+        self, attempt: int, response: requests.Response | None = None
+    ) -> float:
+        """
+        Вычисляет паузу перед повтором.
+
+        Args:
+            attempt: Номер неудачной попытки, начиная с 0.
+            response: Ответ неудачной попытки, если он был получен.
+
+        Returns:
+            float: Пауза в секундах.
+        """
+        if response is not None:
+            retry_after = parse_retry_after(
+                response.headers.get('Retry-After')
+            )
+            if retry_after is not None:
+                return min(retry_after, RETRY_AFTER_MAX)
+        return random.uniform(  # noqa: S311
+            0, min(self.max_backoff, self.backoff * 2**attempt)
+        )
+
+
+# Сессии без правил повтора: одна попытка без таймаута
+NO_RETRY = RetryPolicy(retries=0, timeout=None)
+
+
+class CircuitBreaker:
+    """
+    Потокобезопасный предохранитель запросов к хостам.
+
+    После `threshold` неудачных попыток подряд хост считается
+    недоступным: запросы к нему сразу завершаются CircuitOpenException,
+    не обращаясь к сети. Через `reset_after` секунд пропускается один
+    пробный запрос — при успехе счётчик сбрасывается, при неудаче хост
+    снова отключается. Пока пробный запрос не завершился, остальные
+    запросы к хосту отклоняются; если его результат так и не учтён,
+    через `reset_after` секунд пропускается следующий пробный запрос.
+    Пробный запрос получает от `check` метку и передаёт её в `record`,
+    поэтому завершение других запросов к хосту не снимает отметку
+    о выполняющемся пробном запросе.
+
+    Args:
+        threshold: Количество неудачных попыток подряд до отключения хоста.
+        reset_after: Время до пробного запроса в секундах.
+    """
+
+    def __init__(
+        self,
+        threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_after: float = CIRCUIT_RESET_AFTER,
+    ) -> None:
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self._failures: dict[str, int] = {}
+        self._opened_at: dict[str, float] = {}
+        self._probes: dict[str, tuple[object, float]] = {}
+        self._lock = threading.Lock()
+
+    def check(self, url: str) -> object | None:
+        """
+        Проверяет, что запросы к хосту из `url` разрешены.
+
+        Returns:
+            object | None: Метка пробного запроса или None, если запрос
+            не пробный.
+
+        Raises:
+            CircuitOpenException: Если хост отключён.
+        """
+        host = urlparse(url).hostname or ''
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return None
+            now = time.monotonic()
+            remaining = self.reset_after - (now - opened_at)
+            _, probe_started_at = self._probes.get(host, (None, None))
+            probing = (
+                probe_started_at is not None
+                and now - probe_started_at < self.reset_after
+            )
+            if remaining <= 0 and not probing:
+                probe = object()
+                self._probes[host] = (probe, now)
+                return probe
+        retry_in = (
+            'выполняется пробный запрос'
+            if remaining <= 0
+            else f'повтор через {remaining:.0f} с'
+        )
+        error_msg = (
+            f'Запросы к {host} приостановлены после '
+            f'{self.threshold} неудачных попыток подряд '
+            f'({retry_in}): {url}'
+        )
+        raise CircuitOpenException(error_msg)
+
+    def record(
+        self, url: str, failed: bool, probe: object | None = None
+    ) -> None:
+        """
+        Учитывает результат попытки запроса к хосту из `url`.
+
+        Args:
+            url: URL запроса.
+            failed: Попытка не удалась.
+            probe: Метка, полученная от `check`, если запрос пробный.
+        """
+        host = urlparse(url).hostname or ''
+        with self._lock:
+            current_probe, _ = self._probes.get(host, (None, None))
+            if probe is not None and probe is current_probe:
+                del self._probes[host]
+            if not failed:
+                self._failures.pop(host, None)
+                self._opened_at.pop(host, None)
+                return
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if self._failures[host] < self.threshold:
+                return
+            if host not in self._opened_at:
+                logger.warning(
+                    'Хост %s отключён после %d неудачных попыток подряд',
+                    host,
+                    self._failures[host],
+                )
+            self._opened_at[host] = time.monotonic()
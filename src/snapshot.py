@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import logging
+import random
+import threading
+from typing import TYPE_CHECKING
+
+from constants import PEP_VERIFY_SAMPLE
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class PepSnapshot:
+    """
+    Снимок основной таблицы PEP и статусов из карточек за прошлый запуск.
+
+    Для строки таблицы, которая не изменилась с прошлого запуска, статус
+    берётся из снимка без загрузки страницы PEP. Случайная выборка из
+    `verify_sample` строк всё равно перепроверяется по страницам PEP.
+    В новый снимок попадают только строки текущего запуска.
+
+    Args:
+        path: Путь к файлу снимка.
+        previous: Строки прошлого запуска {ссылка: {'row', 'status'}}.
+        verify_sample: Количество неизменившихся строк для перепроверки.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        previous: dict[str, dict] | None = None,
+        verify_sample: int = PEP_VERIFY_SAMPLE,
+    ) -> None:
+        self.path = path
+        self.previous = previous or {}
+        self.current: dict[str, dict] = {}
+        self.reused = 0
+        self._lock = threading.Lock()
+        sample_size = min(verify_sample, len(self.previous))
+        self._verify = set(
+            random.SystemRandom().sample(sorted(self.previous), sample_size)
+        )
+
+    @classmethod
+    def load(
+        cls, path: Path, verify_sample: int = PEP_VERIFY_SAMPLE
+    ) -> PepSnapshot:
+        """
+        Загружает снимок прошлого запуска.
+
+        Args:
+            path: Путь к файлу снимка.
+            verify_sample: Количество неизменившихся строк для перепроверки.
+
+        Returns:
+            PepSnapshot: Снимок (пустой, если файла нет или он повреждён).
+        """
+        previous = {}
+        if path.exists():
+            try:
+                previous = json.loads(path.read_text(encoding='utf-8'))
+            except ValueError:
+                logger.warning('Снимок таблицы PEP %s повреждён', path)
+        return cls(path, previous, verify_sample)
+
+    def reuse(self, pep_link: str, row: list[str]) -> str | None:
+        """
+        Возвращает статус PEP из снимка, если строка таблицы не изменилась.
+
+        Args:
+            pep_link: Ссылка на страницу PEP.
+            row: Тексты ячеек строки основной таблицы.
+
+        Returns:
+            str | None: Статус из карточки или None, если страницу PEP
+            нужно загрузить.
+        """
+        entry = self.previous.get(pep_link)
+        if entry is None or entry['row'] != row or pep_link in self._verify:
+            return None
+        with self._lock:
+            self.reused += 1
+        return entry['status']
+
+    def update(self, pep_link: str, row: list[str], status: str) -> None:
+        """Запоминает строку таблицы и статус PEP текущего запуска."""
+        with self._lock:
+            self.current[pep_link] = {'row': row, 'status': status}
+
+    def save(self) -> None:
+        """Атомарно сохраняет снимок текущего запуска."""
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        tmp_path = self.path.with_name(f'{self.path.name}.tmp')
+        tmp_path.write_text(
+            json.dumps(self.current, ensure_ascii=False), encoding='utf-8'
+        )
+        tmp_path.replace(self.path)
@@ -1,42 +1,261 @@
 from __future__ import annotations
 
+import functools
 import logging
+import time
+from contextlib import nullcontext
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, Callable
 
-import requests_cache
-from bs4 import BeautifulSoup, Tag
-from requests import RequestException
-
+from constants import (
+    CACHED_NAME,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_WORKERS,
+    EXPIRE_AFTER_CACHE,
+    PARSED_CACHE_PATH,
+    PARSER_BS4,
+    PARSER_LXML,
+    RATE_LIMITS,
+    URLS_EXPIRE_AFTER,
+)
 from exceptions import ParserFindTagException, RequestErrorException
+from profiler import PHASE_EXTRACT, PHASE_PARSE, PHASE_RETRY, Profiler
+from result_cache import (
+    ResultCache,
+    extractor_key,
+    response_validator,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import requests_cache
+    from bs4 import BeautifulSoup, SoupStrainer, Tag
+    from lxml.html import HtmlElement
+    from requests import RequestException
+
+    from retry import RetryPolicy
 
 logger = logging.getLogger(__name__)
 
 
+def create_session(
+    pool_size: int = DEFAULT_WORKERS,
+    result_cache_path: Path | str | None = PARSED_CACHE_PATH,
+    profiler: Profiler | None = None,
+    retry_policy: RetryPolicy | None = None,
+    **kwargs,
+) -> requests_cache.CachedSession:
+    """
+    Создаёт кешированную сессию с ограничением частоты запросов к хостам.
+
+    Срок жизни кеша задаётся по шаблонам URL (`URLS_EXPIRE_AFTER`).
+    Устаревшие ответы с валидаторами (ETag, Last-Modified) перепроверяются
+    условными запросами, и при ответе 304 тело страницы не скачивается.
+    Ограничение частоты применяется на уровне транспортного адаптера,
+    поэтому ответы из кеша выдаются без задержек. К сессии подключаются
+    правила повтора запросов (атрибут `retry_policy`), предохранитель
+    запросов к хостам (`circuit_breaker`), кеш результатов разбора
+    страниц (`result_cache`) и, если передан, сборщик длительностей фаз
+    (`profiler`).
+
+    Args:
+        pool_size: Размер пула соединений на один хост.
+        result_cache_path: Путь к кешу результатов разбора (None — без него).
+        profiler: Сборщик длительностей фаз запуска (None — без замеров).
+        retry_policy: Правила повтора запросов (по умолчанию RetryPolicy()).
+        **kwargs: Дополнительные настройки CachedSession (например, backend).
+
+    Returns:
+        requests_cache.CachedSession: Настроенная сессия.
+    """
+    import requests_cache  # noqa: PLC0415
+    from requests.adapters import HTTPAdapter  # noqa: PLC0415
+
+    from ratelimit import RateLimitedAdapter, RateLimiter  # noqa: PLC0415
+    from retry import CircuitBreaker, RetryPolicy  # noqa: PLC0415
+
+    session = requests_cache.CachedSession(
+        cache_name=CACHED_NAME,
+        expire_after=EXPIRE_AFTER_CACHE,
+        urls_expire_after=URLS_EXPIRE_AFTER,
+        **kwargs,
+    )
+    adapter = RateLimitedAdapter(
+        RateLimiter(RATE_LIMITS, DEFAULT_RATE_LIMIT),
+        HTTPAdapter(pool_maxsize=pool_size),
+        profiler=profiler,
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.retry_policy = retry_policy or RetryPolicy()
+    session.circuit_breaker = CircuitBreaker()
+    if result_cache_path is not None:
+        session.result_cache = ResultCache(result_cache_path)
+    if profiler is not None:
+        session.profiler = profiler
+    return session
+
+
+def _memoized(
+    session: requests_cache.CachedSession,
+    key: tuple,
+    factory: Callable[[], Any],
+) -> Any:
+    """
+    Вычисляет значение один раз за запуск, если к сессии подключён реестр
+    страниц (`page_registry`), иначе — при каждом вызове.
+    """
+    registry = getattr(session, 'page_registry', None)
+    if registry is None:
+        return factory()
+    return registry.get(key, factory)
+
+
 def get_response(
-    session: requests_cache.CachedSession, url: str, encoding: str = 'utf-8'
+    session: requests_cache.CachedSession,
+    url: str,
+    encoding: str = 'utf-8',
+    method: str = 'GET',
+    **kwargs,
 ) -> requests_cache.Response:
     """
-    Выполняет GET-запрос по указанному URL с использованием переданной сессии.
+    Выполняет HTTP-запрос по указанному URL с использованием переданной сессии.
+
+    Если к сессии подключены правила повтора (`retry_policy`), запрос
+    выполняется с таймаутом, а ошибки соединения и ответы со статусами
+    429 и 5xx повторяются с паузами. Предохранитель сессии
+    (`circuit_breaker`) учитывает каждую попытку и не пропускает запросы
+    к хосту, отключённому после серии неудач. Ответ с HTTP-статусом
+    ошибки не возвращается.
+
+    Если к сессии подключён реестр страниц (`page_registry`), ответ на
+    GET-запрос без потоковой загрузки запоминается, и повторный запрос
+    той же страницы в этом запуске не выполняется.
 
     Args:
         session: Сессия для выполнения запроса.
         url: URL для запроса.
+        encoding: Кодировка ответа.
+        method: HTTP-метод запроса (по умолчанию GET).
+        **kwargs: Дополнительные аргументы запроса (headers, stream и т.д.).
 
     Returns:
         requests_cache.Response: Объект ответа, если запрос выполнен успешно.
 
     Raises:
-        RequestErrorException: При ошибке HTTP-запроса.
+        RequestErrorException: При ошибке HTTP-запроса или статусе ошибки
+            после всех повторов.
+        CircuitOpenException: Если запросы к хосту приостановлены.
     """
-    try:
-        response = session.get(url)
-        response.encoding = encoding
-    except RequestException as e:
-        error_msg = f'Ошибка при загрузке страницы {url}: {e}'
-        raise RequestErrorException(error_msg) from e
+    if method != 'GET' or kwargs.get('stream'):
+        return _fetch(session, url, encoding, method, **kwargs)
+    return _memoized(
+        session,
+        ('response', url, encoding, repr(sorted(kwargs.items()))),
+        lambda: _fetch(session, url, encoding, method, **kwargs),
+    )
+
+
+def _fetch(
+    session: requests_cache.CachedSession,
+    url: str,
+    encoding: str,
+    method: str,
+    **kwargs,
+) -> requests_cache.Response:
+    """Выполняет запрос с повторами и проверкой статуса ответа."""
+    from retry import NO_RETRY  # noqa: PLC0415
 
+    policy = getattr(session, 'retry_policy', None) or NO_RETRY
+    breaker = getattr(session, 'circuit_breaker', None)
+    profiler = getattr(session, 'profiler', None)
+    if policy.timeout is not None:
+        kwargs.setdefault('timeout', policy.timeout)
+
+    for attempt in range(policy.retries + 1):
+        probe = breaker.check(url) if breaker is not None else None
+        started = time.perf_counter()
+        response, error = _send(session, method, url, **kwargs)
+        if breaker is not None:
+            breaker.record(url, policy.is_host_failure(response, error), probe)
+        retryable = policy.should_retry(response, error)
+        if not retryable or attempt == policy.retries:
+            break
+        _wait_retry(
+            policy, profiler, url, attempt, response=response, error=error
+        )
+
+    if error is not None:
+        raise _request_error(url, error, profiler) from error
+    if response.status_code >= HTTPStatus.BAD_REQUEST:
+        response.close()
+        raise _request_error(
+            url, f'HTTP {response.status_code}', profiler, response.status_code
+        )
+
+    response.encoding = encoding
+    if profiler is not None:
+        profiler.record_fetch(
+            time.perf_counter() - started,
+            getattr(response, 'from_cache', False),
+            None if kwargs.get('stream') else len(response.content),
+        )
     return response
 
 
+def _wait_retry(  # noqa: PLR0913
+    policy: RetryPolicy,
+    profiler: Profiler | None,
+    url: str,
+    attempt: int,
+    *,
+    response: requests_cache.Response | None,
+    error: RequestException | None,
+) -> None:
+    """Логирует неудачную попытку запроса и ждёт перед повтором."""
+    delay = policy.delay(attempt, response)
+    logger.warning(
+        'Повтор запроса %s через %.1f с (попытка %d из %d): %s',
+        url,
+        delay,
+        attempt + 2,
+        policy.retries + 1,
+        error or f'HTTP {response.status_code}',
+    )
+    if response is not None:
+        response.close()
+    if profiler is not None:
+        profiler.add(PHASE_RETRY, delay)
+    time.sleep(delay)
+
+
+def _request_error(
+    url: str,
+    reason: object,
+    profiler: Profiler | None,
+    status_code: int | None = None,
+) -> RequestErrorException:
+    """Создаёт исключение о неудачном запросе и учитывает его в замерах."""
+    if profiler is not None:
+        profiler.count(f'errors:{RequestErrorException.__name__}')
+    return RequestErrorException(
+        f'Ошибка при загрузке страницы {url}: {reason}', status_code
+    )
+
+
+def _send(
+    session: requests_cache.CachedSession, method: str, url: str, **kwargs
+) -> tuple[requests_cache.Response | None, RequestException | None]:
+    """Выполняет одну попытку запроса, возвращая ошибку вместо исключения."""
+    from requests import RequestException  # noqa: PLC0415
+
+    try:
+        return session.request(method, url, **kwargs), None
+    except RequestException as e:
+        return None, e
+
+
 def find_tag(
     soup: BeautifulSoup | Tag, tag: str, attrs: dict | None = None
 ) -> Tag:
@@ -62,16 +281,119 @@ def find_tag(
     return searched_tag
 
 
+def _xpath_condition(name: str, variable: str, value: Any) -> str:
+    """Составляет XPath-условие на атрибут в стиле фильтров BeautifulSoup."""
+    if value is True:
+        return f'[@{name}]'
+    if name == 'class':
+        return (
+            '[contains(concat(" ", normalize-space(@class), " "), '
+            f'concat(" ", ${variable}, " "))]'
+        )
+    return f'[@{name} = ${variable}]'
+
+
+def find_node(
+    tree: HtmlElement, tag: str, attrs: dict | None = None
+) -> HtmlElement:
+    """
+    Находит HTML элемент в дереве lxml с обязательной проверкой существования.
+
+    Аналог `find_tag` для дерева `lxml.html`: атрибуты фильтруются так же,
+    как в BeautifulSoup (значение True — атрибут присутствует, `class` —
+    совпадение с одним из классов элемента).
+
+    Args:
+        tree: Элемент, внутри которого выполняется поиск.
+        tag: Имя HTML тега для поиска.
+        attrs: Словарь атрибутов для фильтрации.
+
+    Returns:
+        HtmlElement: Первый найденный HTML элемент.
+
+    Raises:
+        ParserFindTagException: Если тег не найден.
+    """
+    variables = {}
+    conditions = []
+    for index, (name, value) in enumerate((attrs or {}).items()):
+        variable = f'v{index}'
+        if value is not True:
+            variables[variable] = value
+        conditions.append(_xpath_condition(name, variable, value))
+    nodes = tree.xpath(f'.//{tag}{"".join(conditions)}', **variables)
+    if not nodes:
+        error_msg = f'Не найден тег {tag} {attrs}'
+        raise ParserFindTagException(error_msg)
+    return nodes[0]
+
+
+def build_tree(
+    text: str, parser: str = PARSER_BS4
+) -> BeautifulSoup | HtmlElement:
+    """
+    Строит дерево HTML-документа выбранным движком.
+
+    Args:
+        text: HTML-код страницы.
+        parser: Движок разбора: 'bs4' (BeautifulSoup) или 'lxml'
+            (`lxml.html` без построения дерева BeautifulSoup).
+
+    Returns:
+        BeautifulSoup | HtmlElement: Корень дерева документа.
+    """
+    if parser == PARSER_LXML:
+        from lxml import html as lxml_html  # noqa: PLC0415
+
+        return lxml_html.document_fromstring(text)
+    from bs4 import BeautifulSoup  # noqa: PLC0415
+
+    return BeautifulSoup(text, 'lxml')
+
+
+@functools.cache
+def strainer(name: str, **attrs: str) -> SoupStrainer:
+    """
+    Возвращает область страницы для разбора в `get_soup`.
+
+    Объект создаётся при первом обращении и затем переиспользуется,
+    поэтому модули, описывающие области страниц, не импортируют bs4
+    при загрузке.
+
+    Args:
+        name: Имя HTML тега области.
+        **attrs: Атрибуты тега (как в SoupStrainer).
+
+    Returns:
+        SoupStrainer: Область страницы.
+    """
+    from bs4 import SoupStrainer  # noqa: PLC0415
+
+    return SoupStrainer(name, **attrs)
+
+
 def get_soup(
-    session: requests_cache.CachedSession, url: str, features: str = 'lxml'
+    session: requests_cache.CachedSession,
+    url: str,
+    features: str = 'lxml',
+    parse_only: SoupStrainer | None = None,
+    **kwargs,
 ) -> BeautifulSoup:
     """
     Создает объект BeautifulSoup из HTML-страницы по указанному URL.
 
+    Если передан `parse_only`, в дерево попадают только подходящие под него
+    элементы со всем содержимым, остальная страница пропускается. Это
+    сокращает время разбора и расход памяти на больших страницах. Если
+    к сессии подключён реестр страниц (`page_registry`), дерево строится
+    один раз за запуск и используется всеми, кто запрашивает страницу.
+
     Args:
         session: Сессия для выполнения HTTP-запроса.
         url: URL-адрес страницы для парсинга.
         features: Парсер, используемый BeautifulSoup (по умолчанию 'lxml').
+        parse_only: Область страницы, которую нужно разобрать.
+        **kwargs: Дополнительные аргументы запроса (например, expire_after).
 
     Returns:
         BeautifulSoup: Объект для парсинга HTML.
@@ -79,5 +401,128 @@ def get_soup(
     Raises:
         RequestErrorException: При ошибке HTTP-запроса.
     """
-    response = get_response(session, url)
-    return BeautifulSoup(response.text, features)
+    return _memoized(
+        session,
+        ('soup', url, features, parse_only, repr(sorted(kwargs.items()))),
+        lambda: _build_soup(session, url, features, parse_only, **kwargs),
+    )
+
+
+def _build_soup(
+    session: requests_cache.CachedSession,
+    url: str,
+    features: str,
+    parse_only: SoupStrainer | None,
+    **kwargs,
+) -> BeautifulSoup:
+    """Загружает страницу и строит её дерево BeautifulSoup."""
+    from bs4 import BeautifulSoup  # noqa: PLC0415
+
+    response = get_response(session, url, **kwargs)
+    profiler = getattr(session, 'profiler', None)
+    if profiler is None:
+        return BeautifulSoup(response.text, features, parse_only=parse_only)
+    with profiler.measure(PHASE_PARSE):
+        return BeautifulSoup(response.text, features, parse_only=parse_only)
+
+
+def _extract(
+    session: requests_cache.CachedSession,
+    response: requests_cache.Response,
+    extract: Callable[[Any], Any],
+    parser: str,
+) -> Any:
+    """
+    Строит дерево страницы и извлекает данные, замеряя обе фазы.
+
+    Если к сессии подключён пул процессов разбора (`parse_pool`), тело
+    ответа передаётся в пул, и дерево строится в другом процессе; в фазу
+    разбора тогда попадает вся обработка, включая передачу данных.
+    """
+    profiler = getattr(session, 'profiler', None)
+    parse_pool = getattr(session, 'parse_pool', None)
+    measure = profiler.measure if profiler is not None else _no_measure
+    try:
+        if parse_pool is not None:
+            with measure(PHASE_PARSE):
+                return parse_pool.extract(
+                    response.content, response.encoding, extract, parser
+                )
+        with measure(PHASE_PARSE):
+            tree = build_tree(response.text, parser)
+        with measure(PHASE_EXTRACT):
+            return extract(tree)
+    except ParserFindTagException:
+        if profiler is not None:
+            profiler.count(f'errors:{ParserFindTagException.__name__}')
+        raise
+
+
+def _no_measure(_phase: str) -> nullcontext:
+    """Заменяет `Profiler.measure`, если замеры не ведутся."""
+    return nullcontext()
+
+
+def get_parsed_page(
+    session: requests_cache.CachedSession,
+    url: str,
+    extract: Callable[[Any], Any],
+    parser: str = PARSER_BS4,
+    **kwargs,
+) -> Any:
+    """
+    Загружает страницу и извлекает из неё данные с кешированием результата.
+
+    Если к сессии подключён кеш результатов разбора (`result_cache`) и
+    версия страницы (ETag или хеш содержимого) не изменилась, результат
+    берётся из кеша без построения дерева документа. Если подключён пул
+    процессов разбора (`parse_pool`), дерево строится в нём. Если
+    подключён реестр страниц (`page_registry`), результат запоминается
+    до конца запуска.
+
+    Args:
+        session: Сессия для выполнения HTTP-запроса.
+        url: URL-адрес страницы.
+        extract: Функция, извлекающая данные из дерева документа.
+            Результат должен сериализоваться в JSON. Для пула процессов
+            функция должна быть определена на уровне модуля.
+        parser: Движок разбора, дерево которого получает `extract`.
+        **kwargs: Дополнительные аргументы запроса (например, expire_after).
+
+    Returns:
+        Any: Результат функции `extract`.
+
+    Raises:
+        RequestErrorException: При ошибке HTTP-запроса.
+        ParserFindTagException: Если на странице не найден нужный тег.
+    """
+    return _memoized(
+        session,
+        ('parsed', url, extract, parser, repr(sorted(kwargs.items()))),
+        lambda: _parse_page(session, url, extract, parser, **kwargs),
+    )
+
+
+def _parse_page(
+    session: requests_cache.CachedSession,
+    url: str,
+    extract: Callable[[Any], Any],
+    parser: str,
+    **kwargs,
+) -> Any:
+    """Загружает страницу и извлекает данные, используя кеш результатов."""
+    response = get_response(session, url, **kwargs)
+    profiler = getattr(session, 'profiler', None)
+    result_cache = getattr(session, 'result_cache', None)
+    if result_cache is None:
+        return _extract(session, response, extract, parser)
+
+    extractor = extractor_key(extract)
+    validator = response_validator(response)
+    result = result_cache.get(extractor, url, validator)
+    if result is None:
+        result = _extract(session, response, extract, parser)
+        result_cache.set(extractor, url, validator, result)
+    elif profiler is not None:
+        profiler.count('result_cache_hits')
+    return result
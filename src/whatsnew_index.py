@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from pathlib import PurePosixPath
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+from constants import WHATS_NEW_LOOKUP_HEADER
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+def version_from_link(link: str) -> str:
+    """
+    Возвращает номер версии Python по ссылке на страницу "What's New".
+
+    Args:
+        link: Ссылка вида https://docs.python.org/3/whatsnew/3.12.html.
+
+    Returns:
+        str: Номер версии (например, '3.12').
+    """
+    return PurePosixPath(urlparse(link).path).stem
+
+
+def version_key(version: str) -> tuple[int, ...]:
+    """Ключ сортировки номеров версий: '3.9' раньше '3.10'."""
+    return tuple(int(part) for part in version.split('.') if part.isdigit())
+
+
+def normalize_name(name: str) -> str:
+    """Приводит имя модуля или API к виду для поиска в указателе."""
+    return name.strip().removesuffix('()').lower()
+
+
+class WhatsNewIndex:
+    """
+    Межверсионный указатель по оглавлениям страниц "What's New".
+
+    Строится в памяти по уже загруженным страницам версий, поэтому
+    ответы на вопросы вида «в какой версии появился модуль X» не
+    требуют повторного обхода документации. Версия появления модуля —
+    самая ранняя версия, в разделе новых модулей которой он упомянут.
+    Имена сравниваются без учёта регистра и завершающих скобок вызова.
+    """
+
+    def __init__(self) -> None:
+        self.versions: dict[str, dict[str, list[str]]] = {}
+        self._introduced: dict[str, set[str]] = {}
+        self._deprecated: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.versions)
+
+    def add(
+        self,
+        version: str,
+        headings: Iterable[str],
+        new_modules: Iterable[str],
+        deprecated: Iterable[str],
+    ) -> None:
+        """
+        Добавляет в указатель оглавление страницы версии.
+
+        Args:
+            version: Номер версии Python.
+            headings: Заголовки разделов страницы.
+            new_modules: Новые модули версии.
+            deprecated: API, объявленные устаревшими в версии.
+        """
+        self.versions[version] = {
+            'headings': list(headings),
+            'new_modules': list(new_modules),
+            'deprecated': list(deprecated),
+        }
+        for name in self.versions[version]['new_modules']:
+            self._introduced.setdefault(normalize_name(name), set()).add(
+                version
+            )
+        for name in self.versions[version]['deprecated']:
+            self._deprecated.setdefault(normalize_name(name), set()).add(
+                version
+            )
+
+    def introduced_in(self, name: str) -> str | None:
+        """
+        Возвращает версию, в которой появился модуль.
+
+        Args:
+            name: Имя модуля.
+
+        Returns:
+            str | None: Номер версии или None, если модуль не найден
+            среди новых модулей загруженных версий.
+        """
+        versions = self._introduced.get(normalize_name(name))
+        if not versions:
+            return None
+        return min(versions, key=version_key)
+
+    def deprecated_in(self, name: str) -> list[str]:
+        """
+        Возвращает версии, в которых API упомянут как устаревший.
+
+        Args:
+            name: Имя модуля или API.
+
+        Returns:
+            list: Номера версий по возрастанию.
+        """
+        versions = self._deprecated.get(normalize_name(name), ())
+        return sorted(versions, key=version_key)
+
+    def lookup(self, names: Iterable[str]) -> list[tuple]:
+        """
+        Отвечает на вопросы о версиях появления и устаревания имён.
+
+        Args:
+            names: Имена модулей или API.
+
+        Returns:
+            list: Строки (имя, версия появления, версии устаревания)
+            с заголовками.
+        """
+        return [
+            WHATS_NEW_LOOKUP_HEADER,
+            *(
+                (
+                    name,
+                    self.introduced_in(name) or '',
+                    ', '.join(self.deprecated_in(name)),
+                )
+                for name in names
+            ),
+        ]
@@ -16,6 +16,16 @@ sys.path.append(str(SRC_DIR))
 
 MAIN_DOC_URL = 'https://docs.python.org/3/'
 PEP_URL = 'https://www.python.org/dev/peps/'
+PEPS_URL = 'https://peps.python.org/'
+
+PEP_ROWS = [
+    ('PF', 1, 'Final'),
+    ('IA', 2, 'Active'),
+    ('SR', 3, 'Rejected'),
+    ('S', 4, 'Draft'),
+    ('SF', 5, 'Withdrawn'),
+    ('PA', 6, 'Broken'),
+]
 
 
 precode_files = ['constants.py', 'main.py', 'utils.py']
@@ -110,3 +120,36 @@ def records():
         result = results[mode]
         return converting(result)
     return _records
+
+
+def pep_index_html(rows) -> str:
+    body = ''.join(
+        f'<tr><td><abbr>{abbr}</abbr></td>'
+        f'<td><a href="pep-{number:04d}/">{number}</a></td></tr>'
+        for abbr, number, _ in rows
+    )
+    return (
+        '<table class="docutils"><thead><tr><th>S</th><th>PEP</th></tr>'
+        f'</thead><tbody><tr></tr>{body}</tbody></table>'
+    )
+
+
+def pep_page_html(status: str) -> str:
+    if status == 'Broken':
+        return '<section id="pep-content"></section>'
+    return (
+        '<section id="pep-content"><dl class="field-list">'
+        f'<dt>Author</dt><dd>Guido</dd><dt>Status</dt><dd>{status}</dd>'
+        '</dl></section>'
+    )
+
+
+@pytest.fixture
+def pep_mocker():
+    with requests_mock.Mocker() as mock:
+        mock.get(PEPS_URL + 'numerical', text=pep_index_html(PEP_ROWS))
+        for _, number, status in PEP_ROWS:
+            mock.get(
+                f'{PEPS_URL}pep-{number:04d}/', text=pep_page_html(status)
+            )
+        yield mock
@@ -0,0 +1,73 @@
+import gzip
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+try:
+    from src import api
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `api.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `api.py`'
+
+PEP_RESULTS = [
+    ('Статус', 'Количество'),
+    ('Active', 1),
+    ('Final', 2),
+    ('Total', 3),
+]
+
+
+@pytest.fixture
+def server():
+    store = api.ResultStore()
+    store.update('pep', PEP_RESULTS)
+    server = api.ApiServer(store, port=0).start()
+    yield server
+    server.stop()
+
+
+def fetch(server, path, **headers):
+    request = urllib.request.Request(
+        f'http://127.0.0.1:{server.port}{path}', headers=headers
+    )
+    with urllib.request.urlopen(request) as response:
+        return response.read(), response.headers
+
+
+def test_results(server):
+    body, headers = fetch(server, '/results/pep')
+    document = json.loads(body)
+    assert document['columns'] == ['status', 'count']
+    assert document['rows'][1] == {'status': 'Final', 'count': 2}, (
+        'API должен отдавать строки результатов режима'
+    )
+    assert headers['Content-Type'] == api.CONTENT_TYPE
+
+    index, _ = fetch(server, '/')
+    assert list(json.loads(index)['modes']) == ['pep']
+
+
+def test_results_gzip_and_etag(server):
+    body, headers = fetch(server, '/results/pep')
+    gzipped, gzip_headers = fetch(
+        server, '/results/pep', **{'Accept-Encoding': 'gzip'}
+    )
+    assert gzip_headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(gzipped) == body, (
+        'API должен сжимать ответ, если клиент поддерживает gzip'
+    )
+
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        fetch(server, '/results/pep', **{'If-None-Match': headers['ETag']})
+    assert excinfo.value.code == 304, (
+        'API должен отвечать 304 на запрос с актуальным ETag'
+    )
+
+
+def test_unknown_mode(server):
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        fetch(server, '/results/whats-new')
+    assert excinfo.value.code == 404
@@ -0,0 +1,125 @@
+import pytest
+import requests_mock
+
+from conftest import PEPS_URL
+try:
+    from src import archive, utils
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `archive.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `archive.py`'
+
+
+def mount(session, adapter):
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def test_record_and_replay(tmp_path):
+    server = requests_mock.Adapter()
+    server.register_uri(
+        'GET', PEPS_URL, text='<h1>PEP 0</h1>', headers={'ETag': '"v1"'}
+    )
+    server.register_uri(
+        'HEAD', PEPS_URL + 'archive.zip', headers={'ETag': '"a1"'}
+    )
+    recorder = mount(
+        utils.create_session(result_cache_path=None, backend='memory'),
+        archive.RecordingAdapter(archive.ExchangeArchive(tmp_path), server),
+    )
+    utils.get_response(recorder, PEPS_URL)
+    utils.get_response(recorder, PEPS_URL + 'archive.zip', method='HEAD')
+
+    player = mount(
+        utils.create_session(result_cache_path=None, backend='memory'),
+        archive.ReplayAdapter(archive.ExchangeArchive(tmp_path)),
+    )
+    response = utils.get_response(player, PEPS_URL)
+    assert response.text == '<h1>PEP 0</h1>', (
+        'Адаптер `ReplayAdapter` должен возвращать записанное тело ответа'
+    )
+    assert response.headers['ETag'] == '"v1"', (
+        'Адаптер `ReplayAdapter` должен возвращать записанные заголовки'
+    )
+    head = utils.get_response(
+        player, PEPS_URL + 'archive.zip', method='HEAD'
+    )
+    assert head.headers['ETag'] == '"a1"'
+
+    with pytest.raises(BaseException) as excinfo:
+        utils.get_response(player, PEPS_URL + 'missing/')
+    assert excinfo.typename == 'RequestErrorException', (
+        'Запрос, которого нет в архиве, не должен уходить в сеть и должен '
+        'завершаться `RequestErrorException`'
+    )
+
+
+def test_archive_deduplicates_bodies(tmp_path):
+    server = requests_mock.Adapter()
+    server.register_uri(requests_mock.ANY, requests_mock.ANY, text='same')
+    recorder = mount(
+        utils.create_session(result_cache_path=None, backend='memory'),
+        archive.RecordingAdapter(archive.ExchangeArchive(tmp_path), server),
+    )
+    for number in range(3):
+        utils.get_response(recorder, f'{PEPS_URL}pep-{number:04d}/')
+
+    assert len(archive.ExchangeArchive(tmp_path)) == 3
+    assert len(list((tmp_path / 'objects').rglob('*.gz'))) == 1, (
+        'Одинаковые тела ответов должны храниться в архиве один раз'
+    )
+
+
+def test_archive_streams_bodies_and_keeps_ranges(tmp_path):
+    body = b'0123456789' * 1000
+    url = PEPS_URL + 'archive.zip'
+
+    def serve(request, context):
+        requested = request.headers.get('Range')
+        if requested:
+            context.status_code = 206
+            return body[int(requested.split('=')[1].rstrip('-')):]
+        return body
+
+    server = requests_mock.Adapter()
+    server.register_uri('HEAD', url, headers={'ETag': '"a1"'})
+    server.register_uri('GET', url, content=serve)
+    recorder = mount(
+        utils.create_session(result_cache_path=None, backend='memory'),
+        archive.RecordingAdapter(archive.ExchangeArchive(tmp_path), server),
+    )
+    utils.get_response(recorder, url, method='HEAD')
+    no_store = {'Cache-Control': 'no-store'}
+    for headers in (no_store, {**no_store, 'Range': 'bytes=9000-'}):
+        with utils.get_response(
+            recorder, url, stream=True, headers=headers
+        ) as response:
+            b''.join(response.iter_content(chunk_size=256))
+
+    player = mount(
+        utils.create_session(result_cache_path=None, backend='memory'),
+        archive.ReplayAdapter(archive.ExchangeArchive.load(tmp_path)),
+    )
+    full = utils.get_response(player, url, stream=True, headers=no_store)
+    resumed = utils.get_response(
+        player, url, stream=True, headers={**no_store, 'Range': 'bytes=9000-'}
+    )
+    assert full.content == body and resumed.content == body[9000:], (
+        'Потоковые ответы и докачка с Range должны записываться '
+        'и воспроизводиться отдельно'
+    )
+    assert resumed.status_code == 206
+    assert utils.get_response(player, url, method='HEAD').headers[
+        'ETag'
+    ] == '"a1"'
+    assert not list((tmp_path / 'objects').glob('*.tmp')), (
+        'После записи не должно оставаться временных файлов'
+    )
+
+
+def test_load_missing_archive(tmp_path):
+    with pytest.raises(archive.ExchangeArchiveException):
+        archive.ExchangeArchive.load(tmp_path / 'missing')
+    with pytest.raises(archive.ExchangeArchiveException):
+        archive.ExchangeArchive.load(tmp_path)
@@ -0,0 +1,36 @@
+import asyncio
+
+import requests
+import requests_mock
+
+from conftest import MAIN_DOC_URL, PEPS_URL
+try:
+    from src import async_utils
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `async_utils.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `async_utils.py`'
+
+
+def test_get_response_async(mock_session):
+    async def fetch_all():
+        async with async_utils.AsyncSession(mock_session, 2) as client:
+            responses = await asyncio.gather(
+                async_utils.get_response_async(client, MAIN_DOC_URL),
+                async_utils.get_response_async(client, PEPS_URL),
+            )
+            return responses, sorted(client._executors)
+
+    with requests_mock.Mocker() as mock:
+        mock.get(MAIN_DOC_URL, text='docs')
+        mock.get(PEPS_URL, text='peps')
+        responses, hosts = asyncio.run(fetch_all())
+
+    assert all(isinstance(r, requests.Response) for r in responses)
+    assert [r.text for r in responses] == ['docs', 'peps'], (
+        'Функция `get_response_async` должна возвращать ответы '
+        'в порядке запросов'
+    )
+    assert hosts == ['docs.python.org', 'peps.python.org'], (
+        'Для каждого хоста должен создаваться отдельный пул потоков'
+    )
@@ -0,0 +1,34 @@
+try:
+    from src import checkpoint
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `checkpoint.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `checkpoint.py`'
+
+
+def test_checkpoint_round_trip(tmp_path):
+    path = tmp_path / 'checkpoint.json'
+    saved = checkpoint.PepCheckpoint(path, every=2)
+    saved.add(['PF', '1'], ('pep-0001/', 'F', 'Final'))
+    assert not path.exists(), (
+        'Контрольная точка не должна сохраняться после каждой строки'
+    )
+    error_class = checkpoint.exceptions.ParserFindTagException
+    saved.add(['PA', '6'], error_class('Не найден'))
+    assert path.exists()
+
+    loaded = checkpoint.PepCheckpoint.load(path)
+    assert loaded.restore(['PF', '1']) == (
+        True, ('pep-0001/', 'F', 'Final')
+    )
+    restored, error = loaded.restore(['PA', '6'])
+    assert restored and isinstance(error, error_class), (
+        'Ошибки строк должны восстанавливаться с исходным классом'
+    )
+    assert str(error) == 'Не найден'
+    assert loaded.restore(['PF', '1', 'changed']) == (False, None), (
+        'Изменившаяся строка таблицы должна обрабатываться заново'
+    )
+
+    loaded.remove()
+    assert not path.exists()
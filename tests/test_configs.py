@@ -29,7 +29,7 @@ def test_configs_file():
     ),
     (
         argparse._StoreAction, ['-o', '--output'], 'output',
-        ('pretty', 'file'),
+        ('pretty', 'file', 'jsonl', 'sqlite', 'parquet'),
         'Дополнительные способы вывода данных'
     ),
 ])
@@ -64,3 +64,24 @@ def test_configure_argument_parser(
     assert got_action.help == help_str, (
         f'Укажите help-строку cli аргумента {got_action.dest}'
     )
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('zip', ('zip',)),
+    ('zip,tar.bz2', ('zip', 'tar.bz2')),
+    ('zip, ,tar.bz2', ('zip', 'tar.bz2')),
+    (' zip , ', ('zip',)),
+])
+def test_comma_separated(value, expected):
+    parse = configs.comma_separated(('zip', 'tar.bz2'))
+    assert parse(value) == expected, (
+        'Пустые элементы списка через запятую должны отбрасываться '
+        'после удаления пробелов'
+    )
+
+
+@pytest.mark.parametrize('value', ['', ' , ', 'zip,rar'])
+def test_comma_separated_invalid(value):
+    parse = configs.comma_separated(('zip', 'tar.bz2'))
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse(value)
@@ -0,0 +1,99 @@
+import json
+
+import requests_mock
+
+try:
+    from src import downloader
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `downloader.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `downloader.py`'
+
+ARCHIVE_URL = 'https://docs.python.org/3/archives/python-docs-pdf-a4.zip'
+ARCHIVE = b'0123456789' * 100
+HEADERS = {'ETag': '"v1"', 'Content-Length': str(len(ARCHIVE))}
+
+
+def serve_archive(request, context):
+    requested = request.headers.get('Range')
+    if requested and request.headers.get('If-Range') == HEADERS['ETag']:
+        offset = int(requested.split('=')[1].rstrip('-'))
+        context.status_code = 206
+        return ARCHIVE[offset:]
+    return ARCHIVE
+
+
+def register_archive(mock):
+    mock.head(ARCHIVE_URL, headers=HEADERS)
+    return mock.get(ARCHIVE_URL, headers=HEADERS, content=serve_archive)
+
+
+def test_download_file_and_skip_unchanged(mock_session, tmp_path):
+    path = tmp_path / 'python-docs-pdf-a4.zip'
+    with requests_mock.Mocker() as mock:
+        archive = register_archive(mock)
+        first = downloader.download_file(
+            mock_session, ARCHIVE_URL, path, chunk_size=64
+        )
+        second = downloader.download_file(mock_session, ARCHIVE_URL, path)
+
+    assert first is True and path.read_bytes() == ARCHIVE, (
+        'Функция `download_file` должна сохранять архив целиком'
+    )
+    assert not (tmp_path / 'python-docs-pdf-a4.zip.part').exists()
+    assert second is False and archive.call_count == 1, (
+        'Неизменившийся на сервере архив не должен скачиваться повторно'
+    )
+
+
+def test_download_file_resumes_partial(mock_session, tmp_path):
+    path = tmp_path / 'python-docs-pdf-a4.zip'
+    part_path = tmp_path / 'python-docs-pdf-a4.zip.part'
+    part_path.write_bytes(ARCHIVE[:300])
+    (tmp_path / 'python-docs-pdf-a4.zip.part.meta.json').write_text(
+        json.dumps({'ETag': '"v1"', 'Last-Modified': None, 'size': 1000})
+    )
+    with requests_mock.Mocker() as mock:
+        archive = register_archive(mock)
+        downloader.download_file(mock_session, ARCHIVE_URL, path)
+
+    assert archive.last_request.headers['Range'] == 'bytes=300-', (
+        'Прерванная загрузка должна продолжаться с места остановки'
+    )
+    assert path.read_bytes() == ARCHIVE
+
+
+def test_download_file_restarts_stale_partial(mock_session, tmp_path):
+    path = tmp_path / 'python-docs-pdf-a4.zip'
+    part_path = tmp_path / 'python-docs-pdf-a4.zip.part'
+    part_path.write_bytes(b'stale' * 100)
+    (tmp_path / 'python-docs-pdf-a4.zip.part.meta.json').write_text(
+        json.dumps({'ETag': '"v1"', 'Last-Modified': None, 'size': None})
+    )
+
+    def reject_range(request, context):
+        if request.headers.get('Range'):
+            context.status_code = 416
+            return b''
+        return ARCHIVE
+
+    with requests_mock.Mocker() as mock:
+        mock.head(ARCHIVE_URL, headers={'ETag': '"v1"'})
+        archive = mock.get(ARCHIVE_URL, content=reject_range)
+        assert downloader.download_file(mock_session, ARCHIVE_URL, path)
+
+    assert archive.call_count == 2 and path.read_bytes() == ARCHIVE, (
+        'При отклонённой докачке (416) архив должен загружаться заново'
+    )
+    assert not part_path.exists()
+
+
+def test_download_file_bypasses_html_cache(mock_session, tmp_path):
+    with requests_mock.Mocker() as mock:
+        register_archive(mock)
+        downloader.download_file(
+            mock_session, ARCHIVE_URL, tmp_path / 'archive.zip'
+        )
+    assert not list(mock_session.cache.responses.keys()), (
+        'Архивы не должны сохраняться в кеш HTML-страниц'
+    )
@@ -0,0 +1,71 @@
+import pytest
+
+from conftest import PEPS_URL
+try:
+    from src import history
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `history.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `history.py`'
+
+
+def test_pep_history_changes_and_counts():
+    store = history.PepHistory(':memory:')
+    first = store.record_run([
+        (f'{PEPS_URL}pep-0001/', 'P', 'Active'),
+        (f'{PEPS_URL}pep-0002/', 'S', 'Draft'),
+        (f'{PEPS_URL}pep-0003/', 'S', 'Draft'),
+    ])
+    second = store.record_run([
+        (f'{PEPS_URL}pep-0001/', 'P', 'Active'),
+        (f'{PEPS_URL}pep-0002/', 'S', 'Final'),
+        (f'{PEPS_URL}pep-0004/', 'S', 'Draft'),
+    ])
+
+    assert store.changes(first, second) == [
+        (f'{PEPS_URL}pep-0002/', 'Draft', 'Final'),
+        (f'{PEPS_URL}pep-0003/', 'Draft', None),
+        (f'{PEPS_URL}pep-0004/', None, 'Draft'),
+    ], (
+        'Метод `changes` должен находить изменившиеся, пропавшие '
+        'и новые PEP между двумя запусками'
+    )
+    counts = [
+        (run_id, status, count)
+        for run_id, _, status, count in store.status_counts()
+    ]
+    assert counts == [
+        (first, 'Active', 1),
+        (first, 'Draft', 2),
+        (second, 'Active', 1),
+        (second, 'Draft', 1),
+        (second, 'Final', 1),
+    ], 'Метод `status_counts` должен считать статусы в каждом запуске'
+
+    with pytest.raises(history.PepHistoryException):
+        store.changes(first, 100)
+
+
+def test_pep_history_failed_peps_are_not_disappeared():
+    store = history.PepHistory(':memory:')
+    first = store.record_run([
+        (f'{PEPS_URL}pep-0001/', 'P', 'Active'),
+        (f'{PEPS_URL}pep-0002/', 'S', 'Draft'),
+    ])
+    second = store.record_run(
+        [(f'{PEPS_URL}pep-0001/', 'P', 'Active')],
+        [f'{PEPS_URL}pep-0002/'],
+    )
+    third = store.record_run([
+        (f'{PEPS_URL}pep-0001/', 'P', 'Active'),
+        (f'{PEPS_URL}pep-0002/', 'S', 'Draft'),
+    ])
+
+    assert store.changes(first, second) == [], (
+        'PEP, страницу которого не удалось обработать, '
+        'не должен считаться пропавшим'
+    )
+    assert store.changes(second, third) == [], (
+        'PEP, страницу которого не удалось обработать в прошлом запуске, '
+        'не должен считаться новым'
+    )
@@ -1,5 +1,16 @@
+import argparse
+import hashlib
+import socket
+import subprocess
+import sys
+
 import pytest
+import requests_mock
 from pathlib import Path
+
+from conftest import (
+    MAIN_DOC_URL, PEP_ROWS, PEPS_URL, pep_index_html, pep_page_html
+)
 try:
     from src import main
 except ModuleNotFoundError:
@@ -8,6 +19,14 @@ except ImportError:
     assert False, 'Убедитесь что в директории `src` есть файл `main.py`'
 
 
+@pytest.fixture(autouse=True)
+def pep_history_path(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, 'PEP_HISTORY_PATH', tmp_path / 'history.db')
+    monkeypatch.setattr(
+        main, 'PEP_CHECKPOINT_PATH', tmp_path / 'checkpoint.json'
+    )
+
+
 def test_main_file():
     assert hasattr(main, 'whats_new'), (
         'Добавьте функцию `whats_new` в модуль `main.py`.'
@@ -51,6 +70,318 @@ def test_whats_new(mock_session):
     )
 
 
+def test_iter_whats_new_streams_rows(mock_session):
+    index = (
+        '<section id="what-s-new-in-python">'
+        '<div class="toctree-wrapper"><ul>'
+        '<li class="toctree-l1"><a href="3.12.html">3.12</a></li>'
+        '<li class="toctree-l1"><a href="3.11.html">3.11</a></li>'
+        '</ul></div></section>'
+    )
+    with requests_mock.Mocker() as mock:
+        mock.get(MAIN_DOC_URL + 'whatsnew/', text=index)
+        for version in ('3.12', '3.11'):
+            mock.get(
+                f'{MAIN_DOC_URL}whatsnew/{version}.html',
+                text=f'<h1>Python {version}</h1><dl><dt>Editor</dt></dl>',
+            )
+        rows = main.iter_whats_new(mock_session)
+        assert next(rows) == main.WHATS_NEW_HEADER and not mock.called, (
+            'Функция `iter_whats_new` должна выдавать заголовки до загрузки '
+            'страниц'
+        )
+        assert next(rows)[1] == 'Python 3.12' and mock.call_count == 2, (
+            'Функция `iter_whats_new` должна выдавать строку сразу после '
+            'разбора страницы версии'
+        )
+        assert [row[1] for row in rows] == ['Python 3.11']
+
+
+def whats_new_version_html(version: str, module: str, api: str) -> str:
+    return (
+        f'<h1>What\'s New In Python {version}</h1>'
+        '<dl><dt>Editor</dt><dd>Guido</dd></dl>'
+        '<section id="new-modules"><h2>New Modules<a class="headerlink" '
+        'href="#new-modules">¶</a></h2><ul><li><a class="reference '
+        f'internal" href="../library/{module}.html#module-{module}">'
+        f'<code class="xref py py-mod">{module}</code></a></li></ul>'
+        '</section><section id="deprecated"><h2>Deprecated</h2><p>'
+        f'<code class="xref py py-func">{api}</code></p></section>'
+    )
+
+
+@pytest.fixture
+def whats_new_mocker():
+    index = (
+        '<section id="what-s-new-in-python">'
+        '<div class="toctree-wrapper"><ul>'
+        '<li class="toctree-l1"><a href="3.12.html">3.12</a></li>'
+        '<li class="toctree-l1"><a href="3.11.html">3.11</a></li>'
+        '<li class="toctree-l1"><a href="3.10.html">3.10</a></li>'
+        '</ul></div></section>'
+    )
+    pages = {
+        '3.12': ('pathlib', 'asyncio.get_event_loop()'),
+        '3.11': ('tomllib', 'asyncio.get_event_loop()'),
+        '3.10': ('tomllib', 'distutils'),
+    }
+    with requests_mock.Mocker() as mock:
+        mock.get(MAIN_DOC_URL + 'whatsnew/', text=index)
+        for version, (module, api) in pages.items():
+            mock.get(
+                f'{MAIN_DOC_URL}whatsnew/{version}.html',
+                text=whats_new_version_html(version, module, api),
+            )
+        yield mock
+
+
+@pytest.mark.parametrize('mode_function', ['whats_new', 'whats_new_async'])
+@pytest.mark.parametrize('parser', ['bs4', 'lxml'])
+def test_whats_new_sections(
+    mock_session, whats_new_mocker, mode_function, parser
+):
+    got = getattr(main, mode_function)(
+        mock_session, workers=3, parser=parser, sections=True
+    )
+    assert got[0] == main.WHATS_NEW_SECTIONS_HEADER
+    assert [row[0].rsplit('/', 1)[-1] for row in got[1:]] == [
+        '3.12.html', '3.11.html', '3.10.html'
+    ], 'Строки версий должны выводиться в порядке страницы "What\'s New"'
+    assert got[2][3:] == (
+        'New Modules; Deprecated', 'tomllib', 'asyncio.get_event_loop()'
+    ), (
+        'Оглавление версии должно содержать разделы, новые модули '
+        'и устаревшие API'
+    )
+
+
+def test_whats_new_introduced(mock_session, whats_new_mocker):
+    got = main.whats_new(
+        mock_session, workers=2, introduced=['tomllib', 'asyncio.get_event_loop']
+    )
+    assert got[1:] == [
+        ('tomllib', '3.10', ''),
+        ('asyncio.get_event_loop', '', '3.11, 3.12'),
+    ], (
+        'Функция `whats_new` должна отвечать на вопросы по межверсионному '
+        'указателю'
+    )
+
+
+@pytest.mark.parametrize('mode_function, workers, parser', [
+    ('pep', 1, 'bs4'),
+    ('pep', 4, 'bs4'),
+    ('pep_async', 4, 'bs4'),
+    ('pep', 4, 'lxml'),
+    ('pep_async', 4, 'lxml'),
+])
+def test_pep(
+    mock_session, pep_mocker, caplog, mode_function, workers, parser
+):
+    got = getattr(main, mode_function)(
+        mock_session, workers=workers, parser=parser
+    )
+    assert got == [
+        ('Статус', 'Количество'),
+        ('Active', 1),
+        ('Draft', 1),
+        ('Final', 1),
+        ('Rejected', 1),
+        ('Withdrawn', 1),
+        ('Total', 5),
+    ], (
+        'Функция `pep` должна подсчитывать статусы PEP независимо '
+        'от количества потоков и движка разбора'
+    )
+    warnings = [r.message for r in caplog.records if r.levelname == 'WARNING']
+    assert len(warnings) == 1 and 'pep-0005' in warnings[0], (
+        'Функция `pep` должна логировать несовпадения статусов'
+    )
+    errors = [r.message for r in caplog.records if r.levelname == 'ERROR']
+    assert len(errors) == 1, (
+        'Функция `pep` должна логировать ошибки разбора страниц PEP'
+    )
+
+
+def test_run_modes(mock_session, pep_mocker, capsys):
+    args = argparse.Namespace(
+        mode=['whats-new', 'pep', 'pep'], output=None, use_async=False
+    )
+    with pytest.raises(main.ParserBaseException, match='whats-new'):
+        main.run_modes(mock_session, args)
+
+    assert 'Total 5' in capsys.readouterr().out, (
+        'Ошибка одного режима не должна прерывать остальные'
+    )
+    pep_requests = [
+        request for request in pep_mocker.request_history
+        if request.url.startswith(PEPS_URL)
+    ]
+    assert len(pep_requests) == 1 + len(PEP_ROWS), (
+        'Каждая страница должна загружаться один раз за запуск'
+    )
+
+
+def test_watch(mock_session, pep_mocker, capsys):
+    args = argparse.Namespace(
+        mode=['pep'],
+        output=None,
+        use_async=False,
+        watch=0,
+        cycles=2,
+        metrics_file=None,
+    )
+    assert main.watch(mock_session, args) == 2
+    assert capsys.readouterr().out.count('Total 5') == 2, (
+        'Режим наблюдения должен выводить результаты в каждом цикле'
+    )
+    assert pep_mocker.call_count == 1 + len(PEP_ROWS), (
+        'Повторный цикл должен брать неизменившиеся страницы из кеша'
+    )
+
+    stop = main.threading.Event()
+    stop.set()
+    args.cycles = None
+    assert main.watch(mock_session, args, stop=stop) == 0
+
+
+def test_main_setup_error(monkeypatch, caplog):
+    monkeypatch.setattr(main, 'configure_logging', lambda: None)
+    with socket.socket() as busy:
+        busy.bind(('127.0.0.1', 0))
+        busy.listen()
+        port = busy.getsockname()[1]
+        monkeypatch.setattr(
+            sys, 'argv', ['main.py', 'pep-history', '--serve', str(port)]
+        )
+        main.main()
+
+    errors = [r for r in caplog.records if r.levelname == 'ERROR']
+    assert errors and 'pep-history' in errors[0].getMessage(), (
+        'Ошибка подготовки запуска (например, занятый порт) должна '
+        'логироваться с именем режима'
+    )
+
+
+@pytest.mark.parametrize('mode_function', ['pep', 'pep_async'])
+def test_pep_parse_pool(mock_session, pep_mocker, mode_function):
+    mock_session.parse_pool = main.ParsePool(2)
+    try:
+        got = getattr(main, mode_function)(mock_session, workers=1)
+    finally:
+        mock_session.parse_pool.close()
+    assert got[-1] == ('Total', 5), (
+        'Функция `pep` должна подсчитывать статусы PEP при разборе '
+        'страниц в пуле процессов'
+    )
+
+
+@pytest.mark.parametrize('mode_function', ['pep', 'pep_async'])
+def test_pep_incremental(
+    monkeypatch, tmp_path, mock_session, pep_mocker, mode_function
+):
+    monkeypatch.setattr(main, 'PEP_SNAPSHOT_PATH', tmp_path / 'pep.json')
+    pep = getattr(main, mode_function)
+
+    with mock_session.cache_disabled():
+        full = pep(mock_session, incremental=True, verify_sample=0)
+        pages_after_full = pep_mocker.call_count
+        again = pep(mock_session, incremental=True, verify_sample=0)
+
+    assert again == full, (
+        'Инкрементальный запуск должен давать те же итоги, что и полный'
+    )
+    assert pep_mocker.call_count - pages_after_full == 2, (
+        'В инкрементальном режиме для неизменившихся строк таблицы '
+        'страницы PEP не должны загружаться повторно'
+    )
+
+
+def test_pep_history(mock_session, pep_mocker):
+    main.pep(mock_session)
+    pep_mocker.get(f'{PEPS_URL}pep-0004/', text=pep_page_html('Final'))
+    with mock_session.cache_disabled():
+        main.pep(mock_session)
+
+    assert main.pep_history(mock_session, diff=(1, 2))[1:] == [
+        (f'{PEPS_URL}pep-0004/', 'Draft', 'Final'),
+    ], 'Режим `pep-history` должен находить PEP, статус которых изменился'
+    counts = main.pep_history(mock_session)
+    assert ('Final', 2) in [(status, n) for run, _, status, n in counts[1:]], (
+        'Режим `pep-history` должен считать статусы PEP в каждом запуске'
+    )
+
+
+def test_pep_resume(mock_session, pep_mocker):
+    with mock_session.cache_disabled():
+        expected = main.pep(mock_session)
+        pep_mocker.get(f'{PEPS_URL}pep-0002/', status_code=503)
+        pep_mocker.get(f'{PEPS_URL}pep-0004/', exc=main.CircuitOpenException)
+        with pytest.raises(main.CircuitOpenException):
+            main.pep(mock_session, workers=1)
+        assert main.PEP_CHECKPOINT_PATH.exists(), (
+            'При прерывании запуска должна сохраняться контрольная точка'
+        )
+
+        pep_mocker.get(f'{PEPS_URL}pep-0002/', text=pep_page_html('Active'))
+        pep_mocker.get(f'{PEPS_URL}pep-0004/', text=pep_page_html('Draft'))
+        before = pep_mocker.call_count
+        resumed = main.pep(mock_session, resume=True)
+        fetched = [
+            request.url for request in pep_mocker.request_history[before:]
+        ]
+
+    assert resumed == expected, (
+        'Продолженный запуск должен давать тот же итог, что и непрерывный'
+    )
+    assert f'{PEPS_URL}pep-0004/' in fetched and not any(
+        f'{PEPS_URL}pep-{number:04d}/' in fetched for number in (1, 3)
+    ), 'С `resume` должны загружаться только необработанные строки'
+    assert f'{PEPS_URL}pep-0002/' in fetched, (
+        'С `resume` строки с временной ошибкой загрузки должны '
+        'загружаться повторно'
+    )
+    assert not main.PEP_CHECKPOINT_PATH.exists(), (
+        'После успешного запуска контрольная точка должна удаляться'
+    )
+
+
+def test_pep_interrupt(mock_session, pep_mocker):
+    pep_mocker.get(f'{PEPS_URL}pep-0002/', exc=KeyboardInterrupt)
+    with mock_session.cache_disabled(), pytest.raises(KeyboardInterrupt):
+        main.pep(mock_session, workers=1)
+
+    fetched = [request.url for request in pep_mocker.request_history]
+    assert not any(
+        f'{PEPS_URL}pep-{number:04d}/' in fetched for number in (3, 4, 5, 6)
+    ), 'После прерывания оставшиеся строки таблицы не должны загружаться'
+    assert main.PEP_CHECKPOINT_PATH.exists(), (
+        'При прерывании запуска должна сохраняться контрольная точка'
+    )
+
+
+def test_pep_replay(tmp_path):
+    server = requests_mock.Adapter()
+    server.register_uri(
+        'GET', PEPS_URL + 'numerical', text=pep_index_html(PEP_ROWS)
+    )
+    for _, number, status in PEP_ROWS:
+        server.register_uri(
+            'GET', f'{PEPS_URL}pep-{number:04d}/', text=pep_page_html(status)
+        )
+    args = argparse.Namespace(workers=1, record=tmp_path, replay=None)
+    session = main.create_crawl_session(args)
+    session.get_adapter(PEPS_URL).adapter = server
+    recorded = main.pep(session)
+
+    args = argparse.Namespace(workers=1, record=None, replay=tmp_path)
+    replayed = main.pep(main.create_crawl_session(args))
+    assert replayed == recorded and recorded[-1] == ('Total', 5), (
+        'Запуск с `--replay` должен давать те же результаты без обращения '
+        'к сети'
+    )
+
+
 @pytest.mark.skip()
 def test_latest_versions(mock_session):
     got = main.latest_versions(mock_session)
@@ -115,6 +446,51 @@ def test_download(monkeypatch, tmp_path, mock_session):
     )
 
 
+DOWNLOAD_PAGE = (
+    '<div role="main"><table class="docutils">'
+    '<tr><td><a href="archives/python-docs-pdf-a4.zip">zip</a></td>'
+    '<td><a href="archives/python-docs-pdf-a4.tar.bz2">bz2</a></td></tr>'
+    '<tr><td><a href="archives/python-docs-html.zip">zip</a></td>'
+    '<td><a href="archives/python-docs-html.tar.bz2">bz2</a></td></tr>'
+    '<tr><td><a href="archives/python-docs.epub">epub</a></td></tr>'
+    '</table></div>'
+)
+
+
+def test_download_formats(monkeypatch, tmp_path, mock_session):
+    monkeypatch.setattr(main, 'DOWNLOADS_DIR', tmp_path)
+    with requests_mock.Mocker() as mock:
+        mock.head(requests_mock.ANY, headers={'ETag': '"v1"'})
+        mock.get(requests_mock.ANY, content=b'archive')
+        mock.get(MAIN_DOC_URL + 'download.html', text=DOWNLOAD_PAGE)
+        main.download(
+            mock_session,
+            workers=3,
+            formats=('html', 'epub'),
+            compression=('zip', 'bz2'),
+        )
+
+    files = sorted(path.name for path in tmp_path.iterdir())
+    assert files == [
+        'python-docs-html.tar.bz2',
+        'python-docs-html.tar.bz2.meta.json',
+        'python-docs-html.tar.bz2.sha256',
+        'python-docs-html.zip',
+        'python-docs-html.zip.meta.json',
+        'python-docs-html.zip.sha256',
+        'python-docs.epub',
+        'python-docs.epub.meta.json',
+        'python-docs.epub.sha256',
+    ], (
+        'Функция `download` должна скачивать все выбранные архивы '
+        'и сохранять их контрольные суммы'
+    )
+    checksum = (tmp_path / 'python-docs.epub.sha256').read_text()
+    assert checksum == (
+        f'{hashlib.sha256(b"archive").hexdigest()}  python-docs.epub\n'
+    )
+
+
 def test_mode_to_function():
     got = main.MODE_TO_FUNCTION
     assert isinstance(got, dict), (
@@ -143,3 +519,35 @@ def test_mode_to_function():
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет значения {func}'
         )
+
+
+HEAVY_MODULES = (
+    'asyncio', 'bs4', 'http.server', 'prettytable', 'requests_cache', 'tqdm'
+)
+# Импорт main без тяжёлых зависимостей занимает около 0.1 с
+IMPORT_BUDGET_US = 400_000
+
+
+def test_main_import_is_lazy():
+    src_dir = Path(main.__file__).parent
+    completed = subprocess.run(
+        [
+            sys.executable, '-X', 'importtime', '-c',
+            'import sys, main; '
+            f'print(*(m for m in {HEAVY_MODULES!r} if m in sys.modules))',
+        ],
+        capture_output=True, check=True, cwd=src_dir, text=True,
+    )
+    assert completed.stdout.split() == [], (
+        'Импорт `main` не должен загружать тяжёлые зависимости: '
+        f'{completed.stdout.strip()}'
+    )
+    main_line = next(
+        line for line in completed.stderr.splitlines()
+        if line.rstrip().endswith('| main')
+    )
+    cumulative = int(main_line.split('|')[1])
+    assert cumulative < IMPORT_BUDGET_US, (
+        f'Импорт `main` занял {cumulative / 1e6:.2f} с, '
+        f'бюджет — {IMPORT_BUDGET_US / 1e6:.2f} с'
+    )
@@ -0,0 +1,70 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+try:
+    from src import metrics, profiler
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `metrics.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `metrics.py`'
+
+
+@pytest.fixture
+def collector():
+    collector = profiler.Profiler()
+    collector.record_fetch(0.02, from_cache=False, size=100)
+    collector.record_fetch(0.3, from_cache=False, size=50)
+    collector.record_fetch(0.001, from_cache=True, size=100)
+    collector.add(profiler.PHASE_PARSE, 0.04)
+    collector.count('errors:RequestErrorException')
+    collector.count('pep_status_mismatches', 2)
+    return collector
+
+
+def test_render_metrics(collector):
+    lines = metrics.render_metrics(collector).splitlines()
+
+    for line in (
+        'bs4_parser_pages_fetched_total{source="network"} 2',
+        'bs4_parser_cache_hits_total 1',
+        'bs4_parser_cache_misses_total 2',
+        'bs4_parser_downloaded_bytes_total 150',
+        'bs4_parser_errors_total{exception="RequestErrorException"} 1',
+        'bs4_parser_errors_total{exception="ParserFindTagException"} 0',
+        'bs4_parser_pep_status_mismatches_total 2',
+        'bs4_parser_fetch_duration_seconds_bucket'
+        '{source="network",le="0.025"} 1',
+        'bs4_parser_fetch_duration_seconds_bucket'
+        '{source="network",le="+Inf"} 2',
+        'bs4_parser_fetch_duration_seconds_count{source="cache"} 1',
+        'bs4_parser_parse_duration_seconds_bucket{le="0.05"} 1',
+        '# TYPE bs4_parser_parse_duration_seconds histogram',
+    ):
+        assert line in lines, f'В метриках нет строки `{line}`'
+
+
+def test_write_textfile(collector, tmp_path):
+    path = tmp_path / 'textfile' / 'parser.prom'
+    metrics.write_textfile(collector, path)
+    assert path.read_text(encoding='utf-8') == (
+        metrics.render_metrics(collector)
+    )
+
+
+def test_metrics_server(collector):
+    server = metrics.MetricsServer(collector, port=0).start()
+    try:
+        url = f'http://127.0.0.1:{server.port}'
+        with urllib.request.urlopen(f'{url}/metrics') as response:
+            body = response.read().decode('utf-8')
+            content_type = response.headers['Content-Type']
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            urllib.request.urlopen(f'{url}/other')
+    finally:
+        server.stop()
+
+    assert body == metrics.render_metrics(collector)
+    assert content_type.startswith('text/plain; version=0.0.4')
+    assert excinfo.value.code == 404
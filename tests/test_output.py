@@ -1,3 +1,5 @@
+import json
+import sqlite3
 from argparse import Namespace
 from datetime import datetime
 from pathlib import Path
@@ -95,3 +97,179 @@ def test_output_file():
     assert hasattr(outputs, 'file_output'), (
         'Напишите функцию `file_output` в модуле `output.py`'
     )
+
+
+def test_control_output_file_streams_rows(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'RESULTS_DIR', tmp_path)
+
+    def interrupted_crawl():
+        yield 'Статус', 'Количество'
+        yield 'Active', 1
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        outputs.control_output(interrupted_crawl(), cli_args('pep', 'file'))
+
+    output_file, = tmp_path.glob('*.csv')
+    assert output_file.read_text(encoding='utf-8').splitlines() == [
+        '"Статус","Количество"',
+        '"Active","1"',
+    ], (
+        'Функция `file_output` должна записывать строки по мере '
+        'получения, чтобы при прерывании парсинга они остались в файле'
+    )
+
+
+@pytest.mark.parametrize('output_format', [None, 'pretty'])
+def test_control_output_accepts_iterator(capsys, records, output_format):
+    rows = records('pep')
+    outputs.control_output(iter(rows), cli_args('pep', output_format))
+    captured_out, _ = capsys.readouterr()
+    assert 'Active' in captured_out, (
+        'Функция `control_output` должна принимать генератор строк'
+    )
+
+
+PEP_ROWS = [('Статус', 'Количество'), ('Active', 36), ('Final', 246)]
+
+
+def test_control_output_jsonl_append(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'RESULTS_DIR', tmp_path)
+    cli_arg = Namespace(mode='pep', output='jsonl', append=True)
+    summary = outputs.SummaryRow(('Total', 282))
+    outputs.control_output(iter([*PEP_ROWS, summary]), cli_arg)
+    outputs.control_output(iter(PEP_ROWS), cli_arg)
+
+    lines = (tmp_path / 'pep.jsonl').read_text(encoding='utf-8').splitlines()
+    records = [json.loads(line) for line in lines]
+    assert len(records) == 4, (
+        'В режиме `--append` строки каждого запуска должны дописываться '
+        'в общий файл `<режим>.jsonl` без итоговой строки'
+    )
+    assert {k: v for k, v in records[0].items() if k != 'run_at'} == {
+        'status': 'Active', 'count': 36,
+    }, 'Строки JSON Lines должны содержать типизированные поля результата'
+
+
+def test_control_output_keeps_data_row_named_total(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'RESULTS_DIR', tmp_path)
+    cli_arg = Namespace(mode='pep', output='jsonl', append=True)
+    outputs.control_output(iter([*PEP_ROWS, ('Total', 1)]), cli_arg)
+
+    lines = (tmp_path / 'pep.jsonl').read_text(encoding='utf-8').splitlines()
+    assert json.loads(lines[-1])['status'] == 'Total', (
+        'Строка данных не должна пропускаться из-за значения первой ячейки'
+    )
+
+
+def test_control_output_jsonl_append_other_columns(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'RESULTS_DIR', tmp_path)
+    cli_arg = Namespace(mode='whats-new', output='jsonl', append=True)
+    header = ('Ссылка на статью', 'Заголовок', 'Редактор, автор')
+    outputs.control_output(iter([header, ('3.12', 'What', 'Guido')]), cli_arg)
+    before = (tmp_path / 'whats-new.jsonl').read_text(encoding='utf-8')
+
+    sections_header = (
+        *header, 'Разделы', 'Новые модули', 'Устаревшие API'
+    )
+    with pytest.raises(outputs.OutputSchemaException, match='--append'):
+        outputs.control_output(
+            iter([sections_header, ('3.12', 'What', 'Guido', '', '', '')]),
+            cli_arg,
+        )
+    after = (tmp_path / 'whats-new.jsonl').read_text(encoding='utf-8')
+    assert after == before, (
+        'При несовпадении столбцов файл JSON Lines не должен меняться'
+    )
+
+
+def test_control_output_sqlite(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'RESULTS_DIR', tmp_path)
+    cli_arg = Namespace(mode='pep', output='sqlite', append=True)
+    outputs.control_output(iter(PEP_ROWS), cli_arg)
+
+    def interrupted_crawl():
+        yield from PEP_ROWS
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        outputs.control_output(interrupted_crawl(), cli_arg)
+
+    with sqlite3.connect(tmp_path / 'pep.sqlite') as connection:
+        rows = connection.execute(
+            'SELECT status, count, typeof(count) FROM results'
+        ).fetchall()
+        journal_mode, = connection.execute('PRAGMA journal_mode').fetchone()
+    assert rows == [('Active', 36, 'integer'), ('Final', 246, 'integer')], (
+        'Вывод в SQLite должен сохранять типизированные столбцы и '
+        'записывать запуск одной транзакцией'
+    )
+    assert journal_mode == 'wal', 'База результатов должна работать в WAL'
+
+
+def test_control_output_sqlite_append_other_columns(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'RESULTS_DIR', tmp_path)
+    cli_arg = Namespace(mode='whats-new', output='sqlite', append=True)
+    header = ('Ссылка на статью', 'Заголовок', 'Редактор, автор')
+    outputs.control_output(iter([header, ('3.12', 'What', 'Guido')]), cli_arg)
+
+    sections_header = (
+        *header, 'Разделы', 'Новые модули', 'Устаревшие API'
+    )
+    with pytest.raises(outputs.OutputSchemaException, match='--append'):
+        outputs.control_output(
+            iter([sections_header, ('3.12', 'What', 'Guido', '', '', '')]),
+            cli_arg,
+        )
+    with sqlite3.connect(tmp_path / 'whats-new.sqlite') as connection:
+        count, = connection.execute('SELECT COUNT(*) FROM results').fetchone()
+    assert count == 1, (
+        'Результаты с другим набором столбцов не должны дописываться '
+        'в существующую таблицу'
+    )
+
+
+def test_control_output_parquet(monkeypatch, tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    monkeypatch.setattr(outputs, 'RESULTS_DIR', tmp_path)
+    cli_arg = Namespace(mode='pep', output='parquet', append=True)
+    outputs.control_output(iter(PEP_ROWS), cli_arg)
+
+    table = pq.read_table(tmp_path / 'pep.parquet')
+    assert table.column('count').to_pylist() == [36, 246], (
+        'Вывод в Parquet должен сохранять типизированные столбцы'
+    )
+
+
+def test_control_output_types_from_first_batch(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'RESULTS_DIR', tmp_path)
+    cli_arg = Namespace(mode='pep', output='sqlite', append=True)
+    outputs.control_output(
+        iter([PEP_ROWS[0], ('Active', None), ('Final', 246)]), cli_arg
+    )
+
+    with sqlite3.connect(tmp_path / 'pep.sqlite') as connection:
+        column_type = connection.execute(
+            "SELECT type FROM pragma_table_info('results') "
+            "WHERE name = 'count'"
+        ).fetchone()[0]
+    assert column_type == 'INTEGER', (
+        'Тип столбца должен определяться по первой пачке строк, '
+        'а не только по первой строке'
+    )
+
+
+def test_control_output_parquet_append_other_columns(monkeypatch, tmp_path):
+    pytest.importorskip('pyarrow')
+    monkeypatch.setattr(outputs, 'RESULTS_DIR', tmp_path)
+    cli_arg = Namespace(mode='pep', output='parquet', append=True)
+    outputs.control_output(iter(PEP_ROWS), cli_arg)
+
+    with pytest.raises(outputs.OutputSchemaException):
+        outputs.control_output(
+            iter([PEP_ROWS[0], ('Active', 'много')]), cli_arg
+        )
+    assert len(list((tmp_path / 'pep.parquet').iterdir())) == 1, (
+        'Запуск с другими типами столбцов не должен дописываться '
+        'в набор данных Parquet'
+    )
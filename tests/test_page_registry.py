@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests_mock
+from requests_cache import CachedSession
+
+try:
+    from src import page_registry, utils
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `page_registry.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `page_registry.py`'
+
+URL = 'mock://docs.python.org/3/'
+
+
+@pytest.fixture
+def server():
+    server = requests_mock.Adapter()
+    server.register_uri('GET', URL, text='<title>Python</title>')
+    return server
+
+
+@pytest.fixture
+def session(server):
+    session = CachedSession(backend='memory', expire_after=0)
+    session.mount('mock://', server)
+    session.page_registry = page_registry.PageRegistry()
+    return session
+
+
+def test_page_fetched_once(session, server):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(
+            executor.map(lambda _: utils.get_response(session, URL), range(8))
+        )
+    soups = [utils.get_soup(session, URL) for _ in range(2)]
+    title = utils.get_parsed_page(session, URL, lambda soup: soup.title.text)
+
+    assert server.call_count == 1, (
+        'Страница должна загружаться не больше одного раза за запуск'
+    )
+    assert all(response is responses[0] for response in responses)
+    assert soups[0] is soups[1], 'Дерево страницы должно строиться один раз'
+    assert title == 'Python'
+
+
+def test_page_registry_remembers_errors(session, server):
+    server.register_uri('GET', URL, status_code=404)
+    for _ in range(2):
+        with pytest.raises(utils.RequestErrorException):
+            utils.get_response(session, URL)
+    assert server.call_count == 1, (
+        'Неудачная страница не должна запрашиваться повторно'
+    )
@@ -0,0 +1,49 @@
+import pytest
+
+from conftest import pep_page_html
+try:
+    from src import main, parse_pool
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `parse_pool.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `parse_pool.py`'
+
+
+@pytest.fixture
+def pool():
+    pool = parse_pool.ParsePool(2)
+    yield pool
+    pool.close()
+
+
+@pytest.mark.parametrize('parser', ['bs4', 'lxml'])
+def test_parse_pool_extract(pool, parser):
+    content = pep_page_html('Active').encode('utf-8')
+    extract = main.PEP_STATUS_EXTRACTORS[parser]
+    assert pool.extract(content, 'utf-8', extract, parser) == 'Active', (
+        'Пул процессов должен возвращать результат функции извлечения'
+    )
+
+
+def test_parse_pool_raises_find_tag_exception(pool):
+    content = pep_page_html('Broken').encode('utf-8')
+    with pytest.raises(main.ParserFindTagException):
+        pool.extract(content, None, main._parse_pep_status, 'bs4')
+
+
+def test_parse_pool_auto_size(monkeypatch):
+    monkeypatch.setattr(parse_pool.os, 'cpu_count', lambda: 16)
+    assert parse_pool.ParsePool().processes == 16, (
+        'По умолчанию количество процессов должно равняться числу ядер'
+    )
+    assert parse_pool.ParsePool(0).processes == 16
+
+
+def test_parse_pool_does_not_fork(pool):
+    content = pep_page_html('Active').encode('utf-8')
+    pool.extract(content, 'utf-8', main._parse_pep_status, 'bs4')
+    start_method = pool._executor._mp_context.get_start_method()
+    assert start_method != 'fork', (
+        'Процессы разбора не должны создаваться через fork: '
+        'к этому моменту уже работают потоки загрузки'
+    )
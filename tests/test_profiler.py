@@ -0,0 +1,78 @@
+import json
+import time
+
+import pytest
+
+try:
+    from src import profiler, utils
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `profiler.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `profiler.py`'
+
+
+@pytest.mark.parametrize('rank, expected', [
+    (50, 5),
+    (95, 10),
+    (100, 10),
+])
+def test_percentile(rank, expected):
+    assert profiler.percentile(list(range(1, 11)), rank) == expected
+
+
+def test_profiled_parsed_page(mock_session, tmp_path):
+    mock_session.profiler = profiler.Profiler()
+    mock_session.result_cache = utils.ResultCache(':memory:')
+
+    def extract(soup):
+        return soup.text
+
+    for _ in range(2):
+        utils.get_parsed_page(mock_session, 'mock://docs.python.org/', extract)
+
+    summary = mock_session.profiler.summary()
+    assert summary['phases'][profiler.PHASE_NETWORK]['calls'] == 1
+    assert summary['phases'][profiler.PHASE_CACHE]['calls'] == 1, (
+        'Повторный запрос должен учитываться как ответ из кеша'
+    )
+    assert summary['phases'][profiler.PHASE_PARSE]['calls'] == 1, (
+        'Результат из кеша разбора не должен учитываться как разбор'
+    )
+    assert summary['cache_hit_ratio'] == 0.5
+    assert summary['counters']['bytes'] == len('You are breathtaken')
+    assert summary['counters']['result_cache_hits'] == 1
+
+    path = tmp_path / 'profile.json'
+    mock_session.profiler.save(path)
+    assert json.loads(path.read_text(encoding='utf-8')) == summary
+
+
+def test_consume_excludes_row_production():
+    collector = profiler.Profiler()
+
+    def slow_rows():
+        for row in range(3):
+            time.sleep(0.02)
+            yield row
+
+    consumed = collector.consume('output:test', list, slow_rows())
+
+    assert consumed == [0, 1, 2]
+    assert collector.summary()['phases']['output:test']['total'] < 0.02, (
+        'Время получения строк не должно попадать в фазу вывода'
+    )
+
+
+def test_profiler_memory_is_bounded(monkeypatch):
+    monkeypatch.setattr(profiler, 'PROFILE_SAMPLES', 10)
+    collector = profiler.Profiler()
+    for _ in range(25):
+        collector.add(profiler.PHASE_PARSE, 0.02)
+
+    buckets, total, calls = collector.histogram(profiler.PHASE_PARSE)
+    assert calls == 25 and buckets[-1] == 25 and total == pytest.approx(0.5), (
+        'Гистограмма должна учитывать все вызовы фазы'
+    )
+    assert len(collector.durations(profiler.PHASE_PARSE)) == 10, (
+        'Для перцентилей должны храниться только последние длительности'
+    )
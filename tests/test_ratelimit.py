@@ -0,0 +1,66 @@
+import time
+
+import requests_mock
+from requests_cache import CachedSession
+
+try:
+    from src import ratelimit
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `ratelimit.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `ratelimit.py`'
+
+
+class SpyLimiter(ratelimit.RateLimiter):
+    def __init__(self):
+        super().__init__({}, (1000, 1000))
+        self.urls = []
+
+    def acquire(self, url):
+        self.urls.append(url)
+        return super().acquire(url)
+
+
+def test_token_bucket_burst_and_rate():
+    bucket = ratelimit.TokenBucket(rate=20, burst=2)
+    start = time.monotonic()
+    waits = [bucket.acquire() for _ in range(3)]
+    elapsed = time.monotonic() - start
+    assert waits[:2] == [0.0, 0.0], (
+        'Запросы в пределах `burst` не должны ожидать токена'
+    )
+    assert elapsed >= 0.04, (
+        'Запрос сверх `burst` должен ожидать пополнения ведра'
+    )
+
+
+def test_rate_limiter_buckets_per_host():
+    limiter = ratelimit.RateLimiter(
+        {'docs.python.org': (1, 3)}, default=(2, 1)
+    )
+    docs = limiter.bucket('docs.python.org')
+    assert (docs.rate, docs.burst) == (1, 3)
+    other = limiter.bucket('example.com')
+    assert (other.rate, other.burst) == (2, 1)
+    assert limiter.bucket('docs.python.org') is docs, (
+        'Для одного хоста должно использоваться одно ведро токенов'
+    )
+
+
+def test_adapter_skips_cached_responses():
+    limiter = SpyLimiter()
+    mock_adapter = requests_mock.Adapter()
+    mock_adapter.register_uri('GET', 'mock://peps.python.org/', text='PEP')
+    session = CachedSession(backend='memory')
+    session.mount(
+        'mock://', ratelimit.RateLimitedAdapter(limiter, mock_adapter)
+    )
+
+    first = session.get('mock://peps.python.org/')
+    second = session.get('mock://peps.python.org/')
+
+    assert not first.from_cache and second.from_cache
+    assert limiter.urls == ['mock://peps.python.org/'], (
+        'Токены должны расходоваться только на сетевые запросы, '
+        'а не на ответы из кеша'
+    )
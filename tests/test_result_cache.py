@@ -0,0 +1,71 @@
+import requests_mock
+
+from conftest import PEPS_URL
+try:
+    from src import result_cache, utils
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `result_cache.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `result_cache.py`'
+
+
+def test_result_cache_checks_validator():
+    cache = result_cache.ResultCache(':memory:')
+    cache.set('extract', PEPS_URL, '"v1"', ['Final'])
+    assert cache.get('extract', PEPS_URL, '"v1"') == ['Final']
+    assert cache.get('extract', PEPS_URL, '"v2"') is None, (
+        'Результат разбора изменившейся страницы не должен браться из кеша'
+    )
+    cache.clear()
+    assert cache.get('extract', PEPS_URL, '"v1"') is None
+
+
+def test_result_cache_evicts_least_recently_used():
+    cache = result_cache.ResultCache(':memory:', max_entries=2)
+    cache.set('extract', 'a', 'v', 1)
+    cache.set('extract', 'b', 'v', 2)
+    cache.get('extract', 'a', 'v')
+    cache.set('extract', 'c', 'v', 3)
+    assert cache.get('extract', 'b', 'v') is None, (
+        'При переполнении кеша должна вытесняться самая давняя запись'
+    )
+    assert cache.get('extract', 'a', 'v') == 1
+    assert cache.get('extract', 'c', 'v') == 3
+
+
+def test_get_parsed_page_skips_parsing_unchanged_page(mock_session):
+    mock_session.result_cache = result_cache.ResultCache(':memory:')
+    calls = []
+
+    def extract(soup):
+        calls.append(soup)
+        return soup.find('dd').text
+
+    url = PEPS_URL + 'pep-0008/'
+    with requests_mock.Mocker() as mock:
+        mock.get(url, text='<dl><dd>Active</dd></dl>')
+        first = utils.get_parsed_page(mock_session, url, extract)
+        second = utils.get_parsed_page(mock_session, url, extract)
+
+    assert first == second == 'Active'
+    assert len(calls) == 1, (
+        'Неизменившаяся страница не должна разбираться повторно'
+    )
+
+
+def test_extractor_key_changes_with_code():
+    def extract(soup):
+        return soup.find('dd')
+
+    old_extract = extract
+
+    def extract(soup):  # noqa: F811
+        return soup.find('dt')
+
+    assert old_extract.__qualname__ == extract.__qualname__
+    assert result_cache.extractor_key(old_extract) != (
+        result_cache.extractor_key(extract)
+    ), 'После изменения функции разбора ключ кеша должен меняться'
+    assert result_cache.extractor_key(extract) == (
+        result_cache.extractor_key(extract)
+    )
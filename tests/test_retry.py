@@ -0,0 +1,112 @@
+import time
+
+import pytest
+import requests_mock
+from requests.exceptions import TooManyRedirects
+from requests_cache import CachedSession
+
+try:
+    from src import retry, utils
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `retry.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `retry.py`'
+
+URL = 'mock://peps.python.org/pep-0008/'
+
+
+@pytest.fixture
+def server():
+    return requests_mock.Adapter()
+
+
+@pytest.fixture
+def session(server):
+    session = CachedSession(backend='memory')
+    session.mount('mock://', server)
+    session.retry_policy = retry.RetryPolicy(retries=2, backoff=0)
+    session.circuit_breaker = retry.CircuitBreaker(threshold=3)
+    return session
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('7', 7.0),
+    ('Wed, 21 Oct 2015 07:28:00 GMT', 0),
+    ('soon', None),
+    (None, None),
+])
+def test_parse_retry_after(value, expected):
+    assert retry.parse_retry_after(value) == expected
+
+
+def test_retry_after_header_sets_delay():
+    policy = retry.RetryPolicy(backoff=100)
+    with requests_mock.Mocker() as mock:
+        mock.get(URL, status_code=429, headers={'Retry-After': '2'})
+        response = CachedSession(backend='memory').get(URL)
+    assert policy.delay(0, response) == 2, (
+        'Пауза перед повтором должна соответствовать заголовку Retry-After'
+    )
+    assert 0 <= policy.delay(3) <= policy.max_backoff
+
+
+def test_get_response_retries_transient_errors(session, server):
+    server.register_uri('GET', URL, [
+        {'status_code': 503},
+        {'exc': retry.RequestsConnectionError},
+        {'text': 'PEP 8'},
+    ])
+    response = utils.get_response(session, URL)
+    assert response.text == 'PEP 8', (
+        'Запрос должен повторяться при ответе 503 и ошибке соединения'
+    )
+    assert server.call_count == 3
+
+
+def test_get_response_rejects_error_status(session, server):
+    server.register_uri('GET', URL, status_code=404)
+    with pytest.raises(utils.RequestErrorException, match='HTTP 404'):
+        utils.get_response(session, URL)
+    assert server.call_count == 1, 'Ответ 404 не должен повторяться'
+
+
+def test_circuit_breaker_stops_requests(session, server):
+    server.register_uri('GET', URL, status_code=503)
+    with pytest.raises(utils.RequestErrorException, match='HTTP 503'):
+        utils.get_response(session, URL)
+    with pytest.raises(retry.CircuitOpenException):
+        utils.get_response(session, URL)
+    assert server.call_count == 3, (
+        'После серии неудач запросы к хосту не должны отправляться'
+    )
+
+    session.circuit_breaker.reset_after = 0
+    server.register_uri('GET', URL, text='PEP 8')
+    assert utils.get_response(session, URL).text == 'PEP 8', (
+        'После паузы предохранитель должен пропустить пробный запрос'
+    )
+
+
+def test_circuit_breaker_single_probe():
+    breaker = retry.CircuitBreaker(threshold=1, reset_after=0.2)
+    breaker.record(URL, failed=True)
+    time.sleep(0.25)
+
+    probe = breaker.check(URL)
+    with pytest.raises(retry.CircuitOpenException, match='пробный'):
+        breaker.check(URL)
+    breaker.record(URL, failed=False, probe=probe)
+    assert breaker.check(URL) is None
+    assert breaker.check(URL) is None, (
+        'После успешного пробного запроса хост должен быть включён'
+    )
+
+
+def test_circuit_breaker_counts_non_retryable_errors(session, server):
+    server.register_uri('GET', URL, exc=TooManyRedirects)
+    for _ in range(3):
+        with pytest.raises(utils.RequestErrorException):
+            utils.get_response(session, URL)
+    assert server.call_count == 3, 'Неповторяемые ошибки не повторяются'
+    with pytest.raises(retry.CircuitOpenException):
+        utils.get_response(session, URL)
@@ -2,6 +2,7 @@ import pytest
 import requests
 import requests_mock
 import bs4
+import lxml.html
 from conftest import MAIN_DOC_URL
 try:
     from src import utils
@@ -38,6 +39,32 @@ def test_find_tag_exception(soup):
     )
 
 
+def test_find_node():
+    tree = lxml.html.fromstring(
+        '<div><section class="main wide" id="content">'
+        '<a href="/pep-0001/">PEP 1</a></section></div>'
+    )
+    got = utils.find_node(tree, 'section', attrs={'class': 'main'})
+    assert got.get('id') == 'content', (
+        'Функция `find_node` в модуле `utils.py` должна находить тег '
+        'по одному из его классов, как `find_tag`'
+    )
+    got = utils.find_node(got, 'a', attrs={'href': True})
+    assert got.text == 'PEP 1', (
+        'Функция `find_node` должна находить тег по наличию атрибута'
+    )
+    with pytest.raises(BaseException) as excinfo:
+        utils.find_node(tree, 'section', attrs={'id': 'unexpected'})
+    assert excinfo.typename == 'ParserFindTagException', (
+        'Функция `find_node` в случае отсутствия искомого тэга должна '
+        'выбросить исключение `ParserFindTagException`'
+    )
+    msg = "Не найден тег section {'id': 'unexpected'}"
+    assert msg in str(excinfo.value), (
+        f'Нестандартное исключение должно показывать сообщение: `{msg}`'
+    )
+
+
 def test_get_response(mock_session):
     with requests_mock.Mocker() as mock:
         mock.get(
@@ -54,3 +81,53 @@ def test_get_response(mock_session):
             'делает запрос к странице и возвращает ответ. \n'
             'Кстати: You are breathtaken!'
         )
+
+
+def test_get_soup_parse_only(mock_session):
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            MAIN_DOC_URL + 'region/',
+            text=(
+                '<div class="header"><ul><li>menu</li></ul></div>'
+                '<div class="sphinxsidebarwrapper"><ul><li>3.12</li></ul>'
+                '</div><div class="footer"><ul><li>footer</li></ul></div>'
+            ),
+        )
+        got = utils.get_soup(
+            mock_session,
+            MAIN_DOC_URL + 'region/',
+            parse_only=bs4.SoupStrainer(
+                'div', class_='sphinxsidebarwrapper'
+            ),
+        )
+    assert [li.text for li in got.find_all('li')] == ['3.12'], (
+        'Функция `get_soup` с аргументом `parse_only` должна разбирать '
+        'только указанную область страницы'
+    )
+    assert utils.find_tag(
+        got, 'div', attrs={'class': 'sphinxsidebarwrapper'}
+    ), 'Разобранная область должна находиться функцией `find_tag`'
+
+
+def test_create_session_revalidates_expired_pages():
+    session = utils.create_session(backend='memory', result_cache_path=None)
+    url = 'https://peps.python.org/pep-0008/'
+    with requests_mock.Mocker() as mock:
+        mock.get(url, [
+            {'text': 'PEP 8', 'headers': {'ETag': '"pep8"'}},
+            {'status_code': 304, 'headers': {'ETag': '"pep8"'}},
+        ])
+        utils.get_response(session, url, expire_after=0)
+        got = utils.get_response(session, url, expire_after=0)
+        conditional_headers = mock.last_request.headers
+
+    assert conditional_headers.get('If-None-Match') == '"pep8"', (
+        'Устаревшая страница с ETag должна перепроверяться '
+        'условным запросом'
+    )
+    assert got.from_cache and got.text == 'PEP 8', (
+        'При ответе 304 должна использоваться страница из кеша'
+    )
+    assert session.settings.urls_expire_after, (
+        'Сессия должна использовать сроки кеша по шаблонам URL'
+    )
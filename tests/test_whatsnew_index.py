@@ -0,0 +1,38 @@
+try:
+    from src import whatsnew_index
+except ModuleNotFoundError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `whatsnew_index.py`'
+    )
+except ImportError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `whatsnew_index.py`'
+    )
+
+
+def test_version_from_link():
+    link = 'https://docs.python.org/3/whatsnew/3.12.html'
+    assert whatsnew_index.version_from_link(link) == '3.12'
+    assert sorted(['3.10', '2.7', '3.9'], key=whatsnew_index.version_key) == [
+        '2.7', '3.9', '3.10'
+    ], 'Версии должны сравниваться как числа'
+
+
+def test_whats_new_index():
+    index = whatsnew_index.WhatsNewIndex()
+    index.add('3.12', ['Summary'], [], ['asyncio.get_event_loop()'])
+    index.add('3.11', ['New Modules'], ['tomllib'], [])
+    index.add('3.10', [], [], ['asyncio.get_event_loop'])
+
+    assert len(index) == 3
+    assert index.introduced_in('TOMLLIB') == '3.11', (
+        'Указатель должен находить версию появления модуля без учёта '
+        'регистра'
+    )
+    assert index.introduced_in('zoneinfo') is None
+    assert index.deprecated_in('asyncio.get_event_loop') == ['3.10', '3.12']
+    assert index.lookup(['tomllib', 'zoneinfo']) == [
+        whatsnew_index.WHATS_NEW_LOOKUP_HEADER,
+        ('tomllib', '3.11', ''),
+        ('zoneinfo', '', ''),
+    ]